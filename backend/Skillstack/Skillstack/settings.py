@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,6 +44,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'mainapp.profiling.ProfilingMiddleware',
+    'mainapp.metrics.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -78,13 +81,68 @@ WSGI_APPLICATION = 'Skillstack.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Applied to every new SQLite connection. WAL lets readers run alongside the
+# single writer; synchronous=NORMAL is durable across application crashes
+# (only an OS crash can lose the last commits) and saves an fsync per commit.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 134217728,  # 128 MiB
+    "cache_size": -20000,  # KiB, so ~20 MB of page cache
+    "temp_store": "MEMORY",
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'init_command': ";".join(f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()),
+            # Seconds a writer waits for the lock (busy timeout) before
+            # raising "database is locked".
+            'timeout': 20,
+            # Take the write lock at BEGIN, so a transaction never has to
+            # upgrade from a read lock, which SQLite cannot wait for.
+            'transaction_mode': 'IMMEDIATE',
+        },
+        # Keep connections open between requests and ping them before reuse.
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Read replica (for example a LiteFS or Litestream copy) for list and
+# analytics reads; see mainapp/routers.py. Only defined when
+# SQLITE_REPLICA_PATH is set. The replica is written by its replication tool,
+# never by Django, so it gets read-only options: no WAL switch or deferred
+# transaction upgrade, and query_only refuses writes.
+SQLITE_REPLICA_PATH = os.environ.get('SQLITE_REPLICA_PATH')
+SQLITE_REPLICA_PRAGMAS = {
+    "query_only": "ON",
+    "mmap_size": SQLITE_PRAGMAS["mmap_size"],
+    "cache_size": SQLITE_PRAGMAS["cache_size"],
+    "temp_store": SQLITE_PRAGMAS["temp_store"],
+}
+if SQLITE_REPLICA_PATH:
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': SQLITE_REPLICA_PATH,
+        'OPTIONS': {
+            'init_command': ";".join(f"PRAGMA {name}={value}" for name, value in SQLITE_REPLICA_PRAGMAS.items()),
+            'timeout': 20,
+        },
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        # Tests read the test primary through this alias; no second test database.
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['mainapp.routers.ReplicaRouter']
+READ_REPLICA_ALIAS = 'replica' if SQLITE_REPLICA_PATH else None
+# Seconds a user's reads stay on the primary after they write. Writes are
+# recorded in the default cache, which must be shared by all worker processes
+# (Redis, Memcached, database cache) for this to hold; see check mainapp.W001.
+REPLICA_STICKY_SECONDS = 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -129,13 +187,74 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
   "DEFAULT_AUTHENTICATION_CLASSES": (
-    "rest_framework_simplejwt.authentication.JWTAuthentication",
+    "mainapp.authentication.CachedJWTAuthentication",
   ),
   "DEFAULT_PERMISSION_CLASSES": (
     "rest_framework.permissions.IsAuthenticatedOrReadOnly",
   ),
+  # Token buckets (see mainapp/throttling.py); views charge throttle_cost
+  # tokens per request against their throttle_scope.
+  "DEFAULT_THROTTLE_RATES": {
+    "expensive": "60/min",
+    "expensive_ip": "180/min",
+    "register_ip": "10/hour",
+  },
 }
 
+# "memory" keeps throttle buckets per process; "cache" shares them through
+# the Django cache THROTTLE_CACHE_ALIAS across worker processes.
+THROTTLE_STORE = "memory"
+THROTTLE_CACHE_ALIAS = "default"
+
+# Route course import and the weekly summary to their async views; enabled
+# by the ASGI profile (Skillstack/settings_asgi.py).
+ASYNC_IO_VIEWS = False
+ASYNC_FETCH_CONCURRENCY = 128
+# "threads" fetches course pages with requests on a pool of
+# ASYNC_FETCH_CONCURRENCY threads; "httpx" uses a pooled httpx.AsyncClient
+# when installed. Threads measured faster in bench_async_import.py.
+ASYNC_FETCH_BACKEND = "threads"
+
+# Share of requests profiled in detail (SQL timings, Server-Timing header);
+# requests slower than PROFILING_SLOW_REQUEST_MS are always logged.
+PROFILING_SAMPLE_RATE = 1.0 if DEBUG else 0.05
+PROFILING_SLOW_REQUEST_MS = 500
+PROFILING_SLOW_SQL_COUNT = 5
+
+# Metrics at /mainapp/metrics/. Worker processes share totals through
+# METRICS_DIR. Scrapers send METRICS_TOKEN as a bearer token; outside DEBUG the
+# endpoint answers 403 until a token is configured.
+METRICS_DIR = os.environ.get('METRICS_DIR')
+METRICS_FLUSH_SECONDS = 5
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+# Per-user response cache for read and AI endpoints ("memory" LRU per
+# process, or "django" to use the RESPONSE_CACHE_ALIAS cache).
+RESPONSE_CACHE_BACKEND = "memory"
+RESPONSE_CACHE_MAX_ENTRIES = 2048
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Authenticated users are cached per process for this many seconds. User
+# changes evict the entry only in the process that saved them, so this is how
+# long another worker may still accept a deactivated user or a token issued
+# before a password change: keep it to a few seconds.
+JWT_USER_CACHE_TTL = 5
+JWT_USER_CACHE_SIZE = 1024
+
+# Wall-clock budget for AI endpoints; clients may send X-Compute-Budget-Ms
+# to change it, up to the maximum.
+AI_COMPUTE_BUDGET_MS = 2000
+AI_COMPUTE_BUDGET_MAX_MS = 10000
+# Per-user budget for precompute_note_summaries; summaries it cuts short
+# are not stored and get computed live on request.
+NOTE_SUMMARY_PRECOMPUTE_BUDGET_MS = 60000
+
+# Concurrent identical AI/import requests share one computation. "memory"
+# coalesces threads of one process; use "file" when running several worker
+# processes (REQUEST_COALESCING_LOCK_DIR defaults to a temp directory and is
+# made private to the server's user).
+REQUEST_COALESCING_BACKEND = "memory"
+
 # Email configuration (Gmail SMTP using app password)
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
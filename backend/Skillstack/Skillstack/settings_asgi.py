@@ -0,0 +1,23 @@
+"""
+ASGI deployment profile.
+
+Serves course import and the weekly summary with their async views, so slow
+course sites and SMTP servers do not hold a worker thread each. Run with an
+ASGI server, for example:
+
+    uvicorn Skillstack.asgi:application --workers 1
+
+Course pages are fetched on a dedicated pool of ASYNC_FETCH_CONCURRENCY
+threads. Set ASYNC_FETCH_BACKEND = "httpx" to use a pooled httpx client
+instead; without httpx installed that setting still falls back to threads.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES
+
+ASYNC_IO_VIEWS = True
+
+# Django cannot reuse connections across async contexts; persistent
+# connections would only pile up under ASGI.
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = 0
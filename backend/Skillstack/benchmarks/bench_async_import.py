@@ -0,0 +1,139 @@
+"""
+Concurrent course imports: sync view on a thread pool vs the async view.
+
+A local HTTP stand-in answers every course page after --delay seconds. The
+sync CourseImportView is driven from --threads worker threads, as a WSGI
+server with that many threads would; AsyncCourseImportView is driven from a
+single event loop with all --imports requests in flight at once. Both go
+through authentication, throttling (disabled here), the fetch, the database
+write and serialization, against a throwaway SQLite file.
+
+Usage (from backend/Skillstack):
+    python benchmarks/bench_async_import.py --imports 300 --delay 0.5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Skillstack.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import AsyncRequestFactory, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from mainapp import views  # noqa: E402
+from mainapp.views import AsyncCourseImportView, CourseImportView  # noqa: E402
+
+UNTHROTTLED = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"expensive": None, "expensive_ip": None}}
+
+
+def slow_server(delay):
+    class SlowCoursePage(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            body = f'<meta property="og:title" content="Course {self.path}">'.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowCoursePage)
+    server.request_queue_size = 1024
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_sync(base_url, token, imports, threads):
+    factory = APIRequestFactory()
+    view = CourseImportView.as_view()
+
+    def import_one(index):
+        request = factory.post(
+            "/mainapp/course-import/", {"url": f"{base_url}/sync/{index}"}, format="json",
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        return view(request).status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        codes = list(pool.map(import_one, range(imports)))
+    return time.perf_counter() - started, codes
+
+
+async def run_async(base_url, token, imports):
+    factory = AsyncRequestFactory()
+    view = AsyncCourseImportView.as_view()
+
+    async def import_one(index):
+        request = factory.post(
+            "/mainapp/course-import/", {"url": f"{base_url}/async/{index}"}, content_type="application/json",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        return (await view(request)).status_code
+
+    started = time.perf_counter()
+    codes = await asyncio.gather(*(import_one(index) for index in range(imports)))
+    return time.perf_counter() - started, codes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--imports", type=int, default=300)
+    parser.add_argument("--delay", type=float, default=0.5)
+    parser.add_argument("--threads", type=int, default=8, help="sync worker threads")
+    parser.add_argument("--fetch-backend", choices=views.ASYNC_FETCH_BACKENDS, default=settings.ASYNC_FETCH_BACKEND)
+    args = parser.parse_args()
+
+    server = slow_server(args.delay)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    setup_test_environment()
+    with tempfile.TemporaryDirectory() as directory:
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(directory, "bench.sqlite3")
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            token = str(AccessToken.for_user(User.objects.create_user(username="bench", password="bench-pass-123")))
+            with override_settings(
+                REST_FRAMEWORK=UNTHROTTLED,
+                ASYNC_FETCH_CONCURRENCY=max(args.imports, 1),
+                ASYNC_FETCH_BACKEND=args.fetch_backend,
+            ):
+                backend = "httpx" if views._use_httpx() else "requests on the fetch pool"
+                sync_elapsed, sync_codes = run_sync(base_url, token, args.imports, args.threads)
+                async_elapsed, async_codes = asyncio.run(run_async(base_url, token, args.imports))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+    server.shutdown()
+
+    print(f"imports: {args.imports}, upstream delay: {args.delay}s, async fetch: {backend}")
+    for label, elapsed, codes in (
+        (f"sync ({args.threads} threads)", sync_elapsed, sync_codes),
+        ("async (1 event loop)", async_elapsed, async_codes),
+    ):
+        ok = sum(code in (200, 201) for code in codes)
+        print(f"{label:<24}{elapsed:8.2f} s{args.imports / elapsed:10.1f} imports/s{ok:6d} ok")
+
+
+if __name__ == "__main__":
+    main()
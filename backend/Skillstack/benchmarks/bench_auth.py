@@ -0,0 +1,83 @@
+"""
+Measure the queries and latency CachedJWTAuthentication saves on list endpoints.
+
+Runs against a throwaway test database and issues real Bearer-token requests
+through the Django test client, once with simplejwt's JWTAuthentication and
+once with the cached class.
+
+Usage (from backend/Skillstack):
+    python benchmarks/bench_auth.py --requests 500
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Skillstack.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection, reset_queries  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_test_environment  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from rest_framework.views import APIView  # noqa: E402
+from rest_framework_simplejwt.authentication import JWTAuthentication  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from mainapp.authentication import CachedJWTAuthentication, user_cache  # noqa: E402
+from mainapp.models import LearningActivity, LearningGoal  # noqa: E402
+
+ENDPOINTS = ("/mainapp/learning-goals/", "/mainapp/learning-activities/")
+
+
+def seed():
+    user = User.objects.create_user(username="bench", password="bench-pass-123")
+    for index in range(20):
+        goal = LearningGoal.objects.create(owner=user, skill_name=f"Skill {index}")
+        LearningActivity.objects.create(goal=goal, performed_on="2025-01-02", hours_spent=1, notes="Practiced")
+    return user
+
+
+def measure(client, path, authentication, requests):
+    user_cache.clear()
+    with mock.patch.object(APIView, "authentication_classes", [authentication]):
+        client.get(path)
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            client.get(path)
+        started = time.perf_counter()
+        for _ in range(requests):
+            client.get(path)
+        elapsed = time.perf_counter() - started
+    return len(queries), elapsed / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = seed()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        print(f"{'endpoint':<32}{'auth':<10}{'queries':>8}{'ms/request':>12}")
+        for path in ENDPOINTS:
+            for label, authentication in (("jwt", JWTAuthentication), ("cached", CachedJWTAuthentication)):
+                queries, latency = measure(client, path, authentication, args.requests)
+                print(f"{path:<32}{label:<10}{queries:>8}{latency * 1000:>12.3f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compare keyword detection strategies on synthetic notes.
+
+- presence loop: `keyword in text` per keyword, as NoteText.action_keyword
+  and the theme detection used to (presence only, short-circuits)
+- count loop:    `text.count(keyword)` per keyword (counts, no positions)
+- matcher:       KeywordMatcher.counts() / .positions() for each backend, as
+  NoteText.keyword_counts (action keyword, theme counts) and
+  keyword_positions() do
+
+Usage (from backend/Skillstack):
+    python benchmarks/bench_keywords.py --notes 10000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mainapp import keywords  # noqa: E402
+from mainapp.keywords import KeywordMatcher  # noqa: E402
+from mainapp.text_analysis import ACTION_KEYWORDS, CONCEPT_KEYWORDS  # noqa: E402
+
+ALL_KEYWORDS = ACTION_KEYWORDS + tuple(kw for kws in CONCEPT_KEYWORDS.values() for kw in kws)
+VOCABULARY = (
+    "learned django serializers today completed the react hooks module fixed a bug in the api "
+    "integration understood closures and scope practiced sql joins with 42 examples deploying to "
+    "production was tricky testing validation logic improving performance mastered python generators "
+    "reading about caching layers notes from the weekend session"
+).split()
+
+
+def make_notes(count, seed=7):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(5, 60))) for _ in range(count)]
+
+
+def presence_loop(notes):
+    for text in notes:
+        next((kw for kw in ACTION_KEYWORDS if kw in text), None)
+        [concept for concept, kws in CONCEPT_KEYWORDS.items() if any(kw in text for kw in kws)]
+
+
+def count_loop(notes):
+    for text in notes:
+        {kw: text.count(kw) for kw in ALL_KEYWORDS if kw in text}
+
+
+def best_of(func, notes, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(notes)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    notes = make_notes(args.notes)
+    rows = [
+        ("presence loop", best_of(presence_loop, notes, args.repeat)),
+        ("count loop", best_of(count_loop, notes, args.repeat)),
+    ]
+    backends = ["python"] + (["pyahocorasick"] if keywords.ahocorasick is not None else [])
+    for backend in backends:
+        matcher = KeywordMatcher(ALL_KEYWORDS, backend=backend)
+        for text in notes[:50]:
+            assert matcher.counts(text) == {kw: n for kw, n in ((kw, text.count(kw)) for kw in matcher.keywords) if n}
+        rows.append((f"{backend} counts", best_of(lambda batch: [matcher.counts(t) for t in batch], notes, args.repeat)))
+        rows.append((f"{backend} positions", best_of(lambda batch: [matcher.positions(t) for t in batch], notes, args.repeat)))
+
+    print(f"notes: {args.notes}, keywords: {len(set(ALL_KEYWORDS))}")
+    for label, elapsed in rows:
+        print(f"{label:<24}{elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Overhead of ProfilingMiddleware on a typical read.
+
+Requests the learning-goals list (response cache disabled, so every request
+runs its queries) through the Django test client with the middleware
+removed, and with it installed at sample rates 0, 0.05 and 1, against a
+throwaway SQLite file. Slow-request logging is off so only the timing and
+sampling work is measured.
+
+Usage (from backend/Skillstack):
+    python benchmarks/bench_profiling.py --requests 1000 --goals 20
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Skillstack.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from mainapp.models import LearningGoal  # noqa: E402
+
+PROFILING = "mainapp.profiling.ProfilingMiddleware"
+UNTHROTTLED = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+
+
+def run(token, requests, middleware, sample_rate):
+    with override_settings(
+        MIDDLEWARE=middleware,
+        PROFILING_SAMPLE_RATE=sample_rate,
+        PROFILING_SLOW_REQUEST_MS=None,
+        RESPONSE_CACHE_TIMEOUT=0,
+        REST_FRAMEWORK=UNTHROTTLED,
+    ):
+        client = Client(headers={"Authorization": f"Bearer {token}"})
+        client.get("/mainapp/learning-goals/")
+        started = time.perf_counter()
+        for _ in range(requests):
+            client.get("/mainapp/learning-goals/")
+        return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--goals", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5, help="interleaved rounds; the fastest is reported")
+    args = parser.parse_args()
+
+    without = [name for name in settings.MIDDLEWARE if name != PROFILING]
+    configs = [
+        ("no middleware", without, 0.0),
+        ("sample rate 0", [PROFILING, *without], 0.0),
+        ("sample rate 0.05", [PROFILING, *without], 0.05),
+        ("sample rate 1", [PROFILING, *without], 1.0),
+    ]
+    setup_test_environment()
+    with tempfile.TemporaryDirectory() as directory:
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(directory, "bench.sqlite3")
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            user = User.objects.create_user(username="bench", password="bench-pass-123")
+            LearningGoal.objects.bulk_create(
+                LearningGoal(owner=user, skill_name=f"Skill {index}", notes="Practiced") for index in range(args.goals)
+            )
+            token = str(AccessToken.for_user(user))
+            best = {label: float("inf") for label, _, _ in configs}
+            for round_index in range(args.repeat):
+                # Rotate the order so no configuration always runs first.
+                shift = round_index % len(configs)
+                for label, middleware, rate in configs[shift:] + configs[:shift]:
+                    best[label] = min(best[label], run(token, args.requests, middleware, rate))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    baseline = best[configs[0][0]]
+    print(f"requests: {args.requests} x {args.repeat} rounds, goals per response: {args.goals}")
+    for label, elapsed in best.items():
+        per_request = elapsed / args.requests * 1e6
+        overhead = (elapsed - baseline) / args.requests * 1e6
+        print(f"{label:<18}{per_request:10.0f} us/request{overhead:+10.0f} us")
+
+
+if __name__ == "__main__":
+    main()
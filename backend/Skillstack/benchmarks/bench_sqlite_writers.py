@@ -0,0 +1,125 @@
+"""
+Concurrent-writer stress test for the SQLite connection settings.
+
+Each worker process repeatedly does what logging an activity does: insert
+an activity row, append to its goal's notes and bump the owner's data
+version, in one transaction. Two configurations are compared on a fresh
+database file:
+
+- legacy: Django's previous defaults (rollback journal, synchronous=FULL,
+  deferred transactions, 5 s busy timeout)
+- tuned:  SQLITE_PRAGMAS, IMMEDIATE transactions and the busy timeout from
+  Skillstack/settings.py
+
+Usage (from backend/Skillstack):
+    python benchmarks/bench_sqlite_writers.py --workers 8 --seconds 5
+"""
+
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Skillstack import settings  # noqa: E402
+
+TUNED_OPTIONS = settings.DATABASES["default"]["OPTIONS"]
+CONFIGS = {
+    "legacy": {"pragmas": {}, "timeout": 5, "begin": "BEGIN"},
+    "tuned": {
+        "pragmas": settings.SQLITE_PRAGMAS,
+        "timeout": TUNED_OPTIONS["timeout"],
+        "begin": f"BEGIN {TUNED_OPTIONS['transaction_mode']}",
+    },
+}
+SCHEMA = """
+CREATE TABLE goal (id INTEGER PRIMARY KEY, owner_id INTEGER, notes TEXT NOT NULL DEFAULT '');
+CREATE TABLE activity (id INTEGER PRIMARY KEY, goal_id INTEGER, hours REAL, notes TEXT);
+CREATE TABLE data_version (user_id INTEGER PRIMARY KEY, version INTEGER NOT NULL);
+"""
+USERS = 50
+
+
+def connect(path, config):
+    connection = sqlite3.connect(path, timeout=config["timeout"], isolation_level=None)
+    for name, value in config["pragmas"].items():
+        connection.execute(f"PRAGMA {name}={value}")
+    return connection
+
+
+def prepare(path, config):
+    connection = connect(path, config)
+    connection.executescript(SCHEMA)
+    connection.executemany("INSERT INTO goal (id, owner_id) VALUES (?, ?)", [(user, user) for user in range(USERS)])
+    connection.executemany("INSERT INTO data_version VALUES (?, 0)", [(user,) for user in range(USERS)])
+    connection.close()
+
+
+def writer(path, config, seconds, worker, results):
+    connection = connect(path, config)
+    committed = locked = 0
+    deadline = time.perf_counter() + seconds
+    sequence = 0
+    while time.perf_counter() < deadline:
+        user = (worker * 7919 + sequence) % USERS
+        sequence += 1
+        try:
+            # Like a Django request: read the goal first, then write.
+            connection.execute(config["begin"])
+            connection.execute("SELECT owner_id FROM goal WHERE id = ?", (user,)).fetchone()
+            connection.execute(
+                "INSERT INTO activity (goal_id, hours, notes) VALUES (?, 1.5, 'Practiced joins and indexes')", (user,)
+            )
+            connection.execute("UPDATE goal SET notes = substr(notes || ' entry', -2000) WHERE id = ?", (user,))
+            connection.execute("UPDATE data_version SET version = version + 1 WHERE user_id = ?", (user,))
+            connection.execute("COMMIT")
+            committed += 1
+        except sqlite3.OperationalError as exc:
+            if "locked" not in str(exc):
+                raise
+            locked += 1
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+    connection.close()
+    results.put((committed, locked))
+
+
+def run(name, workers, seconds):
+    config = CONFIGS[name]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stress.sqlite3")
+        prepare(path, config)
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=writer, args=(path, config, seconds, worker, results))
+            for worker in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+    committed = sum(count for count, _ in totals)
+    locked = sum(count for _, count in totals)
+    return committed / seconds, locked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    print(f"workers: {args.workers}, seconds: {args.seconds}")
+    for name in CONFIGS:
+        throughput, locked = run(name, args.workers, args.seconds)
+        print(f"{name:<8}{throughput:10.0f} commits/s{locked:8d} 'database is locked' errors")
+
+
+if __name__ == "__main__":
+    main()
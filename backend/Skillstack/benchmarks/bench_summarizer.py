@@ -0,0 +1,70 @@
+"""
+Time the extractive summarizer on long note histories.
+
+Runs punctuated notes, then the same words without sentence boundaries,
+which exercises the pending-tail cap instead of the sentence splitter.
+
+Usage (from backend/Skillstack):
+    python benchmarks/bench_summarizer.py --sentences 50000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mainapp.summarizer import ExtractiveSummarizer  # noqa: E402
+
+VOCABULARY = (
+    "learned Django serializers today completed the React hooks module fixed a bug in the API "
+    "integration understood closures and scope practiced SQL joins with 42 examples deploying to "
+    "production was tricky testing validation logic improving performance mastered Python generators"
+).split()
+
+
+def make_notes(sentences, per_note=5, seed=7):
+    """Notes of `per_note` sentences each, with some sentences repeated verbatim."""
+    rng = random.Random(seed)
+    pool = [" ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(4, 18))).capitalize() for _ in range(sentences // 3)]
+    notes = []
+    for start in range(0, sentences, per_note):
+        count = min(per_note, sentences - start)
+        notes.append(". ".join(rng.choice(pool) for _ in range(count)) + ".")
+    return notes
+
+
+def unpunctuated(notes):
+    return [note.replace(".", "") for note in notes]
+
+
+def run(notes, **options):
+    summarizer = ExtractiveSummarizer(**options)
+    started = time.perf_counter()
+    for note in notes:
+        summarizer.feed(note)
+    summary = summarizer.summary()
+    return time.perf_counter() - started, summarizer, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sentences", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    notes = make_notes(args.sentences)
+    for label, case in (("punctuated", notes), ("unpunctuated", unpunctuated(notes))):
+        elapsed, summarizer, summary = min((run(case) for _ in range(args.repeat)), key=lambda result: result[0])
+        print(f"{label}:")
+        print(f"  sentences:  {summarizer.sentence_count}")
+        print(f"  candidates: {len(summarizer._candidates)}")
+        print(f"  truncated:  {summarizer.truncated}")
+        print(f"  elapsed:    {elapsed * 1000:8.1f} ms")
+        print(f"  summary:    {summary[:200]}")
+
+
+if __name__ == "__main__":
+    main()
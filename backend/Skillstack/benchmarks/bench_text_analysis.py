@@ -0,0 +1,131 @@
+"""
+Compare the shared NoteText pipeline with the previous multi-pass analysis.
+
+Usage (from backend/Skillstack):
+    python benchmarks/bench_text_analysis.py --notes 10000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mainapp.text_analysis import (  # noqa: E402
+    ACTION_KEYWORDS,
+    CONCEPT_KEYWORDS,
+    NoteText,
+    analyze_text_content,
+    merge_counts,
+)
+from mainapp.summarizer import generate_concise_summary  # noqa: E402
+
+VOCABULARY = (
+    "Learned Django serializers today. Completed the React hooks module! Fixed a bug in the API "
+    "integration? Understood closures and scope. Practiced SQL joins with 42 examples. Deploying to "
+    "production was tricky. Testing validation logic, improving performance. Mastered Python generators."
+).split()
+
+
+def make_notes(count, seed=7):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(5, 60))) for _ in range(count)]
+
+
+def legacy_concise_summary(text):
+    """The previous summary scorer, kept verbatim for comparison."""
+    import re
+
+    sentences = [sent.strip() for sent in re.split(r"[.!?]\s+", text.strip()) if sent.strip() and len(sent.strip()) > 10]
+    scored_sentences = []
+    for sent in sentences:
+        score = 0
+        sent_lower = sent.lower()
+        for verb in list(ACTION_KEYWORDS):
+            if verb in sent_lower:
+                score += 2
+        if any(char.isdigit() for char in sent):
+            score += 1
+        score += len(sent.split()) / 10
+        scored_sentences.append((score, sent))
+    num_sentences = min(3, max(1, len(sentences) // 4 + 1))
+    top = sorted(scored_sentences, key=lambda x: x[0], reverse=True)[:num_sentences]
+    return ". ".join(sent for _, sent in sorted(top, key=lambda x: sentences.index(x[1])))
+
+
+def legacy_pipeline(notes):
+    """The pre-refactor passes: every metric re-splits and re-lowercases the text."""
+    topics = {}
+    key_points = 0
+    for note in notes:
+        lowered = note.lower()
+        for keyword in ACTION_KEYWORDS:
+            if keyword in lowered:
+                key_points += 1
+                break
+        for word in note.split():
+            if len(word) > 4 and word.lower() not in ["this", "that", "with", "from", "into", "have", "about", "where", "which"]:
+                clean = word.strip(".,!?;:").lower()
+                if clean and len(clean) > 3:
+                    topics[clean] = topics.get(clean, 0) + 1
+    combined = " ".join(notes)
+    for word in combined.split():
+        if len(word) > 4 and word.lower() not in ["this", "that", "with", "from", "into", "have", "about", "where", "which", "there", "would", "could", "should", "been", "more"]:
+            clean = word.strip(".,!?;:").lower()
+            if clean and len(clean) > 3 and not clean.endswith("ing"):
+                topics[clean] = topics.get(clean, 0) + 1
+    combined_lower = combined.lower()
+    # Keywords lowercased as the matcher now does; the old loop never matched "API".
+    themes = [c for c, kws in CONCEPT_KEYWORDS.items() if any(kw.lower() in combined_lower for kw in kws)]
+    phrases = [w.rstrip(".,!?;:") for w in combined.split() if len(w) > 3 and w[0].isupper()]
+    words = sum(len(note.split()) for note in notes)
+    summary = legacy_concise_summary(combined)
+    return topics, key_points, themes[:5], len(set(phrases)), words, summary
+
+
+def shared_pipeline(notes):
+    parts = [NoteText(note) for note in notes]
+    topics = {}
+    key_points = 0
+    for part in parts:
+        if part.action_keyword:
+            key_points += 1
+        merge_counts(topics, part.note_topics)
+    for part in parts:
+        merge_counts(topics, part.combined_topics)
+    analysis = analyze_text_content(parts)
+    words = sum(part.word_count for part in parts)
+    summary = generate_concise_summary(" ".join(part.text for part in parts))
+    return topics, key_points, analysis["themes"], analysis["word_count"], words, summary
+
+
+def best_of(func, notes, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(notes)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    notes = make_notes(args.notes)
+    legacy_time, legacy = best_of(legacy_pipeline, notes, args.repeat)
+    shared_time, shared = best_of(shared_pipeline, notes, args.repeat)
+    assert legacy[0] == shared[0] and legacy[1] == shared[1] and legacy[2] == shared[2], "pipelines disagree"
+
+    print(f"notes: {args.notes}")
+    print(f"legacy multi-pass: {legacy_time * 1000:8.1f} ms")
+    print(f"shared NoteText:   {shared_time * 1000:8.1f} ms")
+    print(f"speedup:           {legacy_time / shared_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,16 @@
 from django.contrib import admin
 
-from .models import CourseResource, LearningActivity, LearningGoal
+from .models import (
+    CohortQuantiles,
+    CourseResource,
+    LearningActivity,
+    LearningGoal,
+    NoteSummaryCache,
+    Skill,
+    SkillAlias,
+    SkillNeighbor,
+)
+from .search import matching_activity_ids, matching_goal_ids
 
 
 @admin.register(LearningGoal)
@@ -17,6 +27,15 @@ class LearningGoalAdmin(admin.ModelAdmin):
     list_filter = ("resource_type", "platform", "status", "difficulty_rating")
     search_fields = ("skill_name", "platform", "notes")
 
+    def get_search_results(self, request, queryset, search_term):
+        # Matched in SQL as a subquery, so no ID list is built in Python.
+        # Platform is only searched by the LIKE fallback; with FTS5 use the
+        # platform list filter instead of a full-table scan.
+        goal_ids = matching_goal_ids(search_term)
+        if goal_ids is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(id__in=goal_ids), False
+
 
 @admin.register(CourseResource)
 class CourseResourceAdmin(admin.ModelAdmin):
@@ -30,3 +49,40 @@ class LearningActivityAdmin(admin.ModelAdmin):
     list_display = ("goal", "performed_on", "hours_spent", "created_at")
     search_fields = ("goal__skill_name", "notes")
     list_filter = ("performed_on",)
+
+    def get_search_results(self, request, queryset, search_term):
+        # The FTS index covers notes and the goal's skill name; LIKE only without it.
+        activity_ids = matching_activity_ids(search_term)
+        if activity_ids is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(id__in=activity_ids), False
+
+
+@admin.register(SkillNeighbor)
+class SkillNeighborAdmin(admin.ModelAdmin):
+    list_display = ("skill", "rank", "neighbor_name", "score", "support")
+    search_fields = ("skill", "neighbor")
+
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 0
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ("name", "normalized_name", "created_at")
+    search_fields = ("name", "normalized_name", "aliases__alias")
+    inlines = [SkillAliasInline]
+
+
+@admin.register(CohortQuantiles)
+class CohortQuantilesAdmin(admin.ModelAdmin):
+    list_display = ("metric", "population", "computed_at")
+
+
+@admin.register(NoteSummaryCache)
+class NoteSummaryCacheAdmin(admin.ModelAdmin):
+    list_display = ("owner", "goal", "data_version", "computed_at")
+    search_fields = ("owner__username",)
+    raw_id_fields = ("owner", "goal")
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class MainappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'mainapp'
+
+    def ready(self):
+        from . import profiling, signals  # noqa: F401
+        from .search import restore_note_search_triggers
+
+        post_migrate.connect(restore_note_search_triggers, sender=self)
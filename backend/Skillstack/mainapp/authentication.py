@@ -0,0 +1,103 @@
+"""
+JWT authentication without a User query on every request.
+
+CachedJWTAuthentication keeps recently authenticated users in a small
+in-process LRU with a short TTL (JWT_USER_CACHE_TTL seconds, at most
+JWT_USER_CACHE_SIZE users). Saving or deleting a user evicts it (see
+signals.py), so password, active-flag and email changes apply immediately
+in this process; other worker processes pick them up when the TTL expires.
+That window is security-relevant (a deactivated user keeps authenticating
+there), so the TTL stays in single-digit seconds: long enough to absorb a
+client's burst of requests, short enough to bound the staleness.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+DEFAULT_TTL = 5
+DEFAULT_SIZE = 1024
+
+
+class UserCache:
+    """Thread-safe LRU of user objects whose entries expire after `ttl` seconds."""
+
+    def __init__(self, ttl=None, size=None):
+        self.ttl = ttl
+        self.size = size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def _limits(self):
+        ttl = self.ttl if self.ttl is not None else getattr(settings, "JWT_USER_CACHE_TTL", DEFAULT_TTL)
+        size = self.size if self.size is not None else getattr(settings, "JWT_USER_CACHE_SIZE", DEFAULT_SIZE)
+        return ttl, size
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        # Requests may annotate request.user, so each one gets its own copy.
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        ttl, size = self._limits()
+        if ttl <= 0 or size <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + ttl, copy.copy(user))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that serves the token's user from `user_cache` when it can."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from exc
+
+        # Claims may carry the id as int or str; signals evict by str(pk).
+        key = str(user_id)
+        user = user_cache.get(key)
+        if user is None:
+            # The parent does the lookup and all checks for a cold entry.
+            user = super().get_user(validated_token)
+            user_cache.set(key, user)
+            return user
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
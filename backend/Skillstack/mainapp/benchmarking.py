@@ -0,0 +1,445 @@
+"""
+Synthetic data and a load benchmark over every mainapp endpoint.
+
+`seed` fills the database with benchmark users (usernames starting with
+BENCH_USER_PREFIX), each with goals and activities carrying generated
+learning notes, plus a course catalog and the derived skill-neighbor and
+cohort tables. `run_scenarios` drives each Scenario through the Django test
+client, rotating through the benchmark users, and `summarize` reduces the
+samples to throughput, latency percentiles and SQL query counts. `compare`
+checks a result against a stored baseline. The seed_benchmark_data and
+run_benchmarks commands wrap these.
+"""
+
+import json
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import Client
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .cohorts import build_cohort_quantiles
+from .models import CourseResource, LearningActivity, LearningGoal, Skill
+from .skills import build_skill_neighbors
+from .text_analysis import NoteText
+
+BENCH_USER_PREFIX = "bench-"
+BENCH_PASSWORD = "bench-pass-123"
+BATCH_SIZE = 500
+
+SKILL_TOPICS = {
+    "Django": [
+        "class-based views", "DRF serializers", "select_related and prefetch_related", "migrations", "signals",
+        "custom middleware", "JWT authentication", "query optimization",
+    ],
+    "React": ["hooks", "useEffect cleanup", "context providers", "memoization", "React Router", "controlled forms"],
+    "Python": ["generators", "decorators", "asyncio", "dataclasses", "type hints", "context managers"],
+    "SQL": ["window functions", "composite indexes", "query plans", "CTEs", "outer joins", "transactions"],
+    "Docker": ["multi-stage builds", "volumes", "compose networks", "image layer caching", "healthchecks"],
+    "Kubernetes": ["deployments", "services and ingress", "config maps", "liveness probes", "helm charts"],
+    "TypeScript": ["generics", "discriminated unions", "utility types", "strict null checks", "declaration files"],
+    "Machine Learning": [
+        "linear regression", "gradient descent", "cross-validation", "feature scaling", "decision trees",
+    ],
+    "AWS": ["IAM policies", "S3 lifecycle rules", "Lambda cold starts", "VPC subnets", "CloudWatch alarms"],
+    "Git": ["interactive rebase", "bisect", "merge conflicts", "reflog", "branching strategies"],
+}
+PLATFORMS = ["Udemy", "Coursera", "YouTube", "Pluralsight", "freeCodeCamp", "edX", ""]
+VERBS = [
+    "Worked through", "Practiced", "Reviewed", "Built a small project with", "Read the docs on",
+    "Watched a lecture on", "Debugged an issue with", "Took notes on",
+]
+OUTCOMES = [
+    "it finally clicked", "still confusing, need to revisit", "took longer than expected", "wrote a few examples",
+    "made flashcards for the key ideas", "applied it at work the next day", "compared it with what I knew before",
+]
+
+
+def _note(rng, skill):
+    topics = SKILL_TOPICS[skill]
+    topic = rng.choice(topics)
+    sentences = [f"{rng.choice(VERBS)} {topic} in {skill}; {rng.choice(OUTCOMES)}."]
+    if rng.random() < 0.4:
+        sentences.append(f"Question: how does {topic} interact with {rng.choice(topics)}?")
+    if rng.random() < 0.3:
+        sentences.append(f"TODO: practice {rng.choice(topics)} again this week.")
+    return " ".join(sentences)
+
+
+def clear_benchmark_data():
+    """Delete benchmark users (their goals and activities cascade). Returns the number of users."""
+    deleted, per_model = User.objects.filter(username__startswith=BENCH_USER_PREFIX).delete()
+    return per_model.get(User._meta.label, 0)
+
+
+def seed(users, goals, activities, courses=200, seed_value=42, derived=True):
+    """
+    Create `users` benchmark users with `goals` goals of `activities` activities each.
+
+    Deterministic for a given `seed_value` (apart from timestamps, which are
+    relative to now). Rows are bulk-inserted with the fields that model
+    save() would derive (skill, token_stats) filled in.
+    """
+    rng = random.Random(seed_value)
+    now = timezone.now()
+    today = now.date()
+    password = make_password(BENCH_PASSWORD)
+    skills = {name: Skill.objects.resolve(name) for name in SKILL_TOPICS}
+
+    with transaction.atomic():
+        start = User.objects.filter(username__startswith=BENCH_USER_PREFIX).count()
+        created_users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"{BENCH_USER_PREFIX}{index:05d}",
+                    email=f"{BENCH_USER_PREFIX}{index:05d}@example.com",
+                    password=password,
+                )
+                for index in range(start, start + users)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        # SQLite returns primary keys from bulk_create, but be explicit.
+        created_users = list(User.objects.filter(username__in=[user.username for user in created_users]))
+
+        goal_rows = []
+        goal_activities = []
+        for user in created_users:
+            for _ in range(goals):
+                skill = rng.choice(list(SKILL_TOPICS))
+                created = now - timedelta(days=rng.randint(7, 180), minutes=rng.randint(0, 1440))
+                performed = sorted(today - timedelta(days=rng.randint(0, 120)) for _ in range(activities))
+                rows = [(day, Decimal(rng.randint(1, 16)) / 4, _note(rng, skill)) for day in performed]
+                goal_rows.append(
+                    LearningGoal(
+                        owner=user,
+                        skill_name=skill,
+                        skill=skills[skill],
+                        resource_type=rng.choice(LearningGoal.ResourceType.values),
+                        platform=rng.choice(PLATFORMS),
+                        status=rng.choice(LearningGoal.Status.values),
+                        hours_spent=sum((hours for _, hours, _ in rows), Decimal(0)),
+                        difficulty_rating=rng.randint(1, 5),
+                        # Same layout the activity endpoint appends to goal notes.
+                        notes="\n\n".join(f"[{day:%Y-%m-%d} 19:00] {text}" for day, _, text in rows),
+                    )
+                )
+                goal_activities.append((created, rows))
+        LearningGoal.objects.bulk_create(goal_rows, batch_size=BATCH_SIZE)
+
+        activity_rows = []
+        for goal, (created, rows) in zip(goal_rows, goal_activities):
+            # auto_now/auto_now_add fields are only overridable after insert.
+            goal.created_at = created
+            goal.updated_at = max([created, *(now - timedelta(days=(today - day).days) for day, _, _ in rows)])
+            activity_rows.extend(
+                LearningActivity(
+                    goal=goal, performed_on=day, hours_spent=hours, notes=text, token_stats=NoteText(text).to_stats()
+                )
+                for day, hours, text in rows
+            )
+        LearningGoal.objects.bulk_update(goal_rows, ["created_at", "updated_at"], batch_size=BATCH_SIZE)
+        LearningActivity.objects.bulk_create(activity_rows, batch_size=BATCH_SIZE)
+
+        course_rows = []
+        existing = set(CourseResource.objects.filter(url__contains="/bench-course/").values_list("url", flat=True))
+        for index in range(courses):
+            skill = rng.choice(list(SKILL_TOPICS))
+            topic = rng.choice(SKILL_TOPICS[skill])
+            provider = rng.choice([platform for platform in PLATFORMS if platform]).lower() + ".com"
+            url = f"https://{provider}/bench-course/{index}"
+            if url in existing:
+                continue
+            course_rows.append(
+                CourseResource(
+                    url=url,
+                    title=f"{skill}: {topic} in depth",
+                    description=f"Hands-on {skill} course covering {topic} and {rng.choice(SKILL_TOPICS[skill])}.",
+                    provider=provider,
+                    metadata={"fetched_at": now.isoformat(), "content_type": "text/html"},
+                )
+            )
+        CourseResource.objects.bulk_create(course_rows, batch_size=BATCH_SIZE)
+
+    if derived:
+        build_skill_neighbors()
+        build_cohort_quantiles()
+    return {
+        "users": len(created_users),
+        "goals": len(goal_rows),
+        "activities": len(activity_rows),
+        "courses": len(course_rows),
+    }
+
+
+class Scenario:
+    """
+    One endpoint call pattern for request number `index`.
+
+    `build(state, index)` returns (path, body or None), or (path, body,
+    owner_index) to send the request as a different benchmark user.
+    """
+
+    def __init__(self, name, method, build, expected=(200,), auth=True, max_requests=None):
+        self.name = name
+        self.method = method
+        self.build = build
+        self.expected = expected
+        self.auth = auth
+        self.max_requests = max_requests
+
+
+class BenchmarkState:
+    """Benchmark users with tokens and ids, plus ids created during the run."""
+
+    def __init__(self, upstream_url):
+        self.upstream_url = upstream_url
+        self.users = []
+        self._lock = threading.Lock()
+        self.created_goals = []
+        for user in User.objects.filter(username__startswith=BENCH_USER_PREFIX).order_by("username"):
+            goal_ids = list(LearningGoal.objects.filter(owner=user).order_by("id").values_list("id", flat=True))
+            if not goal_ids:
+                continue
+            refresh = RefreshToken.for_user(user)
+            self.users.append(
+                {"user": user, "access": str(refresh.access_token), "refresh": str(refresh), "goals": goal_ids}
+            )
+        if not self.users:
+            raise ValueError("No benchmark users with goals; run seed_benchmark_data first.")
+
+    def user(self, index):
+        return self.users[index % len(self.users)]
+
+    def goal(self, index):
+        goals = self.user(index)["goals"]
+        return goals[(index // len(self.users)) % len(goals)]
+
+    def add_created_goal(self, index, goal_id):
+        with self._lock:
+            self.created_goals.append((index, goal_id))
+
+    def pop_created_goal(self):
+        with self._lock:
+            return self.created_goals.pop() if self.created_goals else (None, None)
+
+
+def _delete_created_goal(state, index):
+    owner_index, goal_id = state.pop_created_goal()
+    return f"/mainapp/learning-goals/{goal_id}/", None, owner_index
+
+
+SCENARIOS = [
+    Scenario("hello_api", "GET", lambda state, i: ("/mainapp/hello/", None), auth=False),
+    Scenario("api-root", "GET", lambda state, i: ("/mainapp/", None)),
+    Scenario("metrics", "GET", lambda state, i: ("/mainapp/metrics/", None), auth=False),
+    Scenario(
+        "register", "POST",
+        lambda state, i: ("/mainapp/register/", {
+            "username": f"bench-register-{time.time_ns()}-{i}", "email": f"register{i}@example.com",
+            "password": BENCH_PASSWORD, "confirm_password": BENCH_PASSWORD,
+        }),
+        expected=(201,), auth=False, max_requests=10,
+    ),
+    Scenario(
+        "token_obtain_pair", "POST",
+        lambda state, i: ("/mainapp/token/", {"username": state.user(i)["user"].username, "password": BENCH_PASSWORD}),
+        auth=False, max_requests=10,
+    ),
+    Scenario(
+        "token_refresh", "POST",
+        lambda state, i: ("/mainapp/token/refresh/", {"refresh": state.user(i)["refresh"]}),
+        auth=False,
+    ),
+    Scenario("profile", "GET", lambda state, i: ("/mainapp/profile/", None)),
+    Scenario("dashboard_bootstrap", "GET", lambda state, i: ("/mainapp/dashboard/bootstrap/", None)),
+    Scenario("learning-goal-list", "GET", lambda state, i: ("/mainapp/learning-goals/", None)),
+    Scenario(
+        "learning-goal-list-filtered", "GET",
+        lambda state, i: ("/mainapp/learning-goals/?status=in_progress&ordering=-updated_at", None),
+    ),
+    Scenario("learning-goal-detail", "GET", lambda state, i: (f"/mainapp/learning-goals/{state.goal(i)}/", None)),
+    Scenario("learning-activity-list", "GET", lambda state, i: ("/mainapp/learning-activities/", None)),
+    Scenario("note_search", "GET", lambda state, i: ("/mainapp/notes/search/?q=hooks", None)),
+    Scenario("resource_recommendations", "POST", lambda state, i: ("/mainapp/ai/resource-recommendations/", {})),
+    Scenario("note_summarization", "POST", lambda state, i: ("/mainapp/ai/note-summarization/", {})),
+    Scenario(
+        "weekly_summary", "POST", lambda state, i: ("/mainapp/learning-summary/send-weekly/", {"send_email": True}),
+    ),
+    Scenario(
+        "course_import", "POST",
+        lambda state, i: ("/mainapp/course-import/", {"url": f"{state.upstream_url}/course/{time.time_ns()}-{i}"}),
+        expected=(201,),
+    ),
+    Scenario(
+        "learning-goal-create", "POST",
+        lambda state, i: ("/mainapp/learning-goals/", {
+            "skill_name": "Django", "platform": "Udemy", "resource_type": "course", "status": "started",
+        }),
+        expected=(201,),
+    ),
+    Scenario(
+        "learning-goal-update", "PATCH",
+        lambda state, i: (f"/mainapp/learning-goals/{state.goal(i)}/", {"status": "in_progress"}),
+    ),
+    Scenario(
+        "learning-activity-create", "POST",
+        lambda state, i: ("/mainapp/learning-activities/", {
+            "goal": state.goal(i), "performed_on": timezone.now().date().isoformat(), "hours_spent": "1.50",
+            "notes": "Practiced select_related and prefetch_related; it finally clicked.",
+        }),
+        expected=(201,),
+    ),
+    # Deletes the goals created above, so it runs as their owners.
+    Scenario("learning-goal-delete", "DELETE", _delete_created_goal, expected=(204,)),
+]
+
+
+def _upstream_server():
+    """Local stand-in for course pages, so course_import does not depend on the network."""
+
+    class CoursePage(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = (
+                f'<html><head><meta property="og:title" content="Course {self.path}">'
+                '<meta property="og:description" content="A synthetic course page."></head></html>'
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CoursePage)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _run_scenario(scenario, state, requests, concurrency):
+    local = threading.local()
+
+    def one(index):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = Client()
+        built = scenario.build(state, index)
+        path, body = built[:2]
+        owner_index = built[2] if len(built) > 2 else index
+        headers = {"Authorization": f"Bearer {state.user(owner_index)['access']}"} if scenario.auth else {}
+        counter = _QueryCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = client.generic(
+                scenario.method, path, json.dumps(body) if body is not None else "",
+                content_type="application/json", headers=headers,
+            )
+        elapsed = time.perf_counter() - started
+        if scenario.name == "learning-goal-create" and response.status_code == 201:
+            state.add_created_goal(index, response.json()["id"])
+        return elapsed, counter.count, response.status_code
+
+    started = time.perf_counter()
+    if concurrency <= 1:
+        samples = [one(index) for index in range(requests)]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(one, range(requests)))
+    return samples, time.perf_counter() - started
+
+
+def summarize(samples, wall_seconds, expected):
+    latencies = sorted(elapsed * 1000 for elapsed, _, _ in samples)
+    queries = [count for _, count, _ in samples]
+    statuses = {}
+    for _, _, status_code in samples:
+        statuses[str(status_code)] = statuses.get(str(status_code), 0) + 1
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+    return {
+        "requests": len(samples),
+        "errors": sum(status_code not in expected for _, _, status_code in samples),
+        "statuses": statuses,
+        "throughput_rps": round(len(samples) / wall_seconds, 1),
+        "mean_ms": round(statistics.fmean(latencies), 2),
+        "p50_ms": round(p50, 2),
+        "p95_ms": round(p95, 2),
+        "p99_ms": round(p99, 2),
+        "queries_mean": round(statistics.fmean(queries), 2),
+        "queries_max": max(queries),
+    }
+
+
+def run_scenarios(requests, concurrency=1, only=None, progress=None):
+    """Run every scenario (or those named in `only`) and return {name: summary}."""
+    server = _upstream_server()
+    try:
+        state = BenchmarkState(f"http://127.0.0.1:{server.server_port}")
+        results = {}
+        for scenario in SCENARIOS:
+            if only and scenario.name not in only:
+                continue
+            count = min(requests, scenario.max_requests or requests)
+            if scenario.name == "learning-goal-delete":
+                count = min(count, len(state.created_goals))
+                if not count:
+                    continue
+            samples, wall = _run_scenario(scenario, state, count, concurrency)
+            results[scenario.name] = {"method": scenario.method, **summarize(samples, wall, scenario.expected)}
+            if progress:
+                progress(scenario.name, results[scenario.name])
+        return results
+    finally:
+        server.shutdown()
+
+
+def compare(results, baseline, latency_threshold=0.25, latency_floor_ms=2.0, query_tolerance=0.5):
+    """
+    Regressions of `results` against `baseline`, as human-readable strings.
+
+    p95 latency regresses when it is more than `latency_threshold` (a
+    fraction) and more than `latency_floor_ms` above the baseline; mean
+    queries per request when they grow by more than `query_tolerance`; and
+    any scenario that returns unexpected statuses. Scenarios missing from
+    the baseline are not compared.
+    """
+    regressions = []
+    for name, current in results["scenarios"].items():
+        if current["errors"]:
+            regressions.append(f"{name}: {current['errors']} unexpected responses {current['statuses']}")
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        limit = max(previous["p95_ms"] * (1 + latency_threshold), previous["p95_ms"] + latency_floor_ms)
+        if current["p95_ms"] > limit:
+            regressions.append(f"{name}: p95 {current['p95_ms']} ms > baseline {previous['p95_ms']} ms")
+        if current["queries_mean"] > previous["queries_mean"] + query_tolerance:
+            regressions.append(
+                f"{name}: {current['queries_mean']} queries/request > baseline {previous['queries_mean']}"
+            )
+    return regressions
@@ -0,0 +1,86 @@
+"""
+Per-request compute budgets for the AI endpoints.
+
+A view creates a ComputeBudget from settings (AI_COMPUTE_BUDGET_MS, capped
+by AI_COMPUTE_BUDGET_MAX_MS), optionally lowered or raised by the client's
+X-Compute-Budget-Ms header. Analysis stages call `allows(stage)` before
+optional work and `expired()` inside long loops; once the budget runs out
+the view answers with what it has and `partial: true`.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+BUDGET_HEADER = "HTTP_X_COMPUTE_BUDGET_MS"
+DEFAULT_BUDGET_MS = 2000
+DEFAULT_MAX_BUDGET_MS = 10000
+
+_stats_lock = threading.Lock()
+_requests = Counter()
+_exhausted = Counter()
+_skipped_stages = Counter()
+
+
+class ComputeBudget:
+    """Cooperative wall-clock budget; nothing is interrupted, stages opt in."""
+
+    def __init__(self, milliseconds, endpoint=""):
+        self.milliseconds = milliseconds
+        self.endpoint = endpoint
+        self.deadline = time.perf_counter() + milliseconds / 1000
+        self.exhausted = False
+        self.skipped = []
+
+    @classmethod
+    def for_request(cls, request, endpoint):
+        """Budget from settings and the request header; raises ValueError for a bad header."""
+        milliseconds = getattr(settings, "AI_COMPUTE_BUDGET_MS", DEFAULT_BUDGET_MS)
+        header = request.META.get(BUDGET_HEADER)
+        if header not in (None, ""):
+            try:
+                milliseconds = int(header)
+            except ValueError:
+                raise ValueError("X-Compute-Budget-Ms must be an integer number of milliseconds.")
+            if milliseconds < 0:
+                raise ValueError("X-Compute-Budget-Ms must not be negative.")
+        milliseconds = min(milliseconds, getattr(settings, "AI_COMPUTE_BUDGET_MAX_MS", DEFAULT_MAX_BUDGET_MS))
+        with _stats_lock:
+            _requests[endpoint] += 1
+        return cls(milliseconds, endpoint)
+
+    def remaining(self):
+        """Seconds left, never negative."""
+        return max(0.0, self.deadline - time.perf_counter())
+
+    def expired(self):
+        if not self.exhausted and time.perf_counter() >= self.deadline:
+            self.exhausted = True
+            with _stats_lock:
+                _exhausted[self.endpoint] += 1
+            logger.info("Compute budget of %dms exhausted in %s", self.milliseconds, self.endpoint)
+        return self.exhausted
+
+    def allows(self, stage):
+        """Whether an optional stage may run; records it as skipped otherwise."""
+        if self.expired():
+            self.skipped.append(stage)
+            with _stats_lock:
+                _skipped_stages[f"{self.endpoint}:{stage}"] += 1
+            return False
+        return True
+
+
+def budget_stats():
+    """Snapshot of budget counters since process start."""
+    with _stats_lock:
+        return {
+            "requests": dict(_requests),
+            "exhausted": dict(_exhausted),
+            "skipped_stages": dict(_skipped_stages),
+        }
@@ -0,0 +1,342 @@
+"""
+Single-flight coalescing of identical expensive requests.
+
+Double-clicks and duplicate tabs send the same POST several times at once.
+`coalesced` wraps a view method so that concurrent requests with the same
+key (user, path, normalized body and compute budget header) wait for one
+in-flight computation and answer with its result.
+
+Two backends, chosen by REQUEST_COALESCING_BACKEND:
+
+- "memory": threads of one process share an in-flight call.
+- "file":   worker processes on one host serialize on an flock()ed file per
+            key; when duplicates are waiting, the leader writes its response
+            next to the lock for them to reuse, and nothing is left behind
+            once they have read it. Needs fcntl (POSIX); other platforms fall
+            back to "memory".
+
+Duplicates get the leader's status, body and the headers its handler set
+(cache, Vary and the like). Headers added later by middleware, such as
+Server-Timing, are computed for each response as usual.
+
+Async views (ASGI) use `coalesced_async`, which shares an in-flight coroutine
+between requests on one event loop whatever the backend; with one loop per
+worker process, duplicates that reach different workers each compute.
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import weakref
+from collections import Counter
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from .budget import BUDGET_HEADER
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("memory", "file")
+
+_stats_lock = threading.Lock()
+_stats = Counter()
+
+
+def _count(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def coalesce_stats():
+    """Snapshot of leader/shared counters since process start."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def request_key(request, scope):
+    """Key identifying a duplicate of `request`; body key order does not matter."""
+    body = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder, default=str)
+    parts = (scope, str(request.user.pk), request.path, body, request.META.get(BUDGET_HEADER, ""))
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """In-process single flight: one caller per key runs `func`, the rest wait."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        """Return (result, shared); errors of the leader are raised in every waiter."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+class AsyncSingleFlight:
+    """Single flight for coroutines: one task per key and event loop runs `func`, the rest await it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = weakref.WeakKeyDictionary()
+
+    def _loop_calls(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            calls = self._calls.get(loop)
+            if calls is None:
+                calls = self._calls[loop] = {}
+            return calls
+
+    async def do(self, key, func):
+        """Return (result, shared); errors of the leader are raised in every waiter."""
+        calls = self._loop_calls()
+        while key in calls:
+            future = calls[key]
+            await asyncio.wait([future])
+            if not future.cancelled():
+                return future.result(), True
+            # The leader's request was cancelled (client went away); take over.
+        future = calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # retrieved, so an unawaited failure is not logged again
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del calls[key]
+        return result, False
+
+
+def _unlink(*paths):
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+class FileSingleFlight:
+    """
+    Cross-process single flight on one host, built on flock().
+
+    Results must be JSON-serializable. Callers that find a key busy hold a
+    shared lock on its `.waiting` file while they wait; the leader only writes
+    its result to disk when that lock is held, and the last waiter to read it
+    removes it. Lock files are removed when released. A waiter only reuses a
+    result written after it arrived, so a finished computation is never served
+    to a request that came in later; if the leader failed, the waiter computes.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        # Results are users' responses: keep them readable by this user only.
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        os.chmod(directory, 0o700)
+
+    def do(self, key, func):
+        arrived = time.time()
+        lock_path = os.path.join(self.directory, f"{key}.lock")
+        waiting_path = os.path.join(self.directory, f"{key}.waiting")
+        result_path = os.path.join(self.directory, f"{key}.json")
+        lock_file = self._lock(lock_path, blocking=False)
+        contended = lock_file is None
+        if contended:
+            with open(waiting_path, "a") as waiting:
+                fcntl.flock(waiting, fcntl.LOCK_SH)
+                lock_file = self._lock(lock_path, blocking=True)
+                shared = self._read_result(result_path, arrived)
+            if shared is not None:
+                try:
+                    if not self._has_waiters(waiting_path):
+                        _unlink(result_path, waiting_path)
+                    return shared["result"], True
+                finally:
+                    self._unlock(lock_file, lock_path)
+        try:
+            result = func()
+            if self._has_waiters(waiting_path):
+                self._write_result(result_path, result)
+            elif contended:
+                # The leader we waited for failed; clear what it or its waiters left.
+                _unlink(result_path, waiting_path)
+            return result, False
+        finally:
+            self._unlock(lock_file, lock_path)
+
+    @staticmethod
+    def _lock(path, blocking):
+        """Lock `path` exclusively; None if it is held and `blocking` is false."""
+        while True:
+            handle = open(path, "a")
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                handle.close()
+                return None
+            try:
+                current = os.stat(path).st_ino
+            except FileNotFoundError:
+                current = None
+            # The holder we waited for removed the file; lock the one now in its place.
+            if current == os.fstat(handle.fileno()).st_ino:
+                return handle
+            handle.close()
+
+    @staticmethod
+    def _unlock(handle, path):
+        _unlink(path)
+        fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+    @staticmethod
+    def _has_waiters(path):
+        try:
+            handle = open(path)
+        except FileNotFoundError:
+            return False
+        with handle:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True
+            return False
+
+    @staticmethod
+    def _read_result(path, arrived):
+        try:
+            with open(path) as handle:
+                stored = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        return stored if stored.get("finished", 0) >= arrived else None
+
+    @staticmethod
+    def _write_result(path, result):
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}"
+        with open(temporary, "w") as handle:
+            json.dump({"finished": time.time(), "result": result}, handle, cls=DjangoJSONEncoder)
+        os.replace(temporary, path)
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+_async_flight = AsyncSingleFlight()
+
+
+def get_flight():
+    """The process-wide flight for the configured backend."""
+    backend = getattr(settings, "REQUEST_COALESCING_BACKEND", "memory")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown request coalescing backend: {backend!r}")
+    if backend == "file" and fcntl is None:
+        backend = "memory"
+    with _flights_lock:
+        flight = _flights.get(backend)
+        if flight is None:
+            if backend == "file":
+                directory = getattr(settings, "REQUEST_COALESCING_LOCK_DIR", None) or os.path.join(
+                    tempfile.gettempdir(), "skillstack-coalesce"
+                )
+                flight = FileSingleFlight(str(directory))
+            else:
+                flight = SingleFlight()
+            _flights[backend] = flight
+        return flight
+
+
+def coalesced(scope, on_shared=None):
+    """
+    Decorate an APIView handler so concurrent identical requests share one response.
+
+    `on_shared` is called for each request answered with another's response.
+    """
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            def compute():
+                response = handler(view, request, *args, **kwargs)
+                # DRF sets Content-Type when it renders each response.
+                headers = {name: value for name, value in response.items() if name.lower() != "content-type"}
+                return {"data": response.data, "status": response.status_code, "headers": headers}
+
+            result, shared = get_flight().do(request_key(request, scope), compute)
+            _count("shared" if shared else "leader")
+            if shared:
+                logger.info("Coalesced duplicate %s request for user %s", scope, request.user.pk)
+                if on_shared is not None:
+                    on_shared()
+            return Response(result["data"], status=result["status"], headers=result["headers"])
+
+        return wrapper
+
+    return decorator
+
+
+def coalesced_async(scope, on_shared=None):
+    """`coalesced` for AsyncAPIView handlers; the shared response is rebuilt for each request."""
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(view, request, *args, **kwargs):
+            async def compute():
+                response = await handler(view, request, *args, **kwargs)
+                return response.content, response.status_code, dict(response.items())
+
+            (content, status, headers), shared = await _async_flight.do(request_key(request, scope), compute)
+            _count("shared" if shared else "leader")
+            if shared:
+                logger.info("Coalesced duplicate %s request for user %s", scope, request.user.pk)
+                if on_shared is not None:
+                    on_shared()
+            return HttpResponse(content, status=status, headers=headers)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,111 @@
+from bisect import bisect_left
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+
+from .models import CohortQuantiles, LearningActivity, LearningGoal
+
+METRICS = ("weekly_hours", "completion_rate", "average_difficulty")
+PERCENTILES = 100
+
+
+def _week_start():
+    return timezone.now().date() - timedelta(days=7)
+
+
+def quantile_cut_points(values, percentiles=PERCENTILES):
+    """Linearly interpolated cut points for 0..`percentiles` over `values`."""
+    ordered = sorted(values)
+    if not ordered:
+        return []
+    last = len(ordered) - 1
+    cut_points = []
+    for step in range(percentiles + 1):
+        position = last * step / percentiles
+        lower = int(position)
+        upper = min(lower + 1, last)
+        fraction = position - lower
+        cut_points.append(round(ordered[lower] + (ordered[upper] - ordered[lower]) * fraction, 4))
+    return cut_points
+
+
+def percentile_rank(cut_points, value):
+    """Share of learners (0-100) strictly below `value`, by binary search.
+
+    Ties do not count, so a value shared by a large block of learners ranks
+    at the bottom of that block; a value at the minimum ranks 0.
+    """
+    if not cut_points:
+        return None
+    return min(PERCENTILES, bisect_left(cut_points, value))
+
+
+def collect_learner_metrics(chunk_size=5000):
+    """Load every learner's metrics as one list of values per metric."""
+    goal_stats = (
+        LearningGoal.objects.filter(owner__isnull=False)
+        .order_by()
+        .values("owner_id")
+        .annotate(
+            total=Count("id"),
+            completed=Count("id", filter=Q(status=LearningGoal.Status.COMPLETED)),
+            difficulty=Avg("difficulty_rating"),
+        )
+    )
+    weekly_hours = dict(
+        LearningActivity.objects.filter(performed_on__gte=_week_start(), goal__owner__isnull=False)
+        .order_by()
+        .values("goal__owner_id")
+        .annotate(hours=Sum("hours_spent"))
+        .values_list("goal__owner_id", "hours")
+    )
+    values = {metric: [] for metric in METRICS}
+    for row in goal_stats.iterator(chunk_size=chunk_size):
+        values["weekly_hours"].append(float(weekly_hours.get(row["owner_id"]) or 0))
+        values["completion_rate"].append(row["completed"] / row["total"] * 100)
+        values["average_difficulty"].append(float(row["difficulty"]))
+    return values
+
+
+def build_cohort_quantiles():
+    """Recompute the quantile table for every metric. Returns the population size."""
+    values = collect_learner_metrics()
+    with transaction.atomic():
+        for metric in METRICS:
+            CohortQuantiles.objects.update_or_create(
+                metric=metric,
+                defaults={
+                    "cut_points": quantile_cut_points(values[metric]),
+                    "population": len(values[metric]),
+                },
+            )
+    return len(values[METRICS[0]])
+
+
+def learner_standing(user):
+    """A learner's current metrics and where they rank against the last build."""
+    tables = {row.metric: row.cut_points for row in CohortQuantiles.objects.filter(population__gt=0)}
+    if not tables:
+        return {}
+    goal_stats = LearningGoal.objects.filter(owner=user).aggregate(
+        total=Count("id"),
+        completed=Count("id", filter=Q(status=LearningGoal.Status.COMPLETED)),
+        difficulty=Avg("difficulty_rating"),
+    )
+    if not goal_stats["total"]:
+        return {}
+    hours = LearningActivity.objects.filter(goal__owner=user, performed_on__gte=_week_start()).aggregate(
+        hours=Sum("hours_spent")
+    )["hours"]
+    metrics = {
+        "weekly_hours": float(hours or 0),
+        "completion_rate": goal_stats["completed"] / goal_stats["total"] * 100,
+        "average_difficulty": float(goal_stats["difficulty"]),
+    }
+    return {
+        metric: {"value": round(value, 2), "percentile": percentile_rank(tables[metric], value)}
+        for metric, value in metrics.items()
+        if metric in tables
+    }
@@ -0,0 +1,194 @@
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import Counter
+
+from django.db.models import Count, Max
+
+from .models import CourseResource
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#]*")
+STOP_WORDS = frozenset(
+    {
+        "about", "after", "also", "and", "are", "been", "but", "can", "for", "from",
+        "have", "how", "into", "its", "more", "not", "now", "our", "that", "the",
+        "their", "this", "was", "were", "what", "when", "where", "which", "will",
+        "with", "you", "your",
+    }
+)
+
+TITLE_WEIGHT = 2
+SKILL_WEIGHT = 3
+MAX_NOTE_TOKENS_PER_GOAL = 200
+# Rebuilds tried before a refresh gives up on a catalog that keeps changing.
+REFRESH_ATTEMPTS = 3
+
+
+def tokenize(text):
+    """Lowercase word tokens with stop words and single letters removed."""
+    if not text:
+        return []
+    return [
+        token
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def course_terms(title, description, provider):
+    """Term counts for a course; title terms count double."""
+    terms = Counter(tokenize(description))
+    terms.update(tokenize(provider))
+    for token in tokenize(title):
+        terms[token] += TITLE_WEIGHT
+    return terms
+
+
+def goal_query_terms(goals):
+    """Build a query term counter from goal skill names and (capped) notes."""
+    terms = Counter()
+    for goal in goals:
+        for token in tokenize(goal.skill_name):
+            terms[token] += SKILL_WEIGHT
+        terms.update(tokenize(goal.notes)[:MAX_NOTE_TOKENS_PER_GOAL])
+    return terms
+
+
+class CourseIndex:
+    """
+    In-process TF-IDF inverted index over the CourseResource catalog.
+
+    Postings hold raw term frequencies so that documents can be added or
+    replaced without touching the rest of the index; IDF weights and document
+    norms are derived lazily and only recomputed after the catalog changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._postings = {}
+        self._doc_terms = {}
+        self._docs = {}
+        self._norms = None
+        self._watermark = None
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _idf(self, term):
+        df = len(self._postings.get(term, ()))
+        return math.log((1 + len(self._docs)) / (1 + df)) + 1
+
+    def _remove(self, course_id):
+        for term in self._doc_terms.pop(course_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(course_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._docs.pop(course_id, None)
+
+    def upsert(self, course):
+        """Add a course to the index, replacing any previous version of it."""
+        terms = course_terms(course.title, course.description, course.provider)
+        with self._lock:
+            self._remove(course.id)
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[course.id] = tf
+            self._doc_terms[course.id] = tuple(terms)
+            self._docs[course.id] = {
+                "id": course.id,
+                "url": course.url,
+                "title": course.title,
+                "provider": course.provider,
+            }
+            self._norms = None
+
+    def remove(self, course_id):
+        with self._lock:
+            self._remove(course_id)
+            self._norms = None
+
+    @staticmethod
+    def _catalog_stats():
+        return CourseResource.objects.aggregate(total=Count("id"), latest=Max("updated_at"))
+
+    def _load(self, stats):
+        """Upsert rows updated since the watermark; True if the index now matches `stats`."""
+        queryset = CourseResource.objects.only("id", "url", "title", "description", "provider", "updated_at")
+        if self._watermark is not None:
+            queryset = queryset.filter(updated_at__gt=self._watermark)
+        for course in queryset.iterator(chunk_size=500):
+            self.upsert(course)
+        self._watermark = stats["latest"]
+        return len(self._docs) == stats["total"]
+
+    def refresh(self):
+        """
+        Pull catalog changes into the index.
+
+        Only rows updated since the last refresh are read; a full rebuild is
+        done when rows have disappeared (deletions can't be seen by watermark).
+        Rebuilds run beside the live index and replace it only once they match
+        the catalog; if the catalog keeps changing for REFRESH_ATTEMPTS
+        rebuilds, the index keeps serving what it had.
+        """
+        for _ in range(REFRESH_ATTEMPTS):
+            stats = self._catalog_stats()
+            with self._lock:
+                if stats["total"] == len(self._docs) and stats["latest"] == self._watermark:
+                    return
+                if self._watermark is not None and self._load(stats):
+                    return
+            rebuilt = CourseIndex()
+            if rebuilt._load(self._catalog_stats()):
+                with self._lock:
+                    self._postings = rebuilt._postings
+                    self._doc_terms = rebuilt._doc_terms
+                    self._docs = rebuilt._docs
+                    self._norms = None
+                    self._watermark = rebuilt._watermark
+                return
+        logger.warning("Course catalog changed during %d index rebuilds; keeping the current index.", REFRESH_ATTEMPTS)
+
+    def _document_norms(self):
+        if self._norms is None:
+            squares = {}
+            for term, postings in self._postings.items():
+                idf = self._idf(term)
+                for course_id, tf in postings.items():
+                    squares[course_id] = squares.get(course_id, 0.0) + (tf * idf) ** 2
+            self._norms = {course_id: math.sqrt(value) for course_id, value in squares.items()}
+        return self._norms
+
+    def search(self, query_terms, limit=5):
+        """Return the top `limit` courses by cosine similarity to `query_terms`."""
+        with self._lock:
+            if not query_terms or not self._docs:
+                return []
+            norms = self._document_norms()
+            scores = {}
+            query_norm = 0.0
+            for term, qtf in query_terms.items():
+                idf = self._idf(term)
+                weight = qtf * idf
+                query_norm += weight ** 2
+                for course_id, tf in self._postings.get(term, {}).items():
+                    scores[course_id] = scores.get(course_id, 0.0) + weight * tf * idf
+            if not scores:
+                return []
+            query_norm = math.sqrt(query_norm)
+            top = heapq.nlargest(
+                limit,
+                ((score / (query_norm * norms[course_id]), course_id) for course_id, score in scores.items()),
+            )
+            return [dict(self._docs[course_id], score=round(score, 4)) for score, course_id in top]
+
+
+course_index = CourseIndex()
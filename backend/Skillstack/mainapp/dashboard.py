@@ -0,0 +1,80 @@
+"""
+Data for the dashboard's first paint, in a fixed number of queries.
+
+`bootstrap_payload` backs DashboardBootstrapView: the profile comes from
+request.user, goals and recent activities are one query each, and the weekly
+stats are one aggregate query that is cached until the user's goals or
+activities change (signals.py calls `invalidate_weekly_stats`).
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import LearningActivity, LearningGoal
+from .serializers import LearningActivitySerializer, LearningGoalSerializer
+
+GOALS_PAGE_SIZE = 100
+RECENT_ACTIVITY_LIMIT = 50
+# Bounds how far the rolling 7-day window can lag, and staleness across
+# processes, since invalidation only reaches this process's cache.
+WEEKLY_STATS_TTL = 300
+
+
+def _weekly_stats_key(user_id):
+    return f"dashboard:weekly-stats:{user_id}"
+
+
+def weekly_stats(user):
+    """Goals updated, activities and hours in the last 7 days, as in the weekly summary."""
+    key = _weekly_stats_key(user.pk)
+    stats = cache.get(key)
+    if stats is not None:
+        return stats
+    start = timezone.now() - timedelta(days=7)
+    recent_activity = Q(activities__performed_on__gte=start.date())
+    # One pass over goals joined to activities; each activity row belongs to
+    # exactly one goal, so only the goal count needs DISTINCT.
+    totals = LearningGoal.objects.filter(owner=user).aggregate(
+        goals_updated=Count("id", filter=Q(updated_at__gte=start), distinct=True),
+        activities_logged=Count("activities", filter=recent_activity),
+        hours_logged=Sum("activities__hours_spent", filter=recent_activity),
+    )
+    stats = {
+        "since": start.isoformat(),
+        "goals_updated": totals["goals_updated"],
+        "activities_logged": totals["activities_logged"],
+        "hours_logged": float(totals["hours_logged"] or 0),
+    }
+    cache.set(key, stats, WEEKLY_STATS_TTL)
+    return stats
+
+
+def invalidate_weekly_stats(user_id):
+    cache.delete(_weekly_stats_key(user_id))
+
+
+def bootstrap_payload(user, context):
+    """Profile, first goals page, recent activities and weekly stats for `user`."""
+    goals = list(LearningGoal.objects.filter(owner=user).order_by("-created_at")[:GOALS_PAGE_SIZE + 1])
+    activities = list(
+        LearningActivity.objects.select_related("goal")
+        .filter(goal__owner=user)
+        .order_by("-performed_on", "-created_at")[:RECENT_ACTIVITY_LIMIT + 1]
+    )
+    return {
+        "profile": {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+        },
+        "goals": LearningGoalSerializer(goals[:GOALS_PAGE_SIZE], many=True, context=context).data,
+        "has_more_goals": len(goals) > GOALS_PAGE_SIZE,
+        "activities": LearningActivitySerializer(activities[:RECENT_ACTIVITY_LIMIT], many=True, context=context).data,
+        "has_more_activities": len(activities) > RECENT_ACTIVITY_LIMIT,
+        "weekly_stats": weekly_stats(user),
+    }
@@ -0,0 +1,127 @@
+"""
+Multi-pattern keyword matching for note analysis.
+
+KeywordMatcher compiles a set of keywords into an Aho-Corasick automaton and
+reports every occurrence, overlapping ones included, in a single pass over
+the text. When the optional `pyahocorasick` package is installed its C
+automaton is used; otherwise the trie is flattened into a pure-Python DFA.
+Keywords are lowercased when the matcher is built and matching is
+case-sensitive, so callers pass lowercased text.
+"""
+
+from collections import Counter, deque
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional accelerated backend
+    ahocorasick = None
+
+BACKENDS = ("pyahocorasick", "python")
+
+
+class KeywordMatcher:
+    """Find all occurrences of a fixed set of keywords in one pass."""
+
+    # Keywords without whitespace can only match inside a single token, so
+    # counts() looks tokens up in a cache and runs the automaton on misses.
+    token_cache_size = 50_000
+
+    def __init__(self, keywords, backend=None):
+        self.keywords = tuple(dict.fromkeys(keyword.lower() for keyword in keywords if keyword))
+        if backend is None:
+            backend = "pyahocorasick" if ahocorasick is not None else "python"
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown keyword matcher backend: {backend!r}")
+        if backend == "pyahocorasick" and ahocorasick is None:
+            raise ValueError("The pyahocorasick backend requires the pyahocorasick package.")
+        self.backend = backend
+        self._tokenizable = not any(char.isspace() for keyword in self.keywords for char in keyword)
+        self._token_cache = {}
+        if backend == "pyahocorasick":
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            if self.keywords:
+                self._automaton.make_automaton()
+        else:
+            self._transitions, self._outputs = self._build_dfa(self.keywords)
+
+    @staticmethod
+    def _build_dfa(keywords):
+        goto = [{}]
+        outputs = [()]
+        for keyword in keywords:
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    goto.append({})
+                    outputs.append(())
+                    next_state = goto[state][char] = len(goto) - 1
+                state = next_state
+            outputs[state] += (keyword,)
+
+        # Breadth-first failure links, then fold them into full transition
+        # tables so matching never has to follow a failure chain.
+        fail = [0] * len(goto)
+        transitions = [dict(goto[0])]
+        transitions.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] += outputs[fail[state]]
+            transitions[state] = {**transitions[fail[state]], **goto[state]}
+            for char, next_state in goto[state].items():
+                fail[next_state] = transitions[fail[state]].get(char, 0) if state else 0
+                queue.append(next_state)
+        return transitions, outputs
+
+    def iter(self, text):
+        """Yield (start, keyword) for every occurrence in `text`."""
+        if not self.keywords or not text:
+            return
+        if self.backend == "pyahocorasick":
+            for end, keyword in self._automaton.iter(text):
+                yield end - len(keyword) + 1, keyword
+            return
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+        for index, char in enumerate(text):
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                for keyword in outputs[state]:
+                    yield index - len(keyword) + 1, keyword
+
+    def _token_hits(self, token):
+        hits = self._token_cache.get(token)
+        if hits is None:
+            if len(self._token_cache) >= self.token_cache_size:
+                self._token_cache.clear()
+            hits = self._token_cache[token] = tuple(keyword for _, keyword in self.iter(token))
+        return hits
+
+    def counts(self, text):
+        """Occurrences per keyword; keywords that never occur are omitted."""
+        if not self._tokenizable:
+            return Counter(keyword for _, keyword in self.iter(text))
+        # Gather hits in a list and count them once; building a Counter
+        # per token costs more than the automaton on cached tokens.
+        cached = self._token_cache.get
+        hits = []
+        for token in text.split():
+            token_hits = cached(token)
+            if token_hits is None:
+                token_hits = self._token_hits(token)
+            if token_hits:
+                hits.extend(token_hits)
+        return Counter(hits)
+
+    def positions(self, text):
+        """Start offsets per keyword, in ascending order."""
+        found = {}
+        for start, keyword in self.iter(text):
+            found.setdefault(keyword, []).append(start)
+        for starts in found.values():
+            starts.sort()
+        return found
@@ -0,0 +1,15 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from mainapp.cohorts import build_cohort_quantiles
+
+
+class Command(BaseCommand):
+    help = "Recompute cohort percentile tables for weekly hours, completion rate and difficulty."
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        population = build_cohort_quantiles()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Computed cohort quantiles for {population} learners in {elapsed:.2f}s."))
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from mainapp.skills import build_skill_neighbors
+
+
+class Command(BaseCommand):
+    help = "Rebuild the skill co-occurrence table used for next-skill recommendations."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-k", type=int, default=10, help="Neighbors stored per skill.")
+        parser.add_argument("--max-skills", type=int, default=5000, help="Vocabulary size (most common skills).")
+        parser.add_argument("--max-pairs", type=int, default=2_000_000, help="Upper bound on pair counters held in memory.")
+        parser.add_argument("--min-support", type=int, default=2, help="Minimum number of learners sharing a pair.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        written = build_skill_neighbors(
+            top_k=options["top_k"],
+            max_skills=options["max_skills"],
+            max_pairs=options["max_pairs"],
+            min_support=options["min_support"],
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Stored {written} skill neighbors in {elapsed:.2f}s."))
@@ -0,0 +1,58 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+from mainapp.models import LearningGoal
+from mainapp.note_summary import store_note_summary, summarize_owners
+
+
+class Command(BaseCommand):
+    help = "Precompute note summaries for every user and goal, fanned out over a process pool by owner."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Worker processes; 0 computes in this process.",
+        )
+        parser.add_argument("--batch-size", type=int, default=25, help="Owners per worker task.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        owner_ids = list(
+            LearningGoal.objects.filter(owner__isnull=False)
+            .order_by("owner_id")
+            .values_list("owner_id", flat=True)
+            .distinct()
+        )
+        batch_size = max(1, options["batch_size"])
+        batches = [owner_ids[index:index + batch_size] for index in range(0, len(owner_ids), batch_size)]
+
+        if options["workers"] <= 0:
+            results = map(summarize_owners, batches)
+            stored = self._store(results)
+        else:
+            # Workers open their own connections; don't hand them ours.
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options["workers"], initializer=django.setup) as pool:
+                stored = self._store(pool.map(summarize_owners, batches))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored {stored} note summaries for {len(owner_ids)} users in {elapsed:.2f}s.")
+        )
+
+    def _store(self, results):
+        # Only this process writes, which keeps SQLite free of writer contention.
+        stored = 0
+        for rows in results:
+            with transaction.atomic():
+                for owner_id, goal_id, version, payload in rows:
+                    store_note_summary(owner_id, goal_id, version, payload)
+            stored += len(rows)
+        return stored
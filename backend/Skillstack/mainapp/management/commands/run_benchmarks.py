@@ -0,0 +1,138 @@
+import json
+import os
+import platform
+import tempfile
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+
+from mainapp.benchmarking import SCENARIOS, compare, run_scenarios, seed
+from mainapp.response_cache import response_cache
+from mainapp.throttling import bucket_store
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every mainapp endpoint through the Django test client and report throughput, "
+        "p50/p95/p99 latency and SQL queries per request, compared against a stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20, help="Users seeded into the throwaway database.")
+        parser.add_argument("--goals", type=int, default=10, help="Goals per seeded user.")
+        parser.add_argument("--activities", type=int, default=20, help="Activities per seeded goal.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--existing-db",
+            action="store_true",
+            help="Run against the configured database (seeded with seed_benchmark_data) instead of a throwaway one.",
+        )
+        parser.add_argument("--requests", type=int, default=100, help="Requests per scenario.")
+        parser.add_argument("--concurrency", type=int, default=1, help="Client threads per scenario.")
+        parser.add_argument(
+            "--only", action="append", choices=[scenario.name for scenario in SCENARIOS], help="Run only this scenario."
+        )
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON to compare against.")
+        parser.add_argument("--no-compare", action="store_true", help="Skip the baseline comparison.")
+        parser.add_argument("--save-baseline", action="store_true", help="Write the results to --baseline.")
+        parser.add_argument("--latency-threshold", type=float, default=0.25, help="Allowed p95 growth (fraction).")
+        parser.add_argument("--latency-floor-ms", type=float, default=2.0, help="p95 growth always allowed (ms).")
+        parser.add_argument("--query-tolerance", type=float, default=0.5, help="Allowed growth in mean queries.")
+
+    def handle(self, *args, **options):
+        config = {
+            key: options[key] for key in ("users", "goals", "activities", "seed", "requests", "concurrency")
+        }
+        config.update(
+            existing_db=options["existing_db"],
+            python=platform.python_version(),
+            django=django.get_version(),
+            sqlite=connection.Database.sqlite_version,
+        )
+        # Production-like request path, minus limits that would throttle or
+        # log every benchmark request, and with mail kept in memory.
+        overrides = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+            PROFILING_SLOW_REQUEST_MS=None,
+            REST_FRAMEWORK={
+                **settings.REST_FRAMEWORK,
+                "DEFAULT_THROTTLE_RATES": {scope: None for scope in settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]},
+            },
+        )
+        with overrides:
+            response_cache().clear()
+            bucket_store().clear()
+            if options["existing_db"]:
+                scenarios = self._run(options)
+            else:
+                scenarios = self._run_in_throwaway_db(options)
+        results = {"config": config, "scenarios": scenarios}
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(results, indent=2) + "\n")
+            self.stdout.write(f"Wrote results to {options['output']}.")
+        if options["save_baseline"]:
+            Path(options["baseline"]).write_text(json.dumps(results, indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Saved baseline to {options['baseline']}."))
+            return
+        if options["no_compare"]:
+            return
+        baseline_path = Path(options["baseline"])
+        if not baseline_path.exists():
+            self.stdout.write(f"No baseline at {baseline_path}; use --save-baseline to create one.")
+            return
+        baseline = json.loads(baseline_path.read_text())
+        differing = [
+            key for key in ("users", "goals", "activities", "requests", "concurrency", "existing_db")
+            if baseline.get("config", {}).get(key) != config[key]
+        ]
+        if differing:
+            # Request counts and data shape change cache hit rates, so the numbers are not comparable.
+            self.stdout.write(
+                self.style.WARNING(f"Not comparing: the baseline was recorded with different {', '.join(differing)}.")
+            )
+            return
+        regressions = compare(
+            results,
+            baseline,
+            latency_threshold=options["latency_threshold"],
+            latency_floor_ms=options["latency_floor_ms"],
+            query_tolerance=options["query_tolerance"],
+        )
+        if regressions:
+            for regression in regressions:
+                self.stderr.write(regression)
+            raise CommandError(f"{len(regressions)} regression(s) against {baseline_path}.")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {baseline_path}."))
+
+    def _run_in_throwaway_db(self, options):
+        with tempfile.TemporaryDirectory() as directory:
+            connection.settings_dict["TEST"]["NAME"] = os.path.join(directory, "benchmark.sqlite3")
+            old_name = connection.creation.create_test_db(verbosity=0)
+            try:
+                seed(options["users"], options["goals"], options["activities"], seed_value=options["seed"])
+                return self._run(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def _run(self, options):
+        self.stdout.write(
+            f"{'scenario':<30}{'method':<8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+            f"{'queries':>9}{'errors':>8}"
+        )
+
+        def progress(name, summary):
+            self.stdout.write(
+                f"{name:<30}{summary['method']:<8}{summary['throughput_rps']:>9}{summary['p50_ms']:>10}"
+                f"{summary['p95_ms']:>10}{summary['p99_ms']:>10}{summary['queries_mean']:>9}{summary['errors']:>8}"
+            )
+
+        return run_scenarios(options["requests"], options["concurrency"], options["only"], progress)
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from mainapp.benchmarking import BENCH_USER_PREFIX, clear_benchmark_data, seed
+
+
+class Command(BaseCommand):
+    help = (
+        f"Seed synthetic users ({BENCH_USER_PREFIX}*), goals and activities with generated notes, "
+        "a course catalog, and the skill-neighbor and cohort tables built from them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--goals", type=int, default=10, help="Goals per user.")
+        parser.add_argument("--activities", type=int, default=30, help="Activities per goal.")
+        parser.add_argument("--courses", type=int, default=200, help="Catalog courses.")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed gives the same data.")
+        parser.add_argument("--flush", action="store_true", help="Delete existing benchmark users first.")
+        parser.add_argument(
+            "--skip-derived", action="store_true", help="Do not rebuild skill neighbors and cohort quantiles."
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options["flush"]:
+            removed = clear_benchmark_data()
+            self.stdout.write(f"Removed {removed} benchmark users.")
+        counts = seed(
+            options["users"],
+            options["goals"],
+            options["activities"],
+            courses=options["courses"],
+            seed_value=options["seed"],
+            derived=not options["skip_derived"],
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {counts['users']} users, {counts['goals']} goals, {counts['activities']} activities "
+                f"and {counts['courses']} courses in {elapsed:.2f}s."
+            )
+        )
@@ -0,0 +1,333 @@
+"""
+In-process metrics with a Prometheus text exposition endpoint.
+
+Counters and histograms are kept in the process that records them.
+MetricsMiddleware records request latency and error responses per URL name;
+views record course imports, weekly summary emails and AI compute time; the
+compute budget, coalescing and response cache stats are exported alongside.
+
+With several worker processes, point METRICS_DIR at a directory they share:
+each process writes a snapshot of its values there at most every
+METRICS_FLUSH_SECONDS (and at exit), and the metrics endpoint sums every
+snapshot, so whichever worker answers a scrape reports the whole host.
+Snapshots of exited workers are kept so counters never go backwards; clear
+the directory on deploy. p99 alerts come from the histogram buckets, e.g.
+histogram_quantile(0.99, rate(skillstack_http_request_duration_seconds_bucket[5m])).
+"""
+
+import atexit
+import bisect
+import glob
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .budget import budget_stats
+from .coalesce import coalesce_stats
+from .response_cache import response_cache_stats
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_FLUSH_SECONDS = 5
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_lock = threading.Lock()
+_registry = {}
+_collectors = []
+# pid and a per-start token, so a recycled pid never overwrites a dead worker's totals.
+_snapshot_name = f"metrics-{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+_flush_lock = threading.Lock()
+_last_flush = 0.0
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        with _lock:
+            if name in _registry:
+                raise ValueError(f"Metric {name!r} is already registered.")
+            _registry[name] = self
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}.")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def describe(self):
+        return {"type": self.kind, "help": self.help_text, "labelnames": list(self.labelnames)}
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self):
+        return {**self.describe(), "samples": [[list(key), value] for key, value in self._values.items()]}
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        # Per-bucket (not cumulative) counts; the last slot is +Inf.
+        index = bisect.bisect_left(self.buckets, value)
+        with _lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the elapsed seconds of a block; also usable as a decorator."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self):
+        samples = [[list(key), [list(counts), total]] for key, (counts, total) in self._values.items()]
+        return {**self.describe(), "buckets": list(self.buckets), "samples": samples}
+
+
+def register_collector(collector):
+    """`collector()` returns extra snapshot entries ({name: entry}) computed at collection time."""
+    _collectors.append(collector)
+    return collector
+
+
+def snapshot():
+    """This process's metrics as a JSON-serializable dict."""
+    with _lock:
+        data = {name: metric.snapshot() for name, metric in _registry.items()}
+    for collector in _collectors:
+        data.update(collector())
+    return data
+
+
+def merge(snapshots):
+    """Sum snapshots from several processes, sample by sample."""
+    merged = {}
+    for data in snapshots:
+        for name, entry in data.items():
+            target = merged.setdefault(name, {**entry, "samples": {}})
+            for labels, value in entry["samples"]:
+                key = tuple(labels)
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = value
+                elif entry["type"] == "histogram":
+                    target["samples"][key] = [[a + b for a, b in zip(current[0], value[0])], current[1] + value[1]]
+                else:
+                    target["samples"][key] = current + value
+    for entry in merged.values():
+        entry["samples"] = [[list(key), value] for key, value in entry["samples"].items()]
+    return merged
+
+
+def _metrics_dir():
+    return getattr(settings, "METRICS_DIR", None)
+
+
+def flush():
+    """Write this process's snapshot to METRICS_DIR, if configured."""
+    global _last_flush
+    directory = _metrics_dir()
+    if not directory:
+        return
+    with _flush_lock:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, _snapshot_name)
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as handle:
+            json.dump(snapshot(), handle)
+        os.replace(temporary, path)
+        _last_flush = time.monotonic()
+
+
+def maybe_flush():
+    if _metrics_dir() and time.monotonic() - _last_flush >= getattr(
+        settings, "METRICS_FLUSH_SECONDS", DEFAULT_FLUSH_SECONDS
+    ):
+        try:
+            flush()
+        except OSError as exc:
+            logger.warning("Could not write metrics snapshot: %s", exc)
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        flush()
+    except OSError as exc:
+        logger.warning("Could not write metrics snapshot: %s", exc)
+
+
+def collect():
+    """Metrics of every process sharing METRICS_DIR, or of this process alone."""
+    directory = _metrics_dir()
+    if not directory:
+        return merge([snapshot()])
+    flush()
+    snapshots = []
+    for path in glob.glob(os.path.join(directory, "metrics-*.json")):
+        try:
+            with open(path) as handle:
+                snapshots.append(json.load(handle))
+        except (OSError, ValueError):
+            # Removed or half-written by its process; the next scrape picks it up.
+            continue
+    return merge(snapshots)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    return repr(float(value))
+
+
+def render(data):
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for name in sorted(data):
+        entry = data[name]
+        lines.append(f"# HELP {name} {entry['help']}")
+        lines.append(f"# TYPE {name} {entry['type']}")
+        names = entry["labelnames"]
+        for values, value in sorted(entry["samples"]):
+            if entry["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, values)} {_number(value)}")
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip([*entry["buckets"], "+Inf"], counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(bound)
+                lines.append(f"{name}_bucket{_labels(names, values, [('le', le)])} {_number(cumulative)}")
+            lines.append(f"{name}_sum{_labels(names, values)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(names, values)} {_number(cumulative)}")
+    return "\n".join(lines) + "\n"
+
+
+request_duration = Histogram(
+    "skillstack_http_request_duration_seconds", "Request latency by URL name.", ("view", "method")
+)
+request_errors = Counter(
+    "skillstack_http_errors_total", "Responses with status 400 or above by URL name.", ("view", "method", "status")
+)
+course_imports = Counter(
+    "skillstack_course_imports_total",
+    "Course imports: page fetched, shared from a concurrent identical import (cached) or fetch failed.",
+    ("outcome",),
+)
+weekly_summary_emails = Counter(
+    "skillstack_weekly_summary_emails_total", "Weekly summary emails sent or failed.", ("outcome",)
+)
+ai_compute_seconds = Histogram(
+    "skillstack_ai_compute_seconds",
+    "Time computing recommendations and note summaries (cache hits and shared results excluded).",
+    ("endpoint",),
+)
+
+
+def _counter_entry(help_text, labelnames, samples):
+    return {"type": "counter", "help": help_text, "labelnames": list(labelnames), "samples": samples}
+
+
+@register_collector
+def _component_stats():
+    budget = budget_stats()
+    cache = response_cache_stats()
+    return {
+        "skillstack_ai_budget_requests_total": _counter_entry(
+            "AI requests run under a compute budget.",
+            ("endpoint",),
+            [[[endpoint], count] for endpoint, count in budget["requests"].items()],
+        ),
+        "skillstack_ai_budget_exhausted_total": _counter_entry(
+            "AI requests that ran out of compute budget.",
+            ("endpoint",),
+            [[[endpoint], count] for endpoint, count in budget["exhausted"].items()],
+        ),
+        "skillstack_coalesced_requests_total": _counter_entry(
+            "Coalescable requests that computed (leader) or reused a result (shared).",
+            ("outcome",),
+            [[[outcome], count] for outcome, count in coalesce_stats().items()],
+        ),
+        **{
+            f"skillstack_response_cache_{field}_total": _counter_entry(
+                f"Response cache {field} by endpoint.",
+                ("endpoint",),
+                [[[endpoint], stats[field]] for endpoint, stats in cache.items()],
+            )
+            for field in ("hits", "misses", "evictions")
+        },
+    }
+
+
+class MetricsMiddleware:
+    """Latency and error responses per URL name (resolver view_name)."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self._record(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self._record(request, response, time.perf_counter() - started)
+        return response
+
+    def _record(self, request, response, seconds):
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match is not None else "unmatched"
+        request_duration.observe(seconds, view=view, method=request.method)
+        if response.status_code >= 400:
+            request_errors.inc(view=view, method=request.method, status=response.status_code)
+        maybe_flush()
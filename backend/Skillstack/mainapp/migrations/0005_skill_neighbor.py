@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mainapp", "0004_courseresource_updated_at_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SkillNeighbor",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("skill", models.CharField(max_length=150)),
+                ("neighbor", models.CharField(max_length=150)),
+                ("neighbor_name", models.CharField(max_length=150)),
+                ("score", models.FloatField()),
+                ("support", models.PositiveIntegerField()),
+                ("rank", models.PositiveSmallIntegerField()),
+            ],
+            options={
+                "ordering": ("skill", "rank"),
+                "constraints": [models.UniqueConstraint(fields=("skill", "rank"), name="unique_skill_neighbor_rank")],
+            },
+        ),
+    ]
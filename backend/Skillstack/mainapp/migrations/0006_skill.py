@@ -0,0 +1,91 @@
+import re
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# The version suffix rules as of this migration: a version when set apart
+# ("Python 3") or dotted ("python3.12"), or bare trailing digits on a stem
+# known to be versioned ("Python3"). Other trailing digits ("md5", "ES6")
+# are part of the name.
+VERSION_SUFFIX_PATTERN = re.compile(
+    r"^(?P<stem>.*?[a-z+#])(?:[\s-]+v?\d+(?:\.\d+)*|v?\d+(?:\.\d+)+)$", re.IGNORECASE
+)
+BARE_VERSION_SUFFIX_PATTERN = re.compile(r"^(?P<stem>.*?[a-z+#])\d+$", re.IGNORECASE)
+VERSIONED_STEMS = frozenset({
+    "python", "angular", "vue", "php", "java", "node", "ruby", "perl", "swift",
+    "kotlin", "scala", "rails", "django", "laravel", "bootstrap", "html", "css",
+})
+
+
+def normalize(name):
+    return " ".join((name or "").split()).casefold()
+
+
+def version_stem(name):
+    match = VERSION_SUFFIX_PATTERN.match(name)
+    if match is None:
+        match = BARE_VERSION_SUFFIX_PATTERN.match(name)
+        if match and normalize(match.group("stem")) not in VERSIONED_STEMS:
+            match = None
+    return match.group("stem") if match else None
+
+
+def backfill_skills(apps, schema_editor):
+    Skill = apps.get_model("mainapp", "Skill")
+    SkillAlias = apps.get_model("mainapp", "SkillAlias")
+    LearningGoal = apps.get_model("mainapp", "LearningGoal")
+
+    names = LearningGoal.objects.values_list("skill_name", flat=True).distinct()
+    keyed = {}
+    for name in names:
+        key = normalize(name)
+        if key:
+            keyed.setdefault(key, []).append(name)
+
+    skills = {}
+    # Shorter keys first so "python" is named from its own goals when present.
+    for key in sorted(keyed, key=len):
+        name = " ".join(keyed[key][0].split())
+        stem = version_stem(name)
+        # A versioned name resolves to its stem's skill, created if needed.
+        skill_key = normalize(stem) if stem else key
+        skill = skills.get(skill_key)
+        if skill is None:
+            skill = skills[skill_key] = Skill.objects.create(name=stem or name, normalized_name=skill_key)
+            SkillAlias.objects.create(alias=skill_key, skill=skill)
+        if key != skill_key:
+            SkillAlias.objects.create(alias=key, skill=skill)
+        LearningGoal.objects.filter(skill_name__in=keyed[key]).update(skill=skill)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mainapp", "0005_skill_neighbor"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Skill",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=150)),
+                ("normalized_name", models.CharField(max_length=150, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="learninggoal",
+            name="skill",
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="goals", to="mainapp.skill"),
+        ),
+        migrations.CreateModel(
+            name="SkillAlias",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("alias", models.CharField(max_length=150, unique=True)),
+                ("skill", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="aliases", to="mainapp.skill")),
+            ],
+        ),
+        migrations.RunPython(backfill_skills, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mainapp", "0006_skill"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CohortQuantiles",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("metric", models.CharField(max_length=50, unique=True)),
+                ("cut_points", models.JSONField(default=list)),
+                ("population", models.PositiveIntegerField(default=0)),
+                ("computed_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
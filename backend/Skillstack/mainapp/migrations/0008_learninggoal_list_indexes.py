@@ -0,0 +1,38 @@
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mainapp", "0007_cohort_quantiles"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="learninggoal",
+            index=models.Index(fields=["owner", "-created_at"], name="goal_owner_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="learninggoal",
+            index=models.Index(fields=["owner", "status", "-created_at"], name="goal_owner_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="learninggoal",
+            index=models.Index(fields=["owner", "resource_type", "-created_at"], name="goal_owner_type_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="learninggoal",
+            index=models.Index(fields=["owner", "platform", "-created_at"], name="goal_owner_platform_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="learninggoal",
+            index=models.Index(fields=["owner", "difficulty_rating", "-created_at"], name="goal_owner_difficulty_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="learninggoal",
+            index=models.Index(models.F("owner"), django.db.models.functions.text.Lower("skill_name"), name="goal_owner_skill_lower_idx"),
+        ),
+    ]
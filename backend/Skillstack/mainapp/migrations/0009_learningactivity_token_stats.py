@@ -0,0 +1,74 @@
+from collections import Counter
+
+from django.db import migrations, models
+
+# Frozen copy of text_analysis.NoteText.to_stats() at TOKEN_STATS_VERSION 1,
+# so later changes to the live tokenizer do not alter this backfill. Rows
+# whose stats fall behind a newer version are recomputed on read.
+ACTION_KEYWORDS = (
+    "learned", "completed", "understood", "mastered", "implemented",
+    "fixed", "solved", "created", "built", "deployed", "optimized",
+    "discovered", "integrated", "configured", "practiced", "improved", "enhanced",
+)
+NOTE_TOPIC_STOP_WORDS = frozenset(
+    {"this", "that", "with", "from", "into", "have", "about", "where", "which"}
+)
+COMBINED_TOPIC_STOP_WORDS = NOTE_TOPIC_STOP_WORDS | frozenset(
+    {"there", "would", "could", "should", "been", "more"}
+)
+WORD_PUNCTUATION = ".,!?;:"
+
+
+def token_stats(text):
+    text = text or ""
+    words = text.split()
+    lower = text.lower()
+    note_terms = []
+    combined_terms = []
+    for word in words:
+        if len(word) <= 4:
+            continue
+        word_lower = word.lower()
+        clean_word = word_lower.strip(WORD_PUNCTUATION)
+        if len(clean_word) <= 3:
+            continue
+        if word_lower not in NOTE_TOPIC_STOP_WORDS:
+            note_terms.append(clean_word)
+        if word_lower not in COMBINED_TOPIC_STOP_WORDS and not clean_word.endswith("ing"):
+            combined_terms.append(clean_word)
+    return {
+        "v": 1,
+        "words": len(words),
+        "action": next((kw for kw in ACTION_KEYWORDS if kw in lower), None),
+        "note_topics": dict(Counter(note_terms)),
+        "combined_topics": dict(Counter(combined_terms)),
+    }
+
+
+def backfill_token_stats(apps, schema_editor):
+    LearningActivity = apps.get_model("mainapp", "LearningActivity")
+    batch = []
+    for activity in LearningActivity.objects.only("id", "notes").iterator(chunk_size=1000):
+        activity.token_stats = token_stats(activity.notes)
+        batch.append(activity)
+        if len(batch) >= 1000:
+            LearningActivity.objects.bulk_update(batch, ["token_stats"])
+            batch = []
+    if batch:
+        LearningActivity.objects.bulk_update(batch, ["token_stats"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mainapp", "0008_learninggoal_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="learningactivity",
+            name="token_stats",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.RunPython(backfill_token_stats, migrations.RunPython.noop),
+    ]
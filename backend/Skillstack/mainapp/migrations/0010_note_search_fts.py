@@ -0,0 +1,124 @@
+import logging
+
+from django.db import OperationalError, migrations, transaction
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "mainapp_note_search"
+
+# Goals use even rowids (id * 2) and activities odd ones (id * 2 + 1) so both
+# live in one index and triggers can address their row directly. SQLite drops
+# triggers with their table; after a migration rebuilds either table,
+# search.restore_note_search_triggers (post_migrate) recreates them from here.
+CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        skill_name,
+        notes,
+        kind UNINDEXED,
+        object_id UNINDEXED,
+        goal_id UNINDEXED,
+        owner_id UNINDEXED,
+        tokenize = 'porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER mainapp_goal_search_insert AFTER INSERT ON mainapp_learninggoal BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, skill_name, notes, kind, object_id, goal_id, owner_id)
+        VALUES (new.id * 2, new.skill_name, new.notes, 'goal', new.id, new.id, new.owner_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER mainapp_goal_search_update AFTER UPDATE OF skill_name, notes, owner_id ON mainapp_learninggoal BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id * 2;
+        INSERT INTO {FTS_TABLE} (rowid, skill_name, notes, kind, object_id, goal_id, owner_id)
+        VALUES (new.id * 2, new.skill_name, new.notes, 'goal', new.id, new.id, new.owner_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER mainapp_goal_search_rename AFTER UPDATE OF skill_name, owner_id ON mainapp_learninggoal BEGIN
+        UPDATE {FTS_TABLE} SET skill_name = new.skill_name, owner_id = new.owner_id
+        WHERE rowid IN (SELECT id * 2 + 1 FROM mainapp_learningactivity WHERE goal_id = new.id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER mainapp_goal_search_delete AFTER DELETE ON mainapp_learninggoal BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id * 2;
+    END
+    """,
+    f"""
+    CREATE TRIGGER mainapp_activity_search_insert AFTER INSERT ON mainapp_learningactivity BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, skill_name, notes, kind, object_id, goal_id, owner_id)
+        SELECT new.id * 2 + 1, skill_name, new.notes, 'activity', new.id, new.goal_id, owner_id
+        FROM mainapp_learninggoal WHERE id = new.goal_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER mainapp_activity_search_update AFTER UPDATE OF notes, goal_id ON mainapp_learningactivity BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id * 2 + 1;
+        INSERT INTO {FTS_TABLE} (rowid, skill_name, notes, kind, object_id, goal_id, owner_id)
+        SELECT new.id * 2 + 1, skill_name, new.notes, 'activity', new.id, new.goal_id, owner_id
+        FROM mainapp_learninggoal WHERE id = new.goal_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER mainapp_activity_search_delete AFTER DELETE ON mainapp_learningactivity BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+    f"""
+    INSERT INTO {FTS_TABLE} (rowid, skill_name, notes, kind, object_id, goal_id, owner_id)
+    SELECT id * 2, skill_name, notes, 'goal', id, id, owner_id FROM mainapp_learninggoal
+    """,
+    f"""
+    INSERT INTO {FTS_TABLE} (rowid, skill_name, notes, kind, object_id, goal_id, owner_id)
+    SELECT activity.id * 2 + 1, goal.skill_name, activity.notes, 'activity', activity.id, goal.id, goal.owner_id
+    FROM mainapp_learningactivity AS activity
+    JOIN mainapp_learninggoal AS goal ON goal.id = activity.goal_id
+    """,
+]
+
+DROP_STATEMENTS = [
+    "DROP TRIGGER IF EXISTS mainapp_goal_search_insert",
+    "DROP TRIGGER IF EXISTS mainapp_goal_search_update",
+    "DROP TRIGGER IF EXISTS mainapp_goal_search_rename",
+    "DROP TRIGGER IF EXISTS mainapp_goal_search_delete",
+    "DROP TRIGGER IF EXISTS mainapp_activity_search_insert",
+    "DROP TRIGGER IF EXISTS mainapp_activity_search_update",
+    "DROP TRIGGER IF EXISTS mainapp_activity_search_delete",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def create_note_search(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        try:
+            with transaction.atomic(using=connection.alias):
+                cursor.execute(CREATE_STATEMENTS[0])
+        except OperationalError as exc:
+            logger.warning("SQLite FTS5 unavailable, note search will use LIKE queries: %s", exc)
+            return
+        for statement in CREATE_STATEMENTS[1:]:
+            cursor.execute(statement)
+
+
+def drop_note_search(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for statement in DROP_STATEMENTS:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mainapp", "0009_learningactivity_token_stats"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_note_search, drop_note_search),
+    ]
@@ -0,0 +1,37 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("mainapp", "0010_note_search_fts"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserDataVersion",
+            fields=[
+                ("user", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="data_version", serialize=False, to=settings.AUTH_USER_MODEL)),
+                ("version", models.PositiveBigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="NoteSummaryCache",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("data_version", models.PositiveBigIntegerField()),
+                ("payload", models.JSONField(default=dict)),
+                ("computed_at", models.DateTimeField(auto_now=True)),
+                ("goal", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name="+", to="mainapp.learninggoal")),
+                ("owner", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="note_summaries", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(condition=models.Q(("goal__isnull", True)), fields=("owner",), name="unique_overall_note_summary"), models.UniqueConstraint(fields=("owner", "goal"), name="unique_goal_note_summary")],
+            },
+        ),
+    ]
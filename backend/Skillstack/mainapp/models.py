@@ -1,5 +1,98 @@
+import re
+
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Lower
+
+from .text_analysis import NoteText
+
+# A version only when set apart ("Python 3", "Node-18", "Vue v3") or dotted
+# ("python3.12").
+VERSION_SUFFIX_PATTERN = re.compile(
+    r"^(?P<stem>.*?[a-z+#])(?:[\s-]+v?\d+(?:\.\d+)*|v?\d+(?:\.\d+)+)$", re.IGNORECASE
+)
+# Bare trailing digits ("Python3") are a version only on stems known to be
+# versioned; elsewhere they are part of the name ("md5", "h264", "PS5", "ES6").
+BARE_VERSION_SUFFIX_PATTERN = re.compile(r"^(?P<stem>.*?[a-z+#])\d+$", re.IGNORECASE)
+VERSIONED_STEMS = frozenset({
+    "python", "angular", "vue", "php", "java", "node", "ruby", "perl", "swift",
+    "kotlin", "scala", "rails", "django", "laravel", "bootstrap", "html", "css",
+})
+
+
+def normalize_skill_name(name):
+    """Case- and whitespace-insensitive lookup key for a skill name."""
+    return " ".join((name or "").split()).casefold()
+
+
+class SkillManager(models.Manager):
+    def resolve(self, name):
+        """
+        Return the canonical Skill for a free-text name, creating it if needed.
+
+        Names are matched through the alias index; a name that only differs
+        from a skill by a version suffix ("Python 3.12") resolves to the
+        unversioned skill, which is created first if it is not known yet.
+        """
+        key = normalize_skill_name(name)
+        if not key:
+            return None
+        try:
+            return self._resolve(name, key)
+        except IntegrityError:
+            # Another request registered the name or its stem concurrently;
+            # anything else fails again and is raised.
+            return self._resolve(name, key)
+
+    def _resolve(self, name, key):
+        alias = SkillAlias.objects.select_related("skill").filter(alias=key).first()
+        if alias:
+            return alias.skill
+        display_name = " ".join(name.split())
+        match = VERSION_SUFFIX_PATTERN.match(display_name)
+        if match is None:
+            bare = BARE_VERSION_SUFFIX_PATTERN.match(display_name)
+            if bare and normalize_skill_name(bare.group("stem")) in VERSIONED_STEMS:
+                match = bare
+        with transaction.atomic():
+            if match:
+                skill = self._resolve_stem(match.group("stem"))
+            else:
+                skill = self.create(name=display_name, normalized_name=key)
+            SkillAlias.objects.create(alias=key, skill=skill)
+        return skill
+
+    def _resolve_stem(self, stem):
+        key = normalize_skill_name(stem)
+        alias = SkillAlias.objects.select_related("skill").filter(alias=key).first()
+        if alias:
+            return alias.skill
+        skill = self.create(name=stem, normalized_name=key)
+        SkillAlias.objects.create(alias=key, skill=skill)
+        return skill
+
+
+class Skill(models.Model):
+    """Canonical skill that free-text goal skill names resolve to."""
+
+    name = models.CharField(max_length=150)
+    normalized_name = models.CharField(max_length=150, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = SkillManager()
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class SkillAlias(models.Model):
+    """Normalized spelling of a skill name pointing at its canonical Skill."""
+
+    alias = models.CharField(max_length=150, unique=True)
+    skill = models.ForeignKey(Skill, related_name="aliases", on_delete=models.CASCADE)
+
+    def __str__(self) -> str:
+        return f"{self.alias} -> {self.skill.name}"
 
 
 class LearningGoal(models.Model):
@@ -17,6 +110,13 @@ class LearningGoal(models.Model):
         COMPLETED = "completed", "Completed"
 
     skill_name = models.CharField(max_length=150)
+    skill = models.ForeignKey(
+        Skill,
+        related_name="goals",
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+    )
     resource_type = models.CharField(
         max_length=20,
         choices=ResourceType.choices,
@@ -41,9 +141,33 @@ class LearningGoal(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Every list query is scoped to one owner, so indexes lead with owner
+        # and end with the default ordering to avoid a sort step.
+        indexes = [
+            models.Index(fields=["owner", "-created_at"], name="goal_owner_created_idx"),
+            models.Index(fields=["owner", "status", "-created_at"], name="goal_owner_status_idx"),
+            models.Index(fields=["owner", "resource_type", "-created_at"], name="goal_owner_type_idx"),
+            models.Index(fields=["owner", "platform", "-created_at"], name="goal_owner_platform_idx"),
+            models.Index(fields=["owner", "difficulty_rating", "-created_at"], name="goal_owner_difficulty_idx"),
+            models.Index("owner", Lower("skill_name"), name="goal_owner_skill_lower_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.skill_name} ({self.platform or 'Unknown platform'})"
 
+    @property
+    def canonical_skill_name(self):
+        return self.skill.name if self.skill_id else self.skill_name
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "skill_name" in update_fields:
+            self.skill = Skill.objects.resolve(self.skill_name)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "skill"}
+        super().save(*args, **kwargs)
+
 
 class CourseResource(models.Model):
     """Imported course metadata fetched from external URLs."""
@@ -54,7 +178,7 @@ class CourseResource(models.Model):
     provider = models.CharField(max_length=150, blank=True)
     metadata = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self) -> str:
         return self.title or self.url
@@ -71,6 +195,7 @@ class LearningActivity(models.Model):
     performed_on = models.DateField()
     hours_spent = models.DecimalField(max_digits=5, decimal_places=2)
     notes = models.TextField(blank=True)
+    token_stats = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -79,3 +204,93 @@ class LearningActivity(models.Model):
 
     def __str__(self) -> str:
         return f"{self.goal.skill_name} on {self.performed_on}"
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "notes" in update_fields:
+            self.token_stats = NoteText(self.notes).to_stats()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_stats"}
+        super().save(*args, **kwargs)
+
+
+class SkillNeighbor(models.Model):
+    """Precomputed "people who learned X also learned Y" skill pairs."""
+
+    skill = models.CharField(max_length=150)
+    neighbor = models.CharField(max_length=150)
+    neighbor_name = models.CharField(max_length=150)
+    score = models.FloatField()
+    support = models.PositiveIntegerField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ("skill", "rank")
+        constraints = [
+            models.UniqueConstraint(fields=("skill", "rank"), name="unique_skill_neighbor_rank"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.skill} -> {self.neighbor_name} ({self.score:.2f})"
+
+
+class CohortQuantiles(models.Model):
+    """Percentile cut points (0th..100th) of a per-learner metric."""
+
+    metric = models.CharField(max_length=50, unique=True)
+    cut_points = models.JSONField(default=list)
+    population = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.metric} ({self.population} learners)"
+
+
+class UserDataVersion(models.Model):
+    """Per-user counter bumped on every write to the user's goals or activities."""
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="data_version",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.user} v{self.version}"
+
+
+class NoteSummaryCache(models.Model):
+    """A precomputed NoteSummarizationView payload and the data version it reflects."""
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="note_summaries",
+    )
+    goal = models.ForeignKey(
+        LearningGoal,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    data_version = models.PositiveBigIntegerField()
+    payload = models.JSONField(default=dict)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("owner",),
+                condition=models.Q(goal__isnull=True),
+                name="unique_overall_note_summary",
+            ),
+            models.UniqueConstraint(fields=("owner", "goal"), name="unique_goal_note_summary"),
+        ]
+
+    def __str__(self) -> str:
+        scope = f"goal {self.goal_id}" if self.goal_id else "all goals"
+        return f"{self.owner} ({scope}) v{self.data_version}"
@@ -0,0 +1,367 @@
+"""
+Note summaries for NoteSummarizationView.
+
+Activities are fed one at a time, most recent first. Only running totals,
+topic counts, the date range and the first few key points and detailed
+notes are kept, so peak memory stays flat however long the history is.
+
+Unwindowed payloads are cached in NoteSummaryCache, tagged with the
+owner's UserDataVersion; a cached payload is current while the version
+has not moved since it was computed.
+"""
+
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .budget import ComputeBudget
+from .models import LearningActivity, LearningGoal, NoteSummaryCache, UserDataVersion
+from .summarizer import ExtractiveSummarizer
+from .text_analysis import (
+    NoteText,
+    analyze_text_content,
+    goal_note_parts,
+    merge_counts,
+    parse_goal_notes,
+)
+
+logger = logging.getLogger(__name__)
+
+KEY_POINT_LIMIT = 12
+DETAILED_NOTE_LIMIT = 25
+SKILL_KEY_NOTE_LIMIT = 20
+# Activities read between compute budget checks.
+BUDGET_CHECK_INTERVAL = 200
+DEFAULT_PRECOMPUTE_BUDGET_MS = 60000
+
+
+class NoteSummaryAccumulator:
+    """Running summary state for one NoteSummarizationView request."""
+
+    def __init__(self, goal=None, goal_main_notes="", goal_parts=(), goal_notes_analysis=None, by_skill=True, budget=None):
+        self.by_skill = by_skill
+        self.activity_count = 0
+        self.notes_count = 0
+        self.total_hours = 0.0
+        self.words_analyzed = 0
+        self.earliest = None
+        self.latest = None
+        self.topics = {}
+        self.key_points = []
+        self.detailed_notes = []
+        self.skills = {}
+        goal_parts = list(goal_parts)
+        self.goal_text_parts = goal_parts if goal_main_notes else goal_parts[1:]
+        # Goal notes are parsed once per goal, not once per activity.
+        self.goal_notes = {}
+        if goal is not None and goal.notes:
+            self.goal_notes[goal.id] = (goal_main_notes, goal_notes_analysis)
+
+        # All text sources: goal main notes, goal activity entries, activity notes
+        self.summary = ExtractiveSummarizer(budget=budget)
+        for part in self.goal_text_parts:
+            self.summary.feed(part.text)
+
+    def add(self, activity):
+        self.activity_count += 1
+        performed_on = activity.performed_on
+        if self.latest is None or performed_on > self.latest:
+            self.latest = performed_on
+        if self.earliest is None or performed_on < self.earliest:
+            self.earliest = performed_on
+
+        if activity.notes:
+            # Activity token statistics were computed at write time
+            note_text = NoteText.from_stats(activity.notes, activity.token_stats)
+            hours = float(activity.hours_spent)
+            self.notes_count += 1
+            self.total_hours += hours
+            self.words_analyzed += note_text.word_count
+            if len(self.detailed_notes) < DETAILED_NOTE_LIMIT:
+                self.detailed_notes.append({
+                    "date": performed_on.isoformat(),
+                    "hours": hours,
+                    "notes": activity.notes,
+                    "goal": activity.goal.skill_name,
+                    "goal_id": activity.goal.id,
+                })
+            if note_text.action_keyword and len(self.key_points) < KEY_POINT_LIMIT:
+                self.key_points.append({
+                    "date": performed_on.isoformat(),
+                    "content": activity.notes[:150],
+                    "hours": hours,
+                    "skill": activity.goal.skill_name,
+                })
+            # Combined topics are a subset of the note's own topics, so only
+            # the counts change; key order matches a note-topics-first merge.
+            merge_counts(self.topics, note_text.note_topics)
+            merge_counts(self.topics, note_text.combined_topics)
+            self.summary.feed(activity.notes)
+
+        if self.by_skill:
+            self._add_to_skill(activity)
+
+    def _add_to_skill(self, activity):
+        # Grouped on the canonical skill id; keyed by its display name later.
+        goal = activity.goal
+        skill_key = goal.skill_id or goal.skill_name
+        summary = self.skills.get(skill_key)
+        if summary is None:
+            summary = self.skills[skill_key] = {
+                "skill_name": goal.canonical_skill_name,
+                "total_hours": 0,
+                "sessions": 0,
+                "key_notes": [],
+                "goal_id": goal.id,
+                "status": goal.status,
+                "main_notes": "",
+                "notes_analysis": None,
+            }
+        summary["total_hours"] += float(activity.hours_spent)
+        summary["sessions"] += 1
+        if activity.notes and len(summary["key_notes"]) < SKILL_KEY_NOTE_LIMIT:
+            summary["key_notes"].append(activity.notes[:80])
+
+        # Add comprehensive notes analysis for this goal
+        if goal.notes:
+            if activity.goal_id not in self.goal_notes:
+                goal_main, goal_activities = parse_goal_notes(goal.notes)
+                self.goal_notes[activity.goal_id] = (
+                    goal_main,
+                    analyze_text_content(goal_note_parts(goal_main, goal_activities)),
+                )
+            goal_main, notes_analysis = self.goal_notes[activity.goal_id]
+            if goal_main:
+                summary["main_notes"] = goal_main[:200]
+            summary["notes_analysis"] = notes_analysis
+
+    def date_range(self):
+        if self.earliest is None:
+            return {"earliest": None, "latest": None, "duration_days": 0}
+        return {
+            "earliest": self.earliest.isoformat(),
+            "latest": self.latest.isoformat(),
+            "duration_days": (self.latest - self.earliest).days,
+        }
+
+    def top_topics(self, limit=6):
+        # Also extract topics from goal notes and activity entries
+        topics = dict(self.topics)
+        for part in self.goal_text_parts:
+            merge_counts(topics, part.combined_topics)
+        return [term for term, _ in sorted(topics.items(), key=lambda x: x[1], reverse=True)[:limit]]
+
+    def skill_summaries(self):
+        skill_summaries = {}
+        for summary in self.skills.values():
+            summary = dict(summary)
+            skill_summaries[summary.pop("skill_name")] = summary
+        return skill_summaries
+
+
+def build_note_summary(user, goal=None, since=None, until=None, limit=None, chunk_size=500, budget=None):
+    """
+    The NoteSummarizationView payload for `user`, optionally for one goal and
+    date window. With a ComputeBudget, activities stop being read once it
+    runs out and the payload is marked partial.
+    """
+    # Get activities for specific goal or all goals
+    activities = LearningActivity.objects.select_related("goal", "goal__skill").filter(goal__owner=user)
+    if goal:
+        activities = activities.filter(goal_id=goal.id)
+    else:
+        activities = activities.order_by("-performed_on")
+    if since:
+        activities = activities.filter(performed_on__gte=since)
+    if until:
+        activities = activities.filter(performed_on__lte=until)
+    if limit:
+        activities = activities.order_by("-performed_on", "-created_at")[:limit]
+
+    # Parse goal notes if available
+    goal_main_notes = ""
+    goal_activity_entries = []
+    goal_notes_analysis = None
+    goal_parts = []
+
+    if goal and goal.notes:
+        goal_main_notes, goal_activity_entries = parse_goal_notes(goal.notes)
+        # Main notes plus all activity entries for comprehensive analysis
+        goal_parts = goal_note_parts(goal_main_notes, goal_activity_entries)
+        goal_notes_analysis = analyze_text_content(goal_parts)
+
+    # Stream activities in chunks; only running totals are kept in memory
+    accumulator = NoteSummaryAccumulator(
+        goal=goal,
+        goal_main_notes=goal_main_notes,
+        goal_parts=goal_parts,
+        goal_notes_analysis=goal_notes_analysis,
+        by_skill=goal is None,
+        budget=budget,
+    )
+    for activity in activities.iterator(chunk_size=chunk_size):
+        if budget is not None and accumulator.activity_count % BUDGET_CHECK_INTERVAL == 0 and not budget.allows("activities"):
+            break
+        accumulator.add(activity)
+    partial = budget is not None and budget.exhausted
+
+    if not accumulator.activity_count and not partial and (not goal or not goal.notes):
+        return {
+            "success": False,
+            "partial": False,
+            "message": "No learning activities or notes found. Start logging activities and adding notes!",
+            "summary": {},
+            "key_points": []
+        }
+
+    # Extract key points from goal notes entries, then activity notes
+    key_points = []
+    for entry, entry_text in zip(goal_activity_entries, goal_parts[1:]):
+        if entry_text.action_keyword:
+            key_points.append({
+                "date": entry["timestamp"],
+                "content": entry["text"][:150],
+                "hours": 0,
+                "skill": "Goal Context"
+            })
+    key_points.extend(accumulator.key_points)
+
+    topics = accumulator.top_topics()
+    skill_summaries = accumulator.skill_summaries()
+    total_hours = accumulator.total_hours
+    notes_count = accumulator.notes_count
+
+    # Generate meaningful summary text
+    summary_text = ""
+    if goal:
+        summary_text = f"Learning Summary for {goal.skill_name}"
+    else:
+        summary_text = "Overall Learning Summary"
+        if len(skill_summaries) > 0:
+            top_skill = max(skill_summaries.items(), key=lambda x: x[1]["total_hours"])[0]
+            summary_text += f" (Focus: {top_skill})"
+
+    # Generate concise summary from combined notes
+    if budget is not None:
+        accumulator.summary.time_budget = min(accumulator.summary.time_budget, budget.remaining())
+    concise_summary = accumulator.summary.summary()
+    if accumulator.summary.truncated and budget is not None:
+        budget.skipped.append("summary_scoring")
+        partial = True
+
+    # Create AI-powered summary combining all sources
+    ai_summary = {
+        "title": summary_text,
+        "concise_summary": concise_summary,  # Add short 2-3 sentence summary
+        "period": accumulator.date_range(),
+        "total_hours_spent": round(total_hours, 2),
+        "total_sessions": notes_count,
+        "average_hours_per_session": round(total_hours / notes_count, 2) if notes_count else 0,
+        "main_topics": topics,
+        "key_learnings": key_points[:8],
+        "by_skill": skill_summaries if not goal else None,
+        "learning_intensity": "high" if total_hours > 20 else "medium" if total_hours > 10 else "low",
+        "goal_context": {
+            "has_main_notes": bool(goal_main_notes),
+            "main_notes_preview": goal_main_notes[:200] if goal_main_notes else None,
+            "notes_analysis": goal_notes_analysis
+        } if goal else None
+    }
+
+    logger.info("Generated comprehensive summary for user %s with %d activities", user.id, notes_count)
+
+    return {
+            "success": True,
+            "partial": partial,
+            "skipped_stages": list(budget.skipped) if budget is not None else [],
+            "summary": ai_summary,
+            "key_points": key_points[:12],
+            "topics_covered": topics,
+            "detailed_notes": accumulator.detailed_notes,
+            "notes_count": notes_count,
+            "words_analyzed": accumulator.words_analyzed,
+            "window": {
+                "since": since.isoformat() if since else None,
+                "until": until.isoformat() if until else None,
+                "limit": limit,
+            },
+            "goal_notes": {
+                "main_notes": goal_main_notes,
+                "activity_entries": goal_activity_entries,
+                "analysis": goal_notes_analysis
+            } if goal else None
+    }
+
+
+def current_data_version(user_id):
+    return UserDataVersion.objects.filter(user_id=user_id).values_list("version", flat=True).first() or 0
+
+
+def bump_data_version(user_id):
+    """Mark a user's cached summaries stale after a write to their data."""
+    if user_id is None:
+        return
+    bumped = UserDataVersion.objects.filter(user_id=user_id).update(version=F("version") + 1, updated_at=timezone.now())
+    if not bumped:
+        try:
+            with transaction.atomic():
+                UserDataVersion.objects.create(user_id=user_id, version=1)
+        except IntegrityError:
+            UserDataVersion.objects.filter(user_id=user_id).update(version=F("version") + 1, updated_at=timezone.now())
+
+
+def cached_note_summary(user_id, goal, version):
+    """The cached payload for (user, goal) if it was computed at `version`, else None."""
+    return (
+        NoteSummaryCache.objects.filter(owner_id=user_id, goal=goal, data_version=version)
+        .values_list("payload", flat=True)
+        .first()
+    )
+
+
+def store_note_summary(user_id, goal, version, payload):
+    goal_id = goal.id if isinstance(goal, LearningGoal) else goal
+    try:
+        with transaction.atomic():
+            NoteSummaryCache.objects.update_or_create(
+                owner_id=user_id,
+                goal_id=goal_id,
+                defaults={"data_version": version, "payload": payload},
+            )
+    except IntegrityError:
+        # A concurrent request stored the same summary first.
+        pass
+
+
+def summarize_owners(owner_ids):
+    """
+    Compute the overall and per-goal payloads for each owner.
+
+    Runs in worker processes, so it only reads; returns
+    (owner_id, goal_id, data_version, payload) rows for the caller to store.
+    Each owner gets NOTE_SUMMARY_PRECOMPUTE_BUDGET_MS; payloads left partial
+    by it are not returned, so those summaries are computed live instead.
+    """
+    milliseconds = getattr(settings, "NOTE_SUMMARY_PRECOMPUTE_BUDGET_MS", DEFAULT_PRECOMPUTE_BUDGET_MS)
+    rows = []
+    for user in get_user_model().objects.filter(id__in=owner_ids):
+        budget = ComputeBudget(milliseconds, "precompute_note_summaries")
+        # Read the version first: a write during the computation leaves the
+        # rows tagged with an older version, so they are simply not served.
+        version = current_data_version(user.id)
+        payloads = [(None, build_note_summary(user, budget=budget))]
+        for goal in LearningGoal.objects.filter(owner=user):
+            payloads.append((goal.id, build_note_summary(user, goal=goal, budget=budget)))
+        complete = [(user.id, goal_id, version, payload) for goal_id, payload in payloads if not payload["partial"]]
+        if len(complete) < len(payloads):
+            logger.warning(
+                "Precompute budget ran out for user %s; %d note summaries left uncached",
+                user.id,
+                len(payloads) - len(complete),
+            )
+        rows.extend(complete)
+    return rows
@@ -0,0 +1,210 @@
+"""
+Per-request profiling: SQL, view and render time, and response size.
+
+ProfilingMiddleware times every request; a PROFILING_SAMPLE_RATE fraction is
+profiled in detail and gets a Server-Timing header (db, view, render, total
+and response size). SQL is timed by an execute wrapper that every database
+connection gets when it opens and that only records while a sampled request
+is running, so it also sees the queries async views run in ORM threads.
+Requests slower than PROFILING_SLOW_REQUEST_MS are logged to this module's
+logger with a structured `request_profile` record, including the
+PROFILING_SLOW_SQL_COUNT slowest statements when the request was sampled.
+Statements are recorded without their parameters.
+"""
+
+import heapq
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_RATE = 0.05
+DEFAULT_SLOW_REQUEST_MS = 500
+DEFAULT_SLOW_SQL_COUNT = 5
+SQL_TEXT_LIMIT = 1000
+
+_current_profile = ContextVar("request_profile", default=None)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+class RequestProfile:
+    """Timings for one request; SQL is only recorded when `sampled`."""
+
+    def __init__(self, sampled, slow_sql_count=DEFAULT_SLOW_SQL_COUNT):
+        self.sampled = sampled
+        self.slow_sql_count = slow_sql_count
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_finished = None
+        self.rendered = None
+        self.query_count = 0
+        self.query_seconds = 0.0
+        # Min-heap of (seconds, sequence, alias, sql) holding the slowest statements.
+        self._slowest = []
+
+    def record_query(self, alias, sql, seconds):
+        self.query_count += 1
+        self.query_seconds += seconds
+        entry = (seconds, self.query_count, alias, sql)
+        if len(self._slowest) < self.slow_sql_count:
+            heapq.heappush(self._slowest, entry)
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def slowest_queries(self):
+        return [
+            {"alias": alias, "ms": _ms(seconds), "sql": sql[:SQL_TEXT_LIMIT]}
+            for seconds, _, alias, sql in sorted(self._slowest, reverse=True)
+        ]
+
+    def breakdown(self, finished):
+        """Durations in milliseconds; view and render are 0 when the view was never reached."""
+        view_started = self.view_started or finished
+        view_finished = self.view_finished or finished
+        return {
+            "total_ms": _ms(finished - self.started),
+            "view_ms": _ms(view_finished - view_started),
+            "render_ms": _ms((self.rendered or view_finished) - view_finished),
+            "db_ms": _ms(self.query_seconds),
+            "queries": self.query_count,
+        }
+
+
+def _record_queries(execute, sql, params, many, context):
+    profile = _current_profile.get()
+    if profile is None or not profile.sampled:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.record_query(context["connection"].alias, sql, time.perf_counter() - started)
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # Inserted first: connection.execute_wrapper() pops the last wrapper on
+    # exit, so a connection opened inside such a block must not end with ours.
+    if _record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _record_queries)
+
+
+def server_timing(breakdown, response_bytes):
+    entries = [
+        f'db;dur={breakdown["db_ms"]};desc="{breakdown["queries"]} queries"',
+        f'view;dur={breakdown["view_ms"]}',
+        f'render;dur={breakdown["render_ms"]}',
+        f'total;dur={breakdown["total_ms"]}',
+    ]
+    if response_bytes is not None:
+        entries.append(f'size;desc="{response_bytes} bytes"')
+    return ", ".join(entries)
+
+
+class ProfilingMiddleware:
+    """Keep first in MIDDLEWARE so `total` covers the other middleware too."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Async hooks, so the ASGI handler does not hop to a thread for them.
+            self.process_view = self._aprocess_view
+            self.process_template_response = self._aprocess_template_response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        profile, token = self._start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        return self._finish(request, response, profile)
+
+    async def __acall__(self, request):
+        profile, token = self._start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        return self._finish(request, response, profile)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self._view_started(request)
+        return None
+
+    def process_template_response(self, request, response):
+        return self._view_finished(request, response)
+
+    async def _aprocess_view(self, request, view_func, view_args, view_kwargs):
+        self._view_started(request)
+        return None
+
+    async def _aprocess_template_response(self, request, response):
+        return self._view_finished(request, response)
+
+    def _view_started(self, request):
+        profile = getattr(request, "_request_profile", None)
+        if profile is not None:
+            profile.view_started = time.perf_counter()
+
+    def _view_finished(self, request, response):
+        # DRF responses are rendered after the view returns; time that separately.
+        profile = getattr(request, "_request_profile", None)
+        if profile is not None:
+            profile.view_finished = time.perf_counter()
+            response.add_post_render_callback(lambda rendered: setattr(profile, "rendered", time.perf_counter()))
+        return response
+
+    def _start(self, request):
+        sampled = random.random() < getattr(settings, "PROFILING_SAMPLE_RATE", DEFAULT_SAMPLE_RATE)
+        profile = RequestProfile(sampled, getattr(settings, "PROFILING_SLOW_SQL_COUNT", DEFAULT_SLOW_SQL_COUNT))
+        request._request_profile = profile
+        return profile, _current_profile.set(profile)
+
+    def _finish(self, request, response, profile):
+        finished = time.perf_counter()
+        total_ms = _ms(finished - profile.started)
+        threshold = getattr(settings, "PROFILING_SLOW_REQUEST_MS", DEFAULT_SLOW_REQUEST_MS)
+        slow = threshold is not None and total_ms >= threshold
+        if not (profile.sampled or slow):
+            return response
+
+        response_bytes = None if response.streaming else len(response.content)
+        breakdown = profile.breakdown(finished)
+        if profile.sampled:
+            response["Server-Timing"] = server_timing(breakdown, response_bytes)
+        if slow:
+            record = {
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "response_bytes": response_bytes,
+                "sampled": profile.sampled,
+                "total_ms": total_ms,
+            }
+            if profile.sampled:
+                record.update(breakdown, slowest_sql=profile.slowest_queries())
+            logger.warning(
+                "Slow request: %s %s took %.0f ms",
+                request.method,
+                request.path,
+                total_ms,
+                extra={"request_profile": record},
+            )
+        return response
@@ -0,0 +1,179 @@
+"""
+Per-user response cache for read endpoints and the AI views.
+
+`cached_response(endpoint)` wraps a view handler. Entries are keyed on the
+user, the endpoint, the query string and JSON body, and the user's data
+version stamp (version and bump time from UserDataVersion). Every write to
+the user's goals, activities or account bumps that version through
+signals.py, so a changed user simply stops matching their old entries;
+RESPONSE_CACHE_TIMEOUT only bounds inputs that are not the user's own
+(catalog, cohort quantiles, skill neighbours, the rolling weekly window).
+
+Backends (RESPONSE_CACHE_BACKEND):
+
+- "memory": per-process LRU bounded by RESPONSE_CACHE_MAX_ENTRIES.
+- "django": the Django cache named by RESPONSE_CACHE_ALIAS, shared between
+            processes; eviction is left to that cache.
+"""
+
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.response import Response
+
+from .models import UserDataVersion
+
+BACKENDS = ("memory", "django")
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_TIMEOUT = 300
+
+_stats_lock = threading.Lock()
+_hits = Counter()
+_misses = Counter()
+_evictions = Counter()
+
+
+def data_version_stamp(user_id):
+    """Changes on every bump of the user's data version, including after a DB restore."""
+    row = UserDataVersion.objects.filter(user_id=user_id).values_list("version", "updated_at").first()
+    return f"{row[0]}@{row[1].timestamp()}" if row else "0"
+
+
+def response_cache_key(request, endpoint, stamp):
+    query = sorted(request.query_params.lists())
+    body = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder, default=str) if request.data else ""
+    digest = hashlib.sha256(json.dumps([query, body]).encode()).hexdigest()
+    return f"response:{endpoint}:{request.user.pk}:{stamp}:{digest}"
+
+
+class MemoryResponseCache:
+    """Thread-safe LRU of (expires, data, status) entries."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def set(self, key, data, status_code, timeout):
+        """Store an entry; returns how many entries were evicted to make room."""
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, data, status_code)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DjangoResponseCache:
+    """Entries in a Django cache backend, for sharing between worker processes."""
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def get(self, key):
+        return caches[self.alias].get(key)
+
+    def set(self, key, data, status_code, timeout):
+        caches[self.alias].set(key, (data, status_code), timeout)
+        return 0
+
+    def clear(self):
+        caches[self.alias].clear()
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def response_cache():
+    """The process-wide cache for the configured backend."""
+    backend = getattr(settings, "RESPONSE_CACHE_BACKEND", "memory")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown response cache backend: {backend!r}")
+    with _backends_lock:
+        cache = _backends.get(backend)
+        if cache is None:
+            if backend == "django":
+                cache = DjangoResponseCache(getattr(settings, "RESPONSE_CACHE_ALIAS", "default"))
+            else:
+                cache = MemoryResponseCache(getattr(settings, "RESPONSE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+            _backends[backend] = cache
+        return cache
+
+
+def response_cache_stats():
+    """Hits, misses, evictions and hit rate per endpoint since process start."""
+    with _stats_lock:
+        stats = {}
+        for endpoint in set(_hits) | set(_misses):
+            lookups = _hits[endpoint] + _misses[endpoint]
+            stats[endpoint] = {
+                "hits": _hits[endpoint],
+                "misses": _misses[endpoint],
+                "evictions": _evictions[endpoint],
+                "hit_rate": round(_hits[endpoint] / lookups, 4) if lookups else 0.0,
+            }
+        return stats
+
+
+def cached_response(endpoint):
+    """Decorate an APIView handler to serve repeat requests from the response cache."""
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            cache = response_cache()
+            key = response_cache_key(request, endpoint, data_version_stamp(request.user.pk))
+            cached = cache.get(key)
+            if cached is not None:
+                with _stats_lock:
+                    _hits[endpoint] += 1
+                response = Response(cached[0], status=cached[1])
+                response["X-Cache"] = "HIT"
+                return response
+
+            with _stats_lock:
+                _misses[endpoint] += 1
+            response = handler(view, request, *args, **kwargs)
+            # Partial (budget-limited) and error responses are not worth replaying.
+            data = response.data
+            if response.status_code == 200 and not (isinstance(data, dict) and data.get("partial")):
+                evicted = cache.set(
+                    key, data, response.status_code, getattr(settings, "RESPONSE_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+                )
+                if evicted:
+                    with _stats_lock:
+                        _evictions[endpoint] += evicted
+            response["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,102 @@
+"""
+Read/write routing between the primary database and a read replica.
+
+Writes always go to "default". Reads go to the READ_REPLICA_ALIAS database
+only while a view marked with ReplicaReadMixin is handling a request, and
+never for a user who wrote within the last REPLICA_STICKY_SECONDS, so people
+see their own changes even when the replica lags. Writes are recorded from
+the model signals (signals.py) in the Django cache; with several worker
+processes that cache must be shared for stickiness to follow the user, and
+system check mainapp.W001 warns when a replica is configured over a
+per-process cache.
+"""
+
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+
+DEFAULT_STICKY_SECONDS = 5
+PER_PROCESS_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+_read_alias = ContextVar("replica_read_alias", default=None)
+
+
+def _sticky_key(user_id):
+    return f"replica:sticky:{user_id}"
+
+
+def record_write(user_id):
+    """Pin `user_id`'s reads to the primary for the stickiness window."""
+    if user_id is not None and replica_alias():
+        cache.set(_sticky_key(user_id), 1, getattr(settings, "REPLICA_STICKY_SECONDS", DEFAULT_STICKY_SECONDS))
+
+
+def recently_wrote(user_id):
+    return cache.get(_sticky_key(user_id)) is not None
+
+
+def replica_alias():
+    """The configured replica alias, or None when reads stay on the primary."""
+    alias = getattr(settings, "READ_REPLICA_ALIAS", None)
+    return alias if alias in settings.DATABASES else None
+
+
+@checks.register(checks.Tags.caches)
+def check_sticky_cache(app_configs, **kwargs):
+    if not replica_alias():
+        return []
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if backend not in PER_PROCESS_CACHES:
+        return []
+    return [
+        checks.Warning(
+            "Read-your-writes stickiness for the read replica is stored in a per-process cache.",
+            hint=(
+                "Writes recorded by one worker are invisible to the others, which may then serve a user's "
+                "reads from a lagging replica. Point CACHES['default'] at a shared cache."
+            ),
+            obj=backend,
+            id="mainapp.W001",
+        )
+    ]
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data, so rows from either may be related.
+        return True
+
+
+class ReplicaReadMixin:
+    """
+    Serve this view's reads from the replica for `replica_methods`.
+
+    Mark only views whose handlers read, or whose writes do not depend on
+    reading back fresh data: writes still go to the primary.
+    """
+
+    replica_methods = ("GET", "HEAD")
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        alias = replica_alias()
+        if alias and request.method in self.replica_methods and not recently_wrote(request.user.pk):
+            self._replica_token = _read_alias.set(alias)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_replica_token", None)
+        if token is not None:
+            _read_alias.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
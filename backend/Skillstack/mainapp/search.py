@@ -0,0 +1,262 @@
+"""
+Full-text search over goal and activity notes.
+
+On SQLite builds with FTS5 the `mainapp_note_search` virtual table (created
+and kept in sync by triggers in migration 0010) is queried with bm25
+ranking and snippets. Elsewhere a slower LIKE-based fallback returns the
+same response shape. SQLite drops triggers along with their table, so a
+migration that rebuilds the goal or activity table loses them; the index
+only counts as available while every trigger exists, and a post_migrate
+hook recreates missing ones and reindexes.
+
+owner_id is an UNINDEXED column, so a per-user search runs MATCH over every
+user's rows and only then drops other owners': its cost follows how many
+rows match the terms across all users, not just the searcher's. That is
+fine at this scale; if common terms get slow, index the owner as a column
+filter term (or give each user's rows their own rowid range) so the MATCH
+itself is scoped.
+"""
+
+import base64
+import binascii
+import importlib
+import json
+import logging
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, router, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import LearningActivity, LearningGoal
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "mainapp_note_search"
+SYNC_TRIGGERS = (
+    "mainapp_goal_search_insert",
+    "mainapp_goal_search_update",
+    "mainapp_goal_search_rename",
+    "mainapp_goal_search_delete",
+    "mainapp_activity_search_insert",
+    "mainapp_activity_search_update",
+    "mainapp_activity_search_delete",
+)
+QUERY_TERM_PATTERN = re.compile(r"\w+")
+SNIPPET_TOKENS = 12
+FALLBACK_SNIPPET_CHARS = 80
+
+# Column weights for bm25(): skill_name, notes.
+RANKED_SEARCH_SQL = f"""
+    SELECT * FROM (
+        SELECT
+            rowid,
+            kind,
+            object_id,
+            goal_id,
+            skill_name,
+            snippet({FTS_TABLE}, -1, '<mark>', '</mark>', '…', {SNIPPET_TOKENS}) AS snippet,
+            bm25({FTS_TABLE}, 2.0, 1.0) AS score
+        FROM {FTS_TABLE}
+        WHERE {FTS_TABLE} MATCH %s AND owner_id = %s
+    )
+    WHERE score > %s OR (score = %s AND rowid > %s)
+    ORDER BY score, rowid
+    LIMIT %s
+"""
+
+_fts_available = None
+
+
+def _note_search_objects(cursor):
+    """Names of the FTS5 table and sync triggers present in the schema."""
+    names = (FTS_TABLE,) + SYNC_TRIGGERS
+    placeholders = ", ".join(["%s"] * len(names))
+    cursor.execute(f"SELECT name FROM sqlite_master WHERE name IN ({placeholders})", names)
+    return {name for (name,) in cursor.fetchall()}
+
+
+def fts_available():
+    """Whether the FTS5 index and all of its sync triggers exist on the default database."""
+    global _fts_available
+    if _fts_available is None:
+        if connection.vendor != "sqlite":
+            _fts_available = False
+        else:
+            with connection.cursor() as cursor:
+                _fts_available = _note_search_objects(cursor) == {FTS_TABLE, *SYNC_TRIGGERS}
+    return _fts_available
+
+
+def restore_note_search_triggers(using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    post_migrate handler: recreate sync triggers dropped by a table rebuild.
+
+    Writes made while a trigger was missing never reached the index, so it
+    is rebuilt from the goal and activity tables as well.
+    """
+    global _fts_available
+    db = connections[using]
+    if db.vendor != "sqlite":
+        return
+    with db.cursor() as cursor:
+        existing = _note_search_objects(cursor)
+        missing = set(SYNC_TRIGGERS) - existing
+        if FTS_TABLE not in existing or not missing:
+            return
+        logger.warning("Note search triggers missing (%s); recreating them and reindexing.", ", ".join(sorted(missing)))
+        # The trigger and backfill statements exactly as migration 0010 runs them.
+        created = importlib.import_module("mainapp.migrations.0010_note_search_fts")
+        with transaction.atomic(using=using):
+            for name in SYNC_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            for statement in created.CREATE_STATEMENTS[1:]:
+                cursor.execute(statement)
+    _fts_available = None
+
+
+def build_match_query(text):
+    """Turn free text into a safe FTS5 query: all terms, last one as a prefix."""
+    terms = QUERY_TERM_PATTERN.findall(text.lower())
+    if not terms:
+        return ""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _matching_ids(text, kind):
+    match = build_match_query(text)
+    if not match or not fts_available():
+        return None
+    return RawSQL(f"SELECT object_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND kind = %s", [match, kind])
+
+
+def matching_goal_ids(text):
+    """
+    Subquery selecting the IDs of goals (any owner) whose skill name or notes
+    match `text`, for use as `id__in`; None when FTS5 is unavailable or the
+    text has no searchable terms.
+    """
+    return _matching_ids(text, "goal")
+
+
+def matching_activity_ids(text):
+    """`matching_goal_ids` for activities, matched on their notes and their goal's skill name."""
+    return _matching_ids(text, "activity")
+
+
+def encode_cursor(position):
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Decode a pagination cursor; raises ValueError when it is malformed."""
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+def _read_connection():
+    # Raw SQL bypasses the router, so ask it where goal reads should go.
+    return connections[router.db_for_read(LearningGoal) or DEFAULT_DB_ALIAS]
+
+
+def _ranked_search(user, match, after, limit):
+    try:
+        score, rowid = (float(after[0]), int(after[1])) if after else (float("-inf"), -1)
+    except (TypeError, ValueError, IndexError, KeyError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+    with _read_connection().cursor() as cursor:
+        cursor.execute(RANKED_SEARCH_SQL, [match, user.id, score, score, rowid, limit + 1])
+        rows = cursor.fetchall()
+    results = [
+        {
+            "kind": kind,
+            "id": object_id,
+            "goal_id": goal_id,
+            "skill_name": skill_name,
+            "snippet": snippet,
+            "score": round(-score, 4),
+        }
+        for _, kind, object_id, goal_id, skill_name, snippet, score in rows[:limit]
+    ]
+    next_position = [rows[limit - 1][6], rows[limit - 1][0]] if len(rows) > limit else None
+    return results, next_position
+
+
+def _excerpt(text, terms):
+    lowered = text.lower()
+    start = min((lowered.find(term) for term in terms if term in lowered), default=0)
+    start = max(0, start - FALLBACK_SNIPPET_CHARS // 4)
+    excerpt = text[start:start + FALLBACK_SNIPPET_CHARS]
+    return ("…" if start else "") + excerpt + ("…" if start + FALLBACK_SNIPPET_CHARS < len(text) else "")
+
+
+def _fallback_search(user, text, after, limit):
+    """LIKE-based search used when FTS5 is unavailable; newest rows first."""
+    terms = QUERY_TERM_PATTERN.findall(text.lower())
+    goal_filter = Q()
+    activity_filter = Q()
+    for term in terms:
+        goal_filter &= Q(skill_name__icontains=term) | Q(notes__icontains=term)
+        activity_filter &= Q(goal__skill_name__icontains=term) | Q(notes__icontains=term)
+
+    # Keyset on (kind, id) descending, goals before activities.
+    try:
+        kind, last_id = (after[0], int(after[1])) if after else ("goal", None)
+    except (TypeError, ValueError, IndexError, KeyError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+    results = []
+    if kind == "goal":
+        goals = LearningGoal.objects.filter(goal_filter, owner=user)
+        if last_id is not None:
+            goals = goals.filter(id__lt=last_id)
+        for goal in goals.order_by("-id")[:limit + 1]:
+            results.append(("goal", goal.id, goal.id, goal.skill_name, goal.notes or goal.skill_name))
+        last_id = None
+    if len(results) <= limit:
+        activities = LearningActivity.objects.select_related("goal").filter(activity_filter, goal__owner=user)
+        if last_id is not None:
+            activities = activities.filter(id__lt=last_id)
+        for activity in activities.order_by("-id")[:limit + 1 - len(results)]:
+            results.append(("activity", activity.id, activity.goal_id, activity.goal.skill_name, activity.notes))
+
+    page = [
+        {
+            "kind": kind,
+            "id": object_id,
+            "goal_id": goal_id,
+            "skill_name": skill_name,
+            "snippet": _excerpt(body, terms),
+            "score": None,
+        }
+        for kind, object_id, goal_id, skill_name, body in results[:limit]
+    ]
+    next_position = [page[-1]["kind"], page[-1]["id"]] if len(results) > limit else None
+    return page, next_position
+
+
+def search_notes(user, text, cursor=None, limit=20):
+    """
+    Ranked search over one user's goal and activity notes.
+
+    Returns (results, next_cursor); pass next_cursor back to get the
+    following page. Raises ValueError for a malformed cursor.
+
+    The cursor is the last row's (bm25 score, rowid); rowid breaks ties
+    between equal scores. bm25 depends on corpus statistics, so any write
+    can shift scores between requests: pages are not stable across writes
+    and may then skip or repeat a row.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    match = build_match_query(text)
+    if not match:
+        return [], None
+    if fts_available():
+        results, next_position = _ranked_search(user, match, after, limit)
+    else:
+        results, next_position = _fallback_search(user, text, after, limit)
+    return results, encode_cursor(next_position) if next_position else None
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import user_cache
+from .dashboard import invalidate_weekly_stats
+from .models import LearningActivity, LearningGoal
+from .note_summary import bump_data_version
+from .routers import record_write
+
+
+def _cascaded_from_user(kwargs):
+    # Deleting a user removes their version row; bumping it from the
+    # cascade would recreate it for a user that no longer exists.
+    origin = kwargs.get("origin")
+    if origin is None:
+        return False
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model._meta.label == settings.AUTH_USER_MODEL
+
+
+@receiver(post_save, sender=LearningGoal)
+@receiver(post_delete, sender=LearningGoal)
+def goal_changed(sender, instance, **kwargs):
+    if _cascaded_from_user(kwargs):
+        return
+    bump_data_version(instance.owner_id)
+    invalidate_weekly_stats(instance.owner_id)
+    record_write(instance.owner_id)
+
+
+@receiver(post_save, sender=LearningActivity)
+@receiver(post_delete, sender=LearningActivity)
+def activity_changed(sender, instance, **kwargs):
+    if _cascaded_from_user(kwargs):
+        return
+    if LearningActivity._meta.get_field("goal").is_cached(instance):
+        owner_id = instance.goal.owner_id
+    else:
+        owner_id = LearningGoal.objects.filter(id=instance.goal_id).values_list("owner_id", flat=True).first()
+    bump_data_version(owner_id)
+    invalidate_weekly_stats(owner_id)
+    record_write(owner_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_changed(sender, instance, **kwargs):
+    # Covers password, is_active and email changes made through save().
+    user_cache.invalidate(str(instance.pk))
+    record_write(instance.pk)
+    if kwargs["signal"] is post_save:
+        # Cached responses embed the profile too.
+        bump_data_version(instance.pk)
@@ -0,0 +1,120 @@
+import heapq
+import itertools
+import math
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import LearningGoal, SkillNeighbor, normalize_skill_name
+
+
+def _prune(pair_counts, max_pairs):
+    """Drop the rarest pairs until the counter fits in `max_pairs` entries."""
+    threshold = 1
+    while len(pair_counts) > max_pairs:
+        for pair in [pair for pair, count in pair_counts.items() if count <= threshold]:
+            del pair_counts[pair]
+        threshold += 1
+
+
+def build_skill_neighbors(
+    top_k=10,
+    max_skills=5000,
+    max_skills_per_owner=50,
+    max_pairs=2_000_000,
+    min_support=2,
+    chunk_size=5000,
+):
+    """
+    Rebuild the SkillNeighbor table from canonical goal skills across all owners.
+
+    Memory is bounded by the vocabulary (`max_skills`), the per-owner skill
+    cap and `max_pairs` rather than by the number of goals: goals are streamed
+    in owner order and only one owner's skill set is held at a time.
+    Returns the number of neighbor rows written.
+    """
+    display_names = {}
+    skill_counts = (
+        LearningGoal.objects.filter(owner__isnull=False, skill__isnull=False)
+        .values("skill_id", "skill__normalized_name", "skill__name")
+        .annotate(owners=Count("owner", distinct=True))
+        .order_by("-owners")[:max_skills]
+    )
+    vocabulary = {}
+    keys = []
+    for row in skill_counts.iterator(chunk_size=chunk_size):
+        vocabulary[row["skill_id"]] = len(keys)
+        keys.append(row["skill__normalized_name"])
+        display_names[row["skill__normalized_name"]] = row["skill__name"]
+    document_frequency = [0] * len(keys)
+    pair_counts = Counter()
+
+    def flush(skill_ids):
+        if not skill_ids:
+            return
+        ordered = sorted(skill_ids)[:max_skills_per_owner]
+        for skill_id in ordered:
+            document_frequency[skill_id] += 1
+        pair_counts.update(itertools.combinations(ordered, 2))
+        if len(pair_counts) > max_pairs:
+            _prune(pair_counts, max_pairs)
+
+    rows = (
+        LearningGoal.objects.filter(owner__isnull=False, skill__isnull=False)
+        .order_by("owner_id")
+        .values_list("owner_id", "skill_id")
+    )
+    current_owner, owner_skills = None, set()
+    for owner_id, skill_pk in rows.iterator(chunk_size=chunk_size):
+        if owner_id != current_owner:
+            flush(owner_skills)
+            current_owner, owner_skills = owner_id, set()
+        skill_id = vocabulary.get(skill_pk)
+        if skill_id is not None:
+            owner_skills.add(skill_id)
+    flush(owner_skills)
+
+    candidates = {}
+    for (left, right), support in pair_counts.items():
+        if support < min_support:
+            continue
+        score = support / math.sqrt(document_frequency[left] * document_frequency[right])
+        candidates.setdefault(left, []).append((score, support, right))
+        candidates.setdefault(right, []).append((score, support, left))
+
+    neighbors = []
+    for skill_id, scored in candidates.items():
+        for rank, (score, support, other_id) in enumerate(heapq.nlargest(top_k, scored), start=1):
+            neighbors.append(
+                SkillNeighbor(
+                    skill=keys[skill_id],
+                    neighbor=keys[other_id],
+                    neighbor_name=display_names[keys[other_id]],
+                    score=round(score, 6),
+                    support=support,
+                    rank=rank,
+                )
+            )
+
+    with transaction.atomic():
+        SkillNeighbor.objects.all().delete()
+        SkillNeighbor.objects.bulk_create(neighbors, batch_size=1000)
+    return len(neighbors)
+
+
+def suggest_next_skills(skill_names, limit=5):
+    """Rank neighbor skills for a learner, excluding skills they already have."""
+    known = {normalize_skill_name(name) for name in skill_names}
+    known.discard("")
+    if not known:
+        return []
+    totals = {}
+    names = {}
+    for neighbor in SkillNeighbor.objects.filter(skill__in=known).only("neighbor", "neighbor_name", "score"):
+        if neighbor.neighbor in known:
+            continue
+        totals[neighbor.neighbor] = totals.get(neighbor.neighbor, 0.0) + neighbor.score
+        names[neighbor.neighbor] = neighbor.neighbor_name
+    ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [names[key] for key, _ in ranked]
@@ -0,0 +1,198 @@
+"""
+Extractive 1-3 sentence summaries of learning notes.
+
+Text is streamed in with `feed()`; only the new text is searched for
+sentence boundaries, and a run without one is cut into a sentence at
+`max_sentence_chars`, so feeding stays linear in the input. Every sentence
+contributes its terms to a centroid vector, but only the `sentence_cap`
+most promising sentences (by a cheap prior: action verbs, numbers, length)
+are kept as candidates. At the end each candidate is scored by cosine
+similarity to the centroid plus a weighted prior, and the winners are
+returned in their original order.
+Scoring stops at `time_budget` seconds; unscored candidates keep their prior.
+With a ComputeBudget, feeding also stops once it runs out and scoring is
+skipped.
+"""
+
+import heapq
+import math
+import re
+import time
+from collections import Counter
+
+from .text_analysis import (
+    ACTION_KEYWORDS,
+    COMBINED_TOPIC_STOP_WORDS,
+    MIN_SENTENCE_LENGTH,
+    SENTENCE_SPLIT_PATTERN,
+    WORD_PUNCTUATION,
+)
+
+DIGIT_PATTERN = re.compile(r"\d")
+MIN_TERM_LENGTH = 4
+
+
+def term_vector(word_counts):
+    """Fold raw lowercase word counts into a sparse vector of content terms."""
+    vector = {}
+    for word, count in word_counts.items():
+        term = word.strip(WORD_PUNCTUATION)
+        if len(term) >= MIN_TERM_LENGTH and term not in COMBINED_TOPIC_STOP_WORDS:
+            vector[term] = vector.get(term, 0) + count
+    return vector
+
+
+class ExtractiveSummarizer:
+    """Centroid-based extractive summarizer over text fed in pieces."""
+
+    max_sentences = 3
+    sentence_cap = 2000
+    time_budget = 0.25
+    prior_weight = 0.1
+    fallback_chars = 150
+    # Text without a sentence boundary is cut into a sentence at this length.
+    max_sentence_chars = 2000
+    # Check the clock every this many candidates (or fed pieces).
+    budget_check_interval = 256
+
+    def __init__(self, sentence_cap=None, time_budget=None, budget=None):
+        if sentence_cap is not None:
+            self.sentence_cap = sentence_cap
+        if time_budget is not None:
+            self.time_budget = time_budget
+        self.budget = budget
+        self.feed_count = 0
+        self.sentence_count = 0
+        self.truncated = False
+        self._centroid = Counter()
+        self._candidates = []
+        self._pending = None
+        self._pending_actions = set()
+        self._pending_digits = False
+        self._prefix = ""
+        self._length = 0
+        self._has_content = False
+
+    def feed(self, text):
+        """Add the next piece of text, read as if joined to the previous one with a space."""
+        if self.budget is not None and not self.truncated and self.feed_count % self.budget_check_interval == 0:
+            self.truncated = not self.budget.allows("summary_text")
+        self.feed_count += 1
+        if self.truncated:
+            return
+        text = text or ""
+        head = self._pending
+        if head is None:
+            head = ""
+        else:
+            text = " " + text
+        if len(self._prefix) <= self.fallback_chars:
+            self._prefix = (self._prefix + text)[:self.fallback_chars + 1]
+        self._length += len(text)
+        self._has_content = self._has_content or bool(text.strip())
+        text_lower = text.lower()
+        # Raw words are counted here and folded into terms once, in summary().
+        self._centroid.update(text_lower.split())
+        # Only the action verbs present in this piece (or the pending tail)
+        # need checking per sentence.
+        actions = {verb for verb in ACTION_KEYWORDS if verb in text_lower}
+        digits = DIGIT_PATTERN.search(text) is not None
+
+        # Boundaries are searched in the new text only; the pending tail's
+        # last character is carried along in case it ends a sentence.
+        carry = head[-1:]
+        start = None
+        for match in SENTENCE_SPLIT_PATTERN.finditer(carry + text):
+            end = match.start() - len(carry)
+            if start is None:
+                sentence = head[:len(head) + min(end, 0)] + text[:max(end, 0)]
+                self._add_sentence(sentence.strip(), self._pending_actions | actions, digits or self._pending_digits)
+            else:
+                self._add_sentence(text[start:end].strip(), actions, digits)
+            start = match.end() - len(carry)
+        if start is None:
+            self._pending = head + text
+            self._pending_actions |= actions
+            self._pending_digits = self._pending_digits or digits
+        else:
+            self._pending = text[start:]
+            self._pending_actions = actions
+            self._pending_digits = digits
+        # Unpunctuated text would otherwise grow the tail without bound.
+        if len(self._pending) > self.max_sentence_chars:
+            self._add_sentence(self._pending.strip(), self._pending_actions, self._pending_digits)
+            self._pending = ""
+            self._pending_actions = set()
+            self._pending_digits = False
+
+    def _add_sentence(self, sentence, actions=ACTION_KEYWORDS, digits=True):
+        if len(sentence) <= MIN_SENTENCE_LENGTH:
+            return
+        # Prioritize sentences with action verbs, numbers and more content.
+        prior = 0
+        if actions:
+            sentence_lower = sentence.lower()
+            prior = 2 * sum(1 for verb in actions if verb in sentence_lower)
+        if digits and DIGIT_PATTERN.search(sentence):
+            prior += 1
+        prior += (sentence.count(" ") + 1) / 10
+        # Ties go to the earlier sentence, so later positions rank lower.
+        entry = (prior, -self.sentence_count, sentence)
+        self.sentence_count += 1
+        if len(self._candidates) < self.sentence_cap:
+            heapq.heappush(self._candidates, entry)
+        elif entry > self._candidates[0]:
+            heapq.heapreplace(self._candidates, entry)
+
+    def _score(self, candidates):
+        centroid = term_vector(self._centroid)
+        centroid_norm = math.sqrt(sum(count * count for count in centroid.values()))
+        deadline = time.perf_counter() + self.time_budget
+        scored = []
+        for index, (prior, position, sentence) in enumerate(candidates):
+            similarity = 0.0
+            if not self.truncated:
+                if index % self.budget_check_interval == 0 and time.perf_counter() > deadline:
+                    self.truncated = True
+                elif centroid_norm:
+                    terms = term_vector(Counter(sentence.lower().split()))
+                    dot = sum(centroid.get(term, 0) * count for term, count in terms.items())
+                    if dot:
+                        norm = math.sqrt(sum(count * count for count in terms.values()))
+                        similarity = dot / (norm * centroid_norm)
+            scored.append((similarity + self.prior_weight * prior, position, sentence))
+        return scored
+
+    def summary(self):
+        if self._pending is not None:
+            self._add_sentence(self._pending.strip())
+            self._pending = None
+        if not self._has_content:
+            return "No notes available for summarization."
+        if not self.sentence_count:
+            return self._prefix[:self.fallback_chars] + "..." if self._length > self.fallback_chars else self._prefix
+
+        num_sentences = min(self.max_sentences, max(1, self.sentence_count // 4 + 1))
+        # Score the best candidates by prior first so a blown budget loses the weakest.
+        ranked = sorted(self._score(sorted(self._candidates, reverse=True)), reverse=True)
+        chosen = []
+        seen = set()
+        for _, position, sentence in ranked:
+            if sentence not in seen:
+                seen.add(sentence)
+                chosen.append((-position, sentence))
+                if len(chosen) == num_sentences:
+                    break
+        chosen.sort()
+
+        summary = ". ".join(sentence for _, sentence in chosen)
+        if not summary.endswith((".", "!", "?")):
+            summary += "."
+        return summary
+
+
+def generate_concise_summary(text):
+    """Generate a short, meaningful summary from notes (2-3 sentences max)."""
+    summarizer = ExtractiveSummarizer()
+    summarizer.feed(text)
+    return summarizer.summary()
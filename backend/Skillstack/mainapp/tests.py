@@ -1,3 +1,1300 @@
-from django.test import TestCase
+import asyncio
+import importlib
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.apps import apps as django_apps
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
+from django.http import JsonResponse
+from django.test import AsyncClient, AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .authentication import user_cache
+from .benchmarking import clear_benchmark_data, compare, seed
+from .budget import ComputeBudget, budget_stats
+from .coalesce import (
+    AsyncSingleFlight,
+    FileSingleFlight,
+    SingleFlight,
+    coalesce_stats,
+    coalesced,
+    coalesced_async,
+    request_key,
+)
+from .cohorts import build_cohort_quantiles, learner_standing, percentile_rank, quantile_cut_points
+from . import course_index as course_index_module
+from .course_index import CourseIndex, goal_query_terms
+from .keywords import KeywordMatcher
+from . import metrics
+from .models import CohortQuantiles, CourseResource, LearningActivity, LearningGoal, NoteSummaryCache, Skill, SkillManager, SkillNeighbor, UserDataVersion
+from .note_summary import build_note_summary, current_data_version
+from .response_cache import MemoryResponseCache, response_cache, response_cache_stats
+from .routers import ReplicaRouter, check_sticky_cache
+from . import search
+from .search import fts_available
+from .skills import build_skill_neighbors, suggest_next_skills
+from .throttling import MemoryBucketStore, bucket_store, take_tokens
+from .views import AsyncCourseImportView, AsyncWeeklySummaryView
+from .summarizer import ExtractiveSummarizer, generate_concise_summary
+from . import text_analysis
+from .text_analysis import NoteText, analyze_text_content, parse_goal_notes
+
+
+class CourseIndexTests(TestCase):
+    def setUp(self):
+        self.django = CourseResource.objects.create(
+            url="https://example.com/django",
+            title="Django REST Framework in Depth",
+            description="Build APIs with Django and serializers.",
+            provider="example.com",
+        )
+        self.react = CourseResource.objects.create(
+            url="https://example.com/react",
+            title="React Hooks",
+            description="State and effects for React components.",
+            provider="example.com",
+        )
+
+    def test_search_ranks_matching_course_first(self):
+        index = CourseIndex()
+        index.refresh()
+        goal = LearningGoal(skill_name="Django", notes="Learned about serializers")
+        results = index.search(goal_query_terms([goal]))
+        self.assertEqual(results[0]["id"], self.django.id)
+        self.assertNotIn(self.react.id, [course["id"] for course in results])
+
+    def test_refresh_picks_up_new_and_deleted_courses(self):
+        index = CourseIndex()
+        index.refresh()
+        vue = CourseResource.objects.create(url="https://example.com/vue", title="Vue Basics")
+        index.refresh()
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.search(goal_query_terms([LearningGoal(skill_name="Vue")]))[0]["id"], vue.id)
+        self.react.delete()
+        index.refresh()
+        self.assertEqual(len(index), 2)
+
+    def test_refresh_gives_up_on_a_churning_catalog_and_keeps_serving(self):
+        index = CourseIndex()
+        index.refresh()
+        self.react.delete()
+        # Every count read disagrees with the rows read, as under steady churn.
+        churning = {"total": 99, "latest": timezone.now()}
+        with mock.patch.object(CourseIndex, "_catalog_stats", return_value=churning) as stats:
+            with self.assertLogs("mainapp.course_index", "WARNING"):
+                index.refresh()
+        self.assertEqual(stats.call_count, 2 * course_index_module.REFRESH_ATTEMPTS)
+        self.assertEqual(len(index), 2)
+        index.refresh()
+        self.assertEqual(len(index), 1)
+
+    def test_recommendations_include_catalog_courses(self):
+        user = User.objects.create_user(username="learner", password="pass12345")
+        LearningGoal.objects.create(owner=user, skill_name="React", status="completed")
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post("/mainapp/ai/resource-recommendations/")
+        catalog = [rec for rec in response.data["recommendations"] if rec["type"] == "catalog_courses"]
+        self.assertEqual(catalog[0]["courses"][0]["id"], self.react.id)
+
+
+class SkillNeighborTests(TestCase):
+    def setUp(self):
+        for index, skills in enumerate([
+            ["Python", "Django", "SQL"],
+            ["python ", "Django"],
+            ["Python", "Pandas"],
+            ["React", "CSS"],
+        ]):
+            user = User.objects.create_user(username=f"user{index}", password="pass12345")
+            for skill in skills:
+                LearningGoal.objects.create(owner=user, skill_name=skill)
+
+    def test_build_counts_pairs_across_owners(self):
+        build_skill_neighbors(min_support=2)
+        neighbors = list(SkillNeighbor.objects.filter(skill="python"))
+        self.assertEqual([(n.neighbor, n.support, n.rank) for n in neighbors], [("django", 2, 1)])
+
+    def test_suggestions_exclude_known_skills(self):
+        build_skill_neighbors(min_support=1)
+        suggestions = suggest_next_skills(["Python", "SQL"])
+        self.assertEqual(suggestions[0], "Django")
+        self.assertNotIn("SQL", suggestions)
+
+
+class SkillResolutionTests(TestCase):
+    def test_spelling_variants_share_one_skill(self):
+        names = ["Python", "python ", "Python3", "Python 3", "PYTHON 3.12", "python3.12", "python-3"]
+        goals = [LearningGoal.objects.create(skill_name=name) for name in names]
+        self.assertEqual(Skill.objects.count(), 1)
+        self.assertEqual({goal.skill_id for goal in goals}, {goals[0].skill_id})
+
+    def test_bare_trailing_digits_fold_only_into_versioned_stems(self):
+        python = Skill.objects.resolve("Python")
+        self.assertEqual(Skill.objects.resolve("Python3"), python)
+        self.assertEqual(Skill.objects.resolve("python2"), python)
+        names = ["ES", "ES6", "Web", "Web3", "S3", "md5", "SHA256", "h264", "utf8", "PS5", "GPT4", "C99"]
+        skills = [Skill.objects.resolve(name) for name in names]
+        self.assertEqual(len({skill.id for skill in skills}), len(names))
+        self.assertEqual([skill.name for skill in skills], names)
+
+    def test_bare_digit_name_first_resolves_to_the_stem(self):
+        python3 = Skill.objects.resolve("Python3")
+        self.assertEqual(python3.name, "Python")
+        self.assertEqual(Skill.objects.resolve("python"), python3)
+        self.assertEqual(Skill.objects.resolve("Python 3.12"), python3)
+        self.assertEqual(Skill.objects.resolve("Vue2").name, "Vue")
+
+    def test_backfill_migration_applies_the_same_rules(self):
+        backfill = importlib.import_module("mainapp.migrations.0006_skill")
+        names = ["Python3", "python2", "Node 18", "node", "md5", "ES6"]
+        goals = [LearningGoal.objects.create(skill_name=name) for name in names]
+        expected = [goal.skill.normalized_name for goal in goals]
+        # The state before 0006: goals with names only.
+        Skill.objects.all().delete()
+        backfill.backfill_skills(django_apps, None)
+        skills = [LearningGoal.objects.select_related("skill").get(id=goal.id).skill for goal in goals]
+        self.assertEqual([skill.normalized_name for skill in skills], expected)
+        self.assertEqual([skill.name for skill in skills], ["Python", "Python", "node", "node", "md5", "ES6"])
+        python = Skill.objects.get(normalized_name="python")
+        self.assertEqual(set(python.aliases.values_list("alias", flat=True)), {"python", "python3", "python2"})
+
+    def test_resolve_retries_an_integrity_error_once(self):
+        with mock.patch.object(SkillManager, "_resolve", side_effect=IntegrityError) as resolve:
+            with self.assertRaises(IntegrityError):
+                Skill.objects.resolve("Rust")
+        self.assertEqual(resolve.call_count, 2)
+
+    def test_versioned_name_first_still_resolves_to_the_stem(self):
+        versioned = Skill.objects.resolve("Node 18")
+        self.assertEqual(versioned.name, "Node")
+        self.assertEqual(Skill.objects.resolve("node"), versioned)
+        self.assertEqual(Skill.objects.resolve("Node-20.1"), versioned)
+
+    def test_renaming_goal_resolves_new_skill(self):
+        goal = LearningGoal.objects.create(skill_name="Python")
+        goal.skill_name = "Rust"
+        goal.save(update_fields=["skill_name"])
+        goal.refresh_from_db()
+        self.assertEqual(goal.skill.name, "Rust")
+
+    def test_recommendation_breakdown_merges_variants(self):
+        user = User.objects.create_user(username="learner", password="pass12345")
+        for name in ["Python", "python", "Python 3.11", "Go"]:
+            LearningGoal.objects.create(owner=user, skill_name=name)
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post("/mainapp/ai/resource-recommendations/")
+        self.assertEqual(response.data["analysis"]["skill_breakdown"], {"Python": 3, "Go": 1})
+
+
+class CohortQuantileTests(TestCase):
+    def test_cut_points_and_rank(self):
+        cut_points = quantile_cut_points(range(101))
+        self.assertEqual(cut_points[0], 0)
+        self.assertEqual(cut_points[50], 50)
+        self.assertEqual(percentile_rank(cut_points, 90), 90)
+        self.assertEqual(percentile_rank(cut_points, -1), 0)
+        self.assertEqual(percentile_rank(cut_points, 1000), 100)
+
+    def test_tied_values_rank_below_their_block(self):
+        cut_points = quantile_cut_points([0] * 90 + list(range(1, 11)))
+        self.assertEqual(percentile_rank(cut_points, 0), 0)
+        self.assertEqual(percentile_rank(cut_points, 5), 95)
+        cut_points = quantile_cut_points([0] * 10 + [5] * 90)
+        self.assertEqual(percentile_rank(cut_points, 5), 11)
+
+    def test_tied_minimum_gets_no_standing_note(self):
+        cut_points = quantile_cut_points([0] * 90 + list(range(1, 11)))
+        for metric in ("weekly_hours", "completion_rate"):
+            CohortQuantiles.objects.create(metric=metric, cut_points=cut_points, population=100)
+        user = User.objects.create_user(username="learner", password="pass12345")
+        LearningGoal.objects.create(owner=user, skill_name="Python")
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post("/mainapp/ai/resource-recommendations/")
+        types = [item["type"] for item in response.data["recommendations"]]
+        self.assertNotIn("cohort_standing", types)
+
+    def test_learner_standing_uses_stored_tables(self):
+        users = [User.objects.create_user(username=f"user{index}", password="pass12345") for index in range(4)]
+        for index, user in enumerate(users):
+            for completed in range(4):
+                LearningGoal.objects.create(
+                    owner=user,
+                    skill_name="Python",
+                    status="completed" if completed < index else "started",
+                )
+        self.assertEqual(build_cohort_quantiles(), 4)
+        standing = learner_standing(users[3])
+        self.assertEqual(standing["completion_rate"], {"value": 75.0, "percentile": 100})
+        self.assertEqual(learner_standing(users[0])["completion_rate"]["percentile"], 0)
+
+
+class LearningGoalFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="learner", password="pass12345")
+        other = User.objects.create_user(username="other", password="pass12345")
+        statuses = LearningGoal.Status.values
+        types = LearningGoal.ResourceType.values
+        goals = []
+        for index in range(3000):
+            goals.append(
+                LearningGoal(
+                    owner=cls.user if index % 10 == 0 else other,
+                    skill_name=["Python", "pytest", "React", "Go"][index // 10 % 4],
+                    status=statuses[index % 3],
+                    resource_type=types[index % 4],
+                    platform=["Udemy", "YouTube"][index % 2],
+                    difficulty_rating=index % 5 + 1,
+                )
+            )
+        LearningGoal.objects.bulk_create(goals)
+        connection.cursor().execute("ANALYZE")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/mainapp/learning-goals/", params)
+        self.assertEqual(response.status_code, 200)
+        # The response cache's data version lookup, then the list itself.
+        self.assertEqual(len(queries), 2)
+        with connection.cursor() as cursor:
+            for query in queries:
+                cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+                plan = [row[-1] for row in cursor.fetchall()]
+                self.assertFalse([step for step in plan if step.startswith("SCAN")], plan)
+        return response.data
+
+    def test_filters_use_indexes(self):
+        self.assertEqual(len(self.get()), 300)
+        self.assertEqual({goal["status"] for goal in self.get(status="completed")}, {"completed"})
+        self.assertEqual({goal["resource_type"] for goal in self.get(resource_type="video")}, {"video"})
+        self.assertEqual({goal["platform"] for goal in self.get(platform="Udemy")}, {"Udemy"})
+        self.assertEqual({goal["difficulty_rating"] for goal in self.get(difficulty_rating="1")}, {1})
+
+    def test_prefix_search_is_case_insensitive(self):
+        self.assertEqual({goal["skill_name"] for goal in self.get(search="PY")}, {"Python", "pytest"})
+
+    def test_prefix_search_folds_only_ascii_case(self):
+        LearningGoal.objects.create(owner=self.user, skill_name="Éléments de Rust")
+        self.assertEqual([goal["skill_name"] for goal in self.get(search="Él")], ["Éléments de Rust"])
+        self.assertEqual([goal["skill_name"] for goal in self.get(search="ÉLÉ")], [])
+        self.assertEqual(self.get(search="él"), [])
+
+    def test_ordering_is_whitelisted(self):
+        ratings = [goal["difficulty_rating"] for goal in self.get(ordering="-difficulty_rating")]
+        self.assertEqual(ratings, sorted(ratings, reverse=True))
+        self.assertEqual(len(self.get(ordering="owner__password")), 300)
+
+    def test_invalid_filter_values_are_rejected(self):
+        self.assertEqual(self.client.get("/mainapp/learning-goals/", {"status": "done"}).status_code, 400)
+        self.assertEqual(self.client.get("/mainapp/learning-goals/", {"difficulty_rating": "9"}).status_code, 400)
+
+    def test_non_ascii_digits_in_difficulty_are_rejected(self):
+        for value in ["²", "٣", "３"]:
+            response = self.client.get("/mainapp/learning-goals/", {"difficulty_rating": value})
+            self.assertEqual(response.status_code, 400, value)
+
+
+class TextAnalysisTests(TestCase):
+    def test_parse_goal_notes_separates_entries(self):
+        main, entries = parse_goal_notes("Goal context\n\n[2025-01-02 10:30] Built a form hook")
+        self.assertEqual(main, "Goal context")
+        self.assertEqual(entries, [{"timestamp": "2025-01-02 10:30", "text": "Built a form hook"}])
+
+    def test_note_text_counts_topics_once_for_both_filters(self):
+        note = NoteText("Learned about Testing serializers, serializers and building things.")
+        self.assertEqual(note.action_keyword, "learned")
+        self.assertEqual(note.note_topics, {"learned": 1, "testing": 1, "serializers": 2, "building": 1, "things": 1})
+        self.assertEqual(note.combined_topics, {"learned": 1, "serializers": 2, "things": 1})
+
+    def test_analysis_over_parts_matches_joined_text(self):
+        parts = [NoteText("Fixed the Django API"), NoteText("deploy to production")]
+        analysis = analyze_text_content(parts)
+        self.assertEqual(analysis["themes"], ["problem-solving", "integration", "deployment"])
+        self.assertEqual(analysis["theme_counts"], {"problem-solving": 1, "integration": 1, "deployment": 2})
+        self.assertEqual(analysis["key_phrases"], ["Fixed", "Django"])
+        self.assertEqual(analysis["word_count"], 7)
+
+    def test_keyword_matcher_reports_overlapping_hits(self):
+        matcher = KeywordMatcher(["integrate", "integrated", "integration", "test", "testing"], backend="python")
+        text = "integrated the integration tests, testing"
+        self.assertEqual(
+            matcher.counts(text),
+            {"integrate": 1, "integrated": 1, "integration": 1, "test": 2, "testing": 1},
+        )
+        self.assertEqual(matcher.positions(text)["test"], [27, 34])
+        note = NoteText("Fixed the API integration and deployed it")
+        self.assertEqual(note.keyword_counts["integration"], 1)
+        self.assertEqual(note.keyword_positions()["deploy"], [30])
+        with self.assertRaises(ValueError):
+            KeywordMatcher(["x"], backend="regex")
+
+    def test_mixed_case_keywords_match_lowercased_text(self):
+        matcher = KeywordMatcher(["API", "Integrate"], backend="python")
+        self.assertEqual(matcher.counts("we integrate the api and api layer"), {"integrate": 1, "api": 2})
+        note = NoteText("We integrate the api and API layer")
+        self.assertEqual(note.keyword_counts["api"], 2)
+        self.assertEqual(analyze_text_content([note])["theme_counts"], {"integration": 3})
+
+    def test_summary_endpoint_reports_topics_and_key_points(self):
+        user = User.objects.create_user(username="learner", password="pass12345")
+        goal = LearningGoal.objects.create(owner=user, skill_name="Django")
+        LearningActivity.objects.create(goal=goal, performed_on="2025-01-02", hours_spent=2, notes="Learned serializers. Built serializers.")
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post("/mainapp/ai/note-summarization/", {}, format="json")
+        self.assertEqual(response.data["topics_covered"][0], "serializers")
+        self.assertEqual(response.data["key_points"][0]["skill"], "Django")
+        self.assertEqual(response.data["words_analyzed"], 4)
+
+    def test_concise_summary_streams_sentences(self):
+        text = "Learned Django models today. Read the docs twice. Built 3 views and fixed a bug! Fixed a failing test."
+        pieces = text.split(" ")
+        summary = ExtractiveSummarizer()
+        for piece in pieces:
+            summary.feed(piece)
+        self.assertEqual(summary.summary(), generate_concise_summary(text))
+        self.assertEqual(summary.sentence_count, 4)
+
+    def test_summarizer_skips_duplicates_and_respects_caps(self):
+        repeated = "Learned Django signals in depth. "
+        text = repeated * 3 + "Read about caching layers today. Completed 2 exercises on caching."
+        summary = generate_concise_summary(text)
+        self.assertEqual(summary.count("Learned Django signals"), 1)
+        self.assertEqual(summary.count(". ") + 1, 2)
+
+        summarizer = ExtractiveSummarizer(sentence_cap=5, time_budget=0)
+        for index in range(100):
+            summarizer.feed(f"Practiced query number {index} with joins.")
+        result = summarizer.summary()
+        self.assertEqual(len(summarizer._candidates), 5)
+        self.assertTrue(summarizer.truncated)
+        self.assertEqual(result.count(". ") + 1, 3)
+
+    def test_unpunctuated_notes_keep_feeding_linear(self):
+        summarizer = ExtractiveSummarizer()
+        started = time.perf_counter()
+        for index in range(5000):
+            summarizer.feed(f"learned part {index} of the django course")
+            self.assertLessEqual(len(summarizer._pending), summarizer.max_sentence_chars)
+        summary = summarizer.summary()
+        self.assertLess(time.perf_counter() - started, 2)
+        self.assertGreater(summarizer.sentence_count, 1)
+        self.assertEqual(summary.count(". ") + 1, 3)
+
+    def test_summarizer_stops_feeding_when_the_budget_runs_out(self):
+        budget = ComputeBudget(0, "note_summarization")
+        summarizer = ExtractiveSummarizer(budget=budget)
+        for index in range(1000):
+            summarizer.feed(f"Learned part {index} of the course.")
+        self.assertTrue(summarizer.truncated)
+        self.assertEqual(summarizer.sentence_count, 0)
+        self.assertEqual(budget.skipped, ["summary_text"])
+
+
+class SummaryGoalParsingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="learner", password="pass12345")
+        self.goals = []
+        for skill in ["Django", "React"]:
+            goal = LearningGoal.objects.create(owner=self.user, skill_name=skill, notes="Context")
+            activities = [
+                LearningActivity(goal=goal, performed_on="2025-01-02", hours_spent=1, notes=f"Learned part {index}")
+                for index in range(200)
+            ]
+            LearningActivity.objects.bulk_create(activities)
+            goal.notes += "".join(f"\n\n[2025-01-02 10:00] {activity.notes}" for activity in activities)
+            goal.save(update_fields=["notes"])
+            self.goals.append(goal)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def summarize(self, **data):
+        with mock.patch("mainapp.note_summary.parse_goal_notes", wraps=text_analysis.parse_goal_notes) as parser:
+            response = self.client.post("/mainapp/ai/note-summarization/", data, format="json")
+        self.assertEqual(response.status_code, 200)
+        return parser.call_count, response.data
+
+    def test_all_goals_parse_each_goal_once(self):
+        calls, data = self.summarize()
+        self.assertEqual(calls, len(self.goals))
+        self.assertEqual(data["summary"]["by_skill"]["Django"]["sessions"], 200)
+        self.assertEqual(data["summary"]["by_skill"]["React"]["notes_analysis"]["word_count"], 601)
+
+    def test_single_goal_parses_its_notes_once(self):
+        calls, data = self.summarize(goal_id=self.goals[0].id)
+        self.assertEqual(calls, 1)
+        self.assertEqual(len(data["goal_notes"]["activity_entries"]), 200)
+
+    def test_window_parameters_limit_the_activities_read(self):
+        LearningActivity.objects.filter(goal=self.goals[1]).update(performed_on="2025-03-01")
+        _, data = self.summarize(since="2025-02-01")
+        self.assertEqual(list(data["summary"]["by_skill"]), ["React"])
+        _, data = self.summarize(until="2025-01-31", limit=5)
+        self.assertEqual(data["notes_count"], 5)
+        self.assertEqual(data["summary"]["by_skill"]["Django"]["sessions"], 5)
+        self.assertEqual(data["window"], {"since": None, "until": "2025-01-31", "limit": 5})
+        response = self.client.post("/mainapp/ai/note-summarization/", {"since": "last week"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class ActivityTokenStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="learner", password="pass12345")
+        self.goal = LearningGoal.objects.create(owner=self.user, skill_name="Django")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_stats_are_stored_on_create_and_update(self):
+        response = self.client.post(
+            "/mainapp/learning-activities/",
+            {"goal": self.goal.id, "performed_on": "2025-01-02", "hours_spent": "1.5", "notes": "Learned serializers"},
+            format="json",
+        )
+        activity = LearningActivity.objects.get(id=response.data["id"])
+        self.assertEqual(activity.token_stats["words"], 2)
+        self.assertEqual(activity.token_stats["action"], "learned")
+        self.client.patch(f"/mainapp/learning-activities/{activity.id}/", {"notes": "Reading docs"}, format="json")
+        activity.refresh_from_db()
+        self.assertEqual(activity.token_stats["note_topics"], {"reading": 1})
+        self.assertIsNone(activity.token_stats["action"])
+
+    def test_summary_merges_stored_counters_without_retokenizing(self):
+        LearningActivity.objects.create(goal=self.goal, performed_on="2025-01-02", hours_spent=1, notes="Built serializers")
+        with mock.patch.object(NoteText, "_count_topics") as count_topics:
+            response = self.client.post("/mainapp/ai/note-summarization/", {}, format="json")
+        count_topics.assert_not_called()
+        self.assertEqual(response.data["topics_covered"], ["built", "serializers"])
+
+    def test_backfill_migration_matches_current_stats_version(self):
+        backfill = importlib.import_module("mainapp.migrations.0009_learningactivity_token_stats")
+        if text_analysis.TOKEN_STATS_VERSION != 1:
+            self.skipTest("Stored stats moved past the version the backfill froze")
+        for notes in ["", None, "Learned Django signals, debugging the ORM. Which there would be testing; built it!"]:
+            self.assertEqual(backfill.token_stats(notes), NoteText(notes).to_stats())
+
+
+class NoteSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="learner", password="pass12345")
+        self.other = User.objects.create_user(username="other", password="pass12345")
+        self.goal = LearningGoal.objects.create(owner=self.user, skill_name="Django", notes="Read about serializers")
+        LearningGoal.objects.create(owner=self.other, skill_name="Django", notes="Serializers everywhere")
+        self.activity = LearningActivity.objects.create(
+            goal=self.goal, performed_on="2025-01-02", hours_spent=1, notes="Debugged nested serializer validation"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def search(self, **params):
+        response = self.client.get("/mainapp/notes/search/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_admin_search_matches_in_a_subquery(self):
+        if not fts_available():
+            self.skipTest("SQLite FTS5 is not available")
+        model_admin = admin.site._registry[LearningGoal]
+        request = RequestFactory().get("/admin/mainapp/learninggoal/", {"q": "serializers"})
+        with CaptureQueriesContext(connection) as queries:
+            goals, _ = model_admin.get_search_results(request, LearningGoal.objects.all(), "serializers")
+            self.assertEqual(len(goals), 2)
+        self.assertEqual(len(queries), 1)
+        self.assertIn("MATCH", queries[0]["sql"])
+        self.assertNotIn("LIKE", queries[0]["sql"])
+
+    def test_activity_admin_search_uses_the_index(self):
+        if not fts_available():
+            self.skipTest("SQLite FTS5 is not available")
+        model_admin = admin.site._registry[LearningActivity]
+        request = RequestFactory().get("/admin/mainapp/learningactivity/", {"q": "validation"})
+        with CaptureQueriesContext(connection) as queries:
+            activities, _ = model_admin.get_search_results(request, LearningActivity.objects.all(), "validation")
+            self.assertEqual([activity.id for activity in activities], [self.activity.id])
+        self.assertIn("MATCH", queries[0]["sql"])
+        self.assertNotIn("LIKE", queries[0]["sql"])
+
+    def test_ranked_results_are_scoped_to_owner(self):
+        if not fts_available():
+            self.skipTest("SQLite FTS5 is not available")
+        data = self.search(q="serial")
+        self.assertEqual({(row["kind"], row["id"]) for row in data["results"]}, {("goal", self.goal.id), ("activity", self.activity.id)})
+        self.assertTrue(all("<mark>" in row["snippet"] for row in data["results"]))
+
+    def test_missing_triggers_disable_the_index_until_restored(self):
+        if not fts_available():
+            self.skipTest("SQLite FTS5 is not available")
+        self.addCleanup(setattr, search, "_fts_available", None)
+        with connection.cursor() as cursor:
+            # What a migration rebuilding the activity table leaves behind.
+            cursor.execute("DROP TRIGGER mainapp_activity_search_insert")
+        search._fts_available = None
+        self.assertFalse(fts_available())
+        LearningActivity.objects.create(goal=self.goal, performed_on="2025-01-03", hours_spent=1, notes="Tried pagination")
+        self.assertEqual(len(self.search(q="pagination")["results"]), 1)
+
+        with self.assertLogs("mainapp.search", "WARNING"):
+            search.restore_note_search_triggers(using=connection.alias)
+        self.assertTrue(fts_available())
+        results, _ = search.search_notes(self.user, "pagination")
+        self.assertEqual(len(results), 1)
+        self.assertIn("<mark>", results[0]["snippet"])
+
+    def test_index_follows_edits_and_deletes(self):
+        if not fts_available():
+            self.skipTest("SQLite FTS5 is not available")
+        self.activity.notes = "Wrote pagination tests"
+        self.activity.save()
+        self.assertEqual([row["id"] for row in self.search(q="pagination")["results"]], [self.activity.id])
+        self.goal.skill_name = "Flask"
+        self.goal.save()
+        self.assertEqual(self.search(q="flask")["results"][0]["skill_name"], "Flask")
+        self.goal.delete()
+        self.assertEqual(self.search(q="pagination")["results"], [])
+
+    def test_cursor_pages_through_all_matches(self):
+        for day in range(1, 6):
+            LearningActivity.objects.create(goal=self.goal, performed_on=f"2025-02-0{day}", hours_spent=1, notes="Serializer drills")
+        for available in (True, False):
+            if available and not fts_available():
+                continue
+            with mock.patch("mainapp.search.fts_available", return_value=available):
+                seen, cursor = [], None
+                while True:
+                    params = {"q": "serializer", "limit": 2}
+                    if cursor:
+                        params["cursor"] = cursor
+                    data = self.search(**params)
+                    seen.extend((row["kind"], row["id"]) for row in data["results"])
+                    cursor = data["next_cursor"]
+                    if not cursor:
+                        break
+                self.assertEqual(len(seen), 7)
+                self.assertEqual(len(set(seen)), 7)
+
+    def test_bad_input_is_rejected(self):
+        self.assertEqual(self.client.get("/mainapp/notes/search/").status_code, 400)
+        self.assertEqual(self.client.get("/mainapp/notes/search/", {"q": "x", "cursor": "!!"}).status_code, 400)
+
+
+class NoteSummaryCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="learner", password="pass12345")
+        self.goal = LearningGoal.objects.create(owner=self.user, skill_name="Django", notes="Context")
+        LearningActivity.objects.create(goal=self.goal, performed_on="2025-01-02", hours_spent=1, notes="Learned signals")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def summarize(self, **data):
+        with mock.patch("mainapp.views.build_note_summary", wraps=build_note_summary) as build:
+            response = self.client.post("/mainapp/ai/note-summarization/", data, format="json")
+        self.assertEqual(response.status_code, 200)
+        return build.call_count, response.data
+
+    def test_writes_bump_the_data_version(self):
+        version = current_data_version(self.user.id)
+        activity = LearningActivity.objects.create(goal=self.goal, performed_on="2025-01-03", hours_spent=1)
+        self.assertEqual(current_data_version(self.user.id), version + 1)
+        activity.delete()
+        self.assertEqual(current_data_version(self.user.id), version + 2)
+
+    def test_deleting_a_user_does_not_recreate_their_version(self):
+        user_id = self.user.id
+        self.user.delete()
+        self.assertFalse(UserDataVersion.objects.filter(user_id=user_id).exists())
+        self.assertFalse(LearningGoal.objects.filter(owner_id=user_id).exists())
+
+    def test_summary_is_cached_until_the_next_write(self):
+        calls, first = self.summarize()
+        self.assertEqual(calls, 1)
+        calls, second = self.summarize()
+        self.assertEqual(calls, 0)
+        self.assertEqual(second["notes_count"], first["notes_count"])
+        LearningActivity.objects.create(goal=self.goal, performed_on="2025-01-03", hours_spent=1, notes="Built a cache")
+        calls, third = self.summarize()
+        self.assertEqual(calls, 1)
+        self.assertEqual(third["notes_count"], 2)
+        calls, _ = self.summarize(limit=1)
+        self.assertEqual(calls, 1)
+
+    def test_precompute_command_fills_the_cache(self):
+        call_command("precompute_note_summaries", workers=0, stdout=StringIO())
+        self.assertEqual(NoteSummaryCache.objects.filter(owner=self.user).count(), 2)
+        calls, data = self.summarize(goal_id=self.goal.id)
+        self.assertEqual(calls, 0)
+        self.assertEqual(data["summary"]["title"], "Learning Summary for Django")
+
+    @override_settings(NOTE_SUMMARY_PRECOMPUTE_BUDGET_MS=0)
+    def test_precompute_budget_leaves_slow_owners_uncached(self):
+        LearningActivity.objects.bulk_create(
+            LearningActivity(goal=self.goal, performed_on="2025-01-04", hours_spent=1, notes=f"read part {index} of the docs")
+            for index in range(3000)
+        )
+        with self.assertLogs("mainapp.note_summary", "WARNING"):
+            call_command("precompute_note_summaries", workers=0, stdout=StringIO())
+        self.assertFalse(NoteSummaryCache.objects.filter(owner=self.user).exists())
+
+
+class ComputeBudgetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="learner", password="pass12345")
+        self.goal = LearningGoal.objects.create(owner=self.user, skill_name="Django", notes="Context")
+        LearningActivity.objects.create(goal=self.goal, performed_on="2025-01-02", hours_spent=1, notes="Learned signals")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_exhausted_budget_returns_partial_recommendations(self):
+        exhausted_before = budget_stats()["exhausted"].get("resource_recommendations", 0)
+        response = self.client.post("/mainapp/ai/resource-recommendations/", {}, format="json", HTTP_X_COMPUTE_BUDGET_MS="0")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["partial"])
+        self.assertEqual(response.data["skipped_stages"], ["next_skills", "catalog_courses", "cohort_standing"])
+        self.assertEqual(response.data["analysis"]["total_goals"], 1)
+        self.assertEqual(budget_stats()["exhausted"]["resource_recommendations"], exhausted_before + 1)
+
+        response = self.client.post("/mainapp/ai/resource-recommendations/", {}, format="json")
+        self.assertFalse(response.data["partial"])
+
+    def test_partial_summaries_are_not_cached(self):
+        response = self.client.post("/mainapp/ai/note-summarization/", {}, format="json", HTTP_X_COMPUTE_BUDGET_MS="0")
+        self.assertTrue(response.data["partial"])
+        self.assertEqual(response.data["notes_count"], 0)
+        self.assertFalse(NoteSummaryCache.objects.exists())
+        response = self.client.post("/mainapp/ai/note-summarization/", {}, format="json")
+        self.assertFalse(response.data["partial"])
+        self.assertEqual(response.data["notes_count"], 1)
+
+    def test_invalid_budget_header_is_rejected(self):
+        response = self.client.post("/mainapp/ai/note-summarization/", {}, format="json", HTTP_X_COMPUTE_BUDGET_MS="soon")
+        self.assertEqual(response.status_code, 400)
+
+
+class RequestCoalescingTests(TestCase):
+    def run_concurrently(self, flight, key="k", callers=4):
+        calls = []
+        started = threading.Barrier(callers)
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"value": len(calls)}
+
+        def caller():
+            started.wait()
+            results.append(flight.do(key, compute))
+
+        threads = [threading.Thread(target=caller) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return calls, results
+
+    def test_concurrent_callers_share_one_computation(self):
+        calls, results = self.run_concurrently(SingleFlight())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([result for result, _ in results], [{"value": 1}] * 4)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True])
+
+    def test_leader_error_reaches_waiters_and_key_is_released(self):
+        flight = SingleFlight()
+        with self.assertRaises(RuntimeError):
+            flight.do("k", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+        self.assertEqual(flight.do("k", lambda: 2), (2, False))
+
+    def test_file_flight_shares_result_but_not_stale_ones(self):
+        with tempfile.TemporaryDirectory() as directory:
+            flight = FileSingleFlight(directory)
+            calls, results = self.run_concurrently(flight)
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True])
+            self.assertEqual(flight.do("k", lambda: {"value": "fresh"}), ({"value": "fresh"}, False))
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_file_flight_is_private_and_writes_nothing_without_waiters(self):
+        with tempfile.TemporaryDirectory() as parent:
+            directory = os.path.join(parent, "coalesce")
+            flight = FileSingleFlight(directory)
+            self.assertEqual(stat.S_IMODE(os.stat(directory).st_mode), 0o700)
+            with mock.patch.object(FileSingleFlight, "_write_result") as write:
+                self.assertEqual(flight.do("k", lambda: {"value": 1}), ({"value": 1}, False))
+            write.assert_not_called()
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_duplicates_get_the_leaders_headers(self):
+        def handler(view, request):
+            response = Response({"value": 1}, status=201)
+            response["Vary"] = "Authorization"
+            response["Cache-Control"] = "private, max-age=60"
+            return response
+
+        async def async_handler(view, request):
+            response = JsonResponse({"value": 1}, status=201)
+            response["Cache-Control"] = "private, max-age=60"
+            return response
+
+        request = SimpleNamespace(data={}, user=SimpleNamespace(pk=1), path="/mainapp/x/", META={})
+        shared_flight = SimpleNamespace(do=lambda key, func: (func(), True))
+        with mock.patch("mainapp.coalesce.get_flight", return_value=shared_flight):
+            response = coalesced("x")(handler)(None, request)
+        self.assertEqual((response.status_code, response.data), (201, {"value": 1}))
+        self.assertEqual((response["Vary"], response["Cache-Control"]), ("Authorization", "private, max-age=60"))
+
+        response = asyncio.run(coalesced_async("x")(async_handler)(None, request))
+        self.assertEqual((response.status_code, json.loads(response.content)), (201, {"value": 1}))
+        self.assertEqual((response["Content-Type"], response["Cache-Control"]), ("application/json", "private, max-age=60"))
+
+    def test_request_key_ignores_body_key_order(self):
+        def request(data, user_id=1):
+            return SimpleNamespace(data=data, user=SimpleNamespace(pk=user_id), path="/mainapp/ai/x/", META={})
+
+        key = request_key(request({"goal_id": 1, "limit": 5}), "notes")
+        self.assertEqual(key, request_key(request({"limit": 5, "goal_id": 1}), "notes"))
+        self.assertNotEqual(key, request_key(request({"limit": 5, "goal_id": 1}, user_id=2), "notes"))
+        self.assertNotEqual(key, request_key(request({"goal_id": 2, "limit": 5}), "notes"))
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(username="learner", password="pass12345", email="a@example.com")
+        LearningGoal.objects.create(owner=self.user, skill_name="Django")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/mainapp/learning-goals/")
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_second_request_skips_user_lookup(self):
+        cold = self.count_queries()
+        self.assertEqual(self.count_queries(), cold - 1)
+
+    def test_user_changes_evict_cached_user(self):
+        self.count_queries()
+        self.user.email = "b@example.com"
+        self.user.save()
+        self.assertIsNone(user_cache.get(str(self.user.pk)))
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get("/mainapp/learning-goals/")
+        self.assertEqual(response.status_code, 401)
+
+    def test_expired_entries_are_reloaded(self):
+        with self.settings(JWT_USER_CACHE_TTL=0):
+            cold = self.count_queries()
+            self.assertEqual(self.count_queries(), cold)
+
+
+THROTTLED_REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": ("mainapp.authentication.CachedJWTAuthentication",),
+    "DEFAULT_THROTTLE_RATES": {"expensive": "2/min", "expensive_ip": None, "register_ip": "2/hour"},
+}
+
+
+class TokenBucketThrottleTests(TestCase):
+    def setUp(self):
+        bucket_store().clear()
+        self.user = User.objects.create_user(username="learner", password="pass12345")
+        LearningGoal.objects.create(owner=self.user, skill_name="Django", notes="Context")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_bucket_refills_over_time(self):
+        state, wait = take_tokens(None, 2, 1 / 30, 2, now=100.0)
+        self.assertEqual((state, wait), ((0, 100.0), 0.0))
+        state, wait = take_tokens(state, 2, 1 / 30, 2, now=115.0)
+        self.assertAlmostEqual(wait, 45.0)
+        state, wait = take_tokens(state, 2, 1 / 30, 2, now=160.0)
+        self.assertEqual(wait, 0.0)
+
+    def test_memory_store_drops_least_recently_used_buckets(self):
+        store = MemoryBucketStore()
+        store.max_buckets = 2
+        self.assertEqual(store.consume("a", 1, 1 / 60, 1), 0)
+        store.consume("b", 1, 1 / 60, 1)
+        self.assertGreater(store.consume("a", 1, 1 / 60, 1), 0)
+        store.consume("c", 1, 1 / 60, 1)
+        self.assertEqual(list(store._buckets), ["a", "c"])
+
+    def test_cost_above_capacity_is_a_configuration_error(self):
+        rest_framework = {**THROTTLED_REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"expensive": "1/min", "expensive_ip": None}}
+        with self.settings(REST_FRAMEWORK=rest_framework):
+            with self.assertRaisesMessage(ImproperlyConfigured, "exceeds the 'expensive' capacity of 1"):
+                self.client.post("/mainapp/ai/note-summarization/", {}, format="json")
+
+    def test_expensive_endpoint_returns_429_with_retry_after(self):
+        with self.settings(REST_FRAMEWORK=THROTTLED_REST_FRAMEWORK):
+            first = self.client.post("/mainapp/ai/note-summarization/", {}, format="json")
+            second = self.client.post("/mainapp/ai/note-summarization/", {}, format="json")
+            other = User.objects.create_user(username="other", password="pass12345")
+            self.client.force_authenticate(other)
+            third = self.client.post("/mainapp/ai/note-summarization/", {}, format="json")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 429)
+        self.assertEqual(int(second["Retry-After"]), 60)
+        self.assertEqual(third.status_code, 200)
+
+    def test_registration_is_throttled_per_ip(self):
+        with self.settings(REST_FRAMEWORK=THROTTLED_REST_FRAMEWORK, THROTTLE_STORE="cache"):
+            bucket_store().clear()
+            codes = [
+                self.client.post(
+                    "/mainapp/register/",
+                    {"username": f"new{index}", "email": f"new{index}@example.com", "password": "Str0ng-pass-123", "confirm_password": "Str0ng-pass-123"},
+                    format="json",
+                ).status_code
+                for index in range(3)
+            ]
+        self.assertEqual(codes, [201, 201, 429])
+
+
+class DashboardBootstrapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="learner", password="pass12345", email="l@example.com")
+        other = User.objects.create_user(username="other", password="pass12345")
+        today = timezone.now().date()
+        for index in range(3):
+            goal = LearningGoal.objects.create(owner=self.user, skill_name=f"Skill {index}")
+            LearningActivity.objects.create(goal=goal, performed_on=today, hours_spent=1.5, notes="Practiced")
+            LearningActivity.objects.create(goal=goal, performed_on=today - timedelta(days=30), hours_spent=4)
+        LearningActivity.objects.create(
+            goal=LearningGoal.objects.create(owner=other, skill_name="Other"), performed_on=today, hours_spent=9
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_bootstrap_uses_fixed_number_of_queries(self):
+        # Data version (response cache key), goals, activities, weekly stats.
+        with self.assertNumQueries(4):
+            response = self.client.get("/mainapp/dashboard/bootstrap/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["profile"]["username"], "learner")
+        self.assertEqual(len(response.data["goals"]), 3)
+        self.assertEqual(len(response.data["activities"]), 6)
+        self.assertFalse(response.data["has_more_activities"])
+        self.assertEqual(response.data["activities"][0]["goal_details"]["skill_name"], "Skill 2")
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get("/mainapp/dashboard/bootstrap/")["X-Cache"], "HIT")
+        # A response cache miss still finds the weekly stats cached.
+        response_cache().clear()
+        with self.assertNumQueries(3):
+            self.client.get("/mainapp/dashboard/bootstrap/")
+
+    def test_weekly_stats_match_weekly_summary_and_follow_changes(self):
+        stats = self.client.get("/mainapp/dashboard/bootstrap/").data["weekly_stats"]
+        summary = self.client.post("/mainapp/learning-summary/send-weekly/", {}, format="json").data
+        for field in ("goals_updated", "activities_logged", "hours_logged"):
+            self.assertEqual(stats[field], summary[field])
+        self.assertEqual(stats["hours_logged"], 4.5)
+
+        LearningActivity.objects.create(
+            goal=LearningGoal.objects.filter(owner=self.user).first(), performed_on=timezone.now().date(), hours_spent=2
+        )
+        stats = self.client.get("/mainapp/dashboard/bootstrap/").data["weekly_stats"]
+        self.assertEqual((stats["activities_logged"], stats["hours_logged"]), (4, 6.5))
+
+
+class SQLiteConnectionSettingsTests(TestCase):
+    def test_pragmas_are_applied_on_connect(self):
+        with connection.cursor() as cursor:
+            pragmas = {
+                name: cursor.execute(f"PRAGMA {name}").fetchone()[0]
+                for name in ("synchronous", "cache_size", "temp_store", "busy_timeout")
+            }
+        # 1 = NORMAL, 2 = MEMORY; the test database is in memory, so WAL cannot apply.
+        self.assertEqual(pragmas, {"synchronous": 1, "cache_size": -20000, "temp_store": 2, "busy_timeout": 20000})
+
+
+@override_settings(READ_REPLICA_ALIAS="default")
+class ReplicaRoutingTests(TestCase):
+    # Tests define no replica alias, so "default" stands in for it and the
+    # router's choices are recorded: the replica alias, or None for the primary.
+    def setUp(self):
+        self.user = User.objects.create_user(username="learner", password="pass12345")
+        LearningGoal.objects.create(owner=self.user, skill_name="Primary")
+        cache.clear()
+        response_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def read_aliases(self, path):
+        aliases = []
+        db_for_read = ReplicaRouter.db_for_read
+
+        def record(router, model, **hints):
+            aliases.append(db_for_read(router, model, **hints))
+            return aliases[-1]
+
+        with mock.patch.object(ReplicaRouter, "db_for_read", record):
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return set(aliases)
+
+    def test_marked_views_read_from_replica(self):
+        self.assertEqual(self.read_aliases("/mainapp/learning-goals/"), {"default"})
+        self.assertEqual(self.read_aliases("/mainapp/dashboard/bootstrap/"), {"default"})
+
+    def test_reads_stick_to_primary_after_a_write(self):
+        response = self.client.post("/mainapp/learning-goals/", {"skill_name": "Fresh"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.read_aliases("/mainapp/learning-goals/"), {None})
+        cache.clear()
+        response_cache().clear()
+        self.assertEqual(self.read_aliases("/mainapp/learning-goals/"), {"default"})
+
+    def test_reads_stay_on_primary_without_replica(self):
+        with self.settings(READ_REPLICA_ALIAS=None):
+            self.assertEqual(self.read_aliases("/mainapp/learning-goals/"), {None})
+
+    def test_per_process_cache_is_flagged(self):
+        self.assertEqual([warning.id for warning in check_sticky_cache(None)], ["mainapp.W001"])
+        shared = {"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "cache"}}
+        with self.settings(CACHES=shared):
+            self.assertEqual(check_sticky_cache(None), [])
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.user = User.objects.create_user(username="learner", password="pass12345")
+        self.goal = LearningGoal.objects.create(owner=self.user, skill_name="Django", notes="Learned views")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_repeat_reads_hit_until_user_writes(self):
+        first = self.client.get("/mainapp/learning-goals/")
+        second = self.client.get("/mainapp/learning-goals/")
+        self.assertEqual((first["X-Cache"], second["X-Cache"]), ("MISS", "HIT"))
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(self.client.get("/mainapp/learning-goals/", {"status": "started"})["X-Cache"], "MISS")
+
+        LearningActivity.objects.create(goal=self.goal, performed_on="2025-01-02", hours_spent=1)
+        self.assertEqual(self.client.get("/mainapp/learning-goals/")["X-Cache"], "MISS")
+        self.goal.delete()
+        response = self.client.get("/mainapp/learning-goals/")
+        self.assertEqual((response["X-Cache"], response.data), ("MISS", []))
+
+        stats = response_cache_stats()["learning_goals"]
+        self.assertEqual((stats["hits"] >= 1, stats["misses"] >= 4), (True, True))
+
+    def test_entries_are_per_user(self):
+        self.client.get("/mainapp/learning-goals/")
+        other = User.objects.create_user(username="other", password="pass12345")
+        self.client.force_authenticate(other)
+        response = self.client.get("/mainapp/learning-goals/")
+        self.assertEqual((response["X-Cache"], response.data), ("MISS", []))
+
+    def test_partial_ai_responses_are_not_cached(self):
+        LearningActivity.objects.create(goal=self.goal, performed_on="2025-01-02", hours_spent=1, notes="Practiced")
+        for _ in range(2):
+            response = self.client.post(
+                "/mainapp/ai/note-summarization/", {}, format="json", HTTP_X_COMPUTE_BUDGET_MS="0"
+            )
+            self.assertEqual(response["X-Cache"], "MISS")
+        self.client.post("/mainapp/ai/note-summarization/", {}, format="json")
+        self.assertEqual(self.client.post("/mainapp/ai/note-summarization/", {}, format="json")["X-Cache"], "HIT")
+
+    def test_memory_backend_evicts_least_recently_used(self):
+        cache = MemoryResponseCache(max_entries=2)
+        cache.set("a", [1], 200, 60)
+        cache.set("b", [2], 200, 60)
+        cache.get("a")
+        self.assertEqual(cache.set("c", [3], 200, 60), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), ([1], 200))
+
+
+class AsyncIOViewTests(TestCase):
+    def setUp(self):
+        bucket_store().clear()
+        self.user = User.objects.create_user(username="learner", password="pass12345", email="l@example.com")
+        goal = LearningGoal.objects.create(owner=self.user, skill_name="Django", platform="Udemy")
+        LearningActivity.objects.create(goal=goal, performed_on=timezone.now().date(), hours_spent="1.10")
+        LearningActivity.objects.create(goal=goal, performed_on=timezone.now().date(), hours_spent="2.20")
+        self.factory = AsyncRequestFactory()
+        self.auth = {"headers": {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}}
+
+    async def call(self, view, data, **extra):
+        response = await self.respond(view, data, **extra)
+        return response.status_code, json.loads(response.content)
+
+    async def respond(self, view, data, **extra):
+        request = self.factory.post("/", data, content_type="application/json", **extra)
+        return await view.as_view()(request)
+
+    async def test_async_weekly_summary_matches_sync_view(self):
+        status_code, summary = await self.call(AsyncWeeklySummaryView, {"send_email": "no"}, **self.auth)
+        self.assertEqual(status_code, 200)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        expected = await sync_to_async(client.post)("/mainapp/learning-summary/send-weekly/", {"send_email": "no"}, format="json")
+        for field in ("goals_updated", "activities_logged", "hours_logged", "sent_to", "recent_goals"):
+            self.assertEqual(summary[field], json.loads(expected.content)[field])
+        self.assertEqual(summary["hours_logged"], 3.3)
+
+    async def test_async_course_import_fetches_off_the_event_loop(self):
+        page = mock.Mock(text="<title>Async Django</title>", headers={"Content-Type": "text/html"})
+        with mock.patch("mainapp.views.httpx", None), mock.patch("mainapp.views.requests.get", return_value=page) as get:
+            status_code, course = await self.call(AsyncCourseImportView, {"url": "https://example.com/c"}, **self.auth)
+        self.assertEqual(status_code, 201)
+        self.assertEqual((course["title"], course["provider"]), ("Async Django", "example.com"))
+        get.assert_called_once()
+        self.assertTrue(await CourseResource.objects.filter(url="https://example.com/c").aexists())
+
+    async def test_async_course_import_coalesces_duplicates(self):
+        def slow_get(url, timeout):
+            time.sleep(0.2)
+            return mock.Mock(text="<title>Async Django</title>", headers={"Content-Type": "text/html"})
+
+        before = coalesce_stats().get("shared", 0)
+        with mock.patch("mainapp.views.requests.get", side_effect=slow_get) as get:
+            results = await asyncio.gather(
+                *(self.call(AsyncCourseImportView, {"url": "https://example.com/c"}, **self.auth) for _ in range(3))
+            )
+        get.assert_called_once()
+        self.assertEqual({status_code for status_code, _ in results}, {201})
+        self.assertEqual(coalesce_stats().get("shared", 0) - before, 2)
+
+    async def test_async_flight_shares_leader_errors(self):
+        flight = AsyncSingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.05)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+        self.assertEqual([type(result) for result in results], [RuntimeError, RuntimeError])
+
+        async def value():
+            return 2
+
+        self.assertEqual(await flight.do("k", value), (2, False))
+
+    async def test_async_views_require_authentication_and_valid_input(self):
+        status_code, _ = await self.call(AsyncCourseImportView, {"url": "https://example.com/c"})
+        self.assertEqual(status_code, 401)
+        status_code, body = await self.call(AsyncCourseImportView, {"url": "not a url"}, **self.auth)
+        self.assertEqual((status_code, list(body)), (400, ["url"]))
+
+    async def test_async_views_challenge_like_sync_views(self):
+        client = APIClient()
+        expected = await sync_to_async(client.post)("/mainapp/learning-summary/send-weekly/", {}, format="json")
+        for headers in ({}, {"headers": {"Authorization": "Bearer not-a-token"}}):
+            response = await self.respond(AsyncWeeklySummaryView, {}, **headers)
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(response["WWW-Authenticate"], expected["WWW-Authenticate"])
+
+
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.user = User.objects.create_user(username="learner", password="pass12345")
+        LearningGoal.objects.create(owner=self.user, skill_name="Django", notes="Learned views")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_SLOW_REQUEST_MS=None)
+    def test_sampled_request_gets_server_timing(self):
+        response = self.client.get("/mainapp/learning-goals/")
+        metrics = dict(entry.split(";", 1) for entry in response["Server-Timing"].split(", "))
+        self.assertEqual(list(metrics), ["db", "view", "render", "total", "size"])
+        self.assertRegex(metrics["db"], r'^dur=[\d.]+;desc="[1-9]\d* queries"$')
+        self.assertEqual(metrics["size"], f'desc="{len(response.content)} bytes"')
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_SLOW_REQUEST_MS=None)
+    async def test_queries_are_counted_under_asgi(self):
+        response = await AsyncClient().get(
+            "/mainapp/learning-goals/", headers={"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response["Server-Timing"], r'^db;dur=[\d.]+;desc="[1-9]\d* queries", view;dur=')
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_SLOW_REQUEST_MS=0, PROFILING_SLOW_SQL_COUNT=2)
+    def test_slow_request_is_logged_with_slowest_statements(self):
+        with self.assertLogs("mainapp.profiling", "WARNING") as logs:
+            self.client.get("/mainapp/learning-goals/")
+        record = logs.records[0].request_profile
+        self.assertEqual((record["path"], record["status"], record["sampled"]), ("/mainapp/learning-goals/", 200, True))
+        self.assertGreaterEqual(record["queries"], 2)
+        self.assertEqual(len(record["slowest_sql"]), 2)
+        self.assertGreaterEqual(record["slowest_sql"][0]["ms"], record["slowest_sql"][1]["ms"])
+        self.assertNotIn("learner", json.dumps(record["slowest_sql"]))
+
+    @override_settings(PROFILING_SAMPLE_RATE=0.0, PROFILING_SLOW_REQUEST_MS=0)
+    def test_unsampled_requests_only_log_totals(self):
+        with self.assertLogs("mainapp.profiling", "WARNING") as logs:
+            response = self.client.get("/mainapp/learning-goals/")
+        self.assertNotIn("Server-Timing", response)
+        record = logs.records[0].request_profile
+        self.assertEqual((record["sampled"], "slowest_sql" in record), (False, False))
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        response_cache().clear()
+        bucket_store().clear()
+        self.user = User.objects.create_user(username="learner", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def sample(self, name, **labels):
+        entry = metrics.snapshot()[name]
+        wanted = [str(labels[label]) for label in entry["labelnames"]]
+        return next((value for values, value in entry["samples"] if values == wanted), None)
+
+    def request_count(self, view, method="GET"):
+        value = self.sample("skillstack_http_request_duration_seconds", view=view, method=method)
+        return sum(value[0]) if value else 0
+
+    def test_latency_and_errors_are_recorded_per_url_name(self):
+        before = self.request_count("learning-goal-list")
+        errors = self.sample("skillstack_http_errors_total", view="learning-goal-detail", method="GET", status=404) or 0
+        self.client.get("/mainapp/learning-goals/")
+        self.client.get("/mainapp/learning-goals/999/")
+        self.assertEqual(self.request_count("learning-goal-list"), before + 1)
+        self.assertEqual(
+            self.sample("skillstack_http_errors_total", view="learning-goal-detail", method="GET", status=404), errors + 1
+        )
+
+    def test_course_import_outcomes(self):
+        counts = {
+            outcome: self.sample("skillstack_course_imports_total", outcome=outcome) or 0
+            for outcome in ("fetched", "cached", "failed")
+        }
+        page = mock.Mock(text="<title>Django</title>", headers={"Content-Type": "text/html"})
+        # A duplicate that shares a concurrent import's result counts as cached.
+        shared_flight = SimpleNamespace(do=lambda key, func: (func(), True))
+        with mock.patch("mainapp.coalesce.get_flight", return_value=shared_flight):
+            with mock.patch("mainapp.views.requests.get", return_value=page) as get:
+                response = self.client.post("/mainapp/course-import/", {"url": "https://example.com/c"}, format="json")
+        self.assertEqual((response.status_code, get.call_count), (201, 1))
+        with mock.patch("mainapp.views.requests.get", side_effect=OSError("down")), self.assertLogs("mainapp.views"):
+            self.client.post("/mainapp/course-import/", {"url": "https://example.com/d"}, format="json")
+        for outcome in counts:
+            self.assertEqual(self.sample("skillstack_course_imports_total", outcome=outcome), counts[outcome] + 1)
+
+    def test_endpoint_sums_snapshots_of_all_processes(self):
+        other = metrics.merge([metrics.snapshot()])
+        other["skillstack_course_imports_total"]["samples"] = [[["fetched"], 5]]
+        other["skillstack_ai_compute_seconds"]["samples"] = [[["note_summarization"], [[1] + [0] * 12, 0.004]]]
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_DIR=directory, DEBUG=True):
+            with open(f"{directory}/metrics-1-other.json", "w") as handle:
+                json.dump(other, handle)
+            own = self.sample("skillstack_course_imports_total", outcome="fetched") or 0
+            response = self.client.get("/mainapp/metrics/")
+        self.assertEqual(response["Content-Type"], metrics.CONTENT_TYPE)
+        body = response.content.decode()
+        self.assertIn(f'skillstack_course_imports_total{{outcome="fetched"}} {float(own + 5)}\n', body)
+        self.assertIn('skillstack_ai_compute_seconds_bucket{endpoint="note_summarization",le="0.005"}', body)
+        self.assertIn("# TYPE skillstack_http_request_duration_seconds histogram", body)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_endpoint_requires_token_when_configured(self):
+        self.assertEqual(self.client.get("/mainapp/metrics/").status_code, 401)
+        response = self.client.get("/mainapp/metrics/", HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_TOKEN=None, DEBUG=False)
+    def test_endpoint_is_closed_outside_debug_without_token(self):
+        self.assertEqual(self.client.get("/mainapp/metrics/").status_code, 403)
+
+    def test_ai_compute_time_excludes_rejected_and_cached_requests(self):
+        def observed():
+            value = self.sample("skillstack_ai_compute_seconds", endpoint="note_summarization")
+            return sum(value[0]) if value else 0
+
+        before = observed()
+        response = self.client.post("/mainapp/ai/note-summarization/", {"since": "last week"}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(observed(), before)
+        self.client.post("/mainapp/ai/note-summarization/", {}, format="json")
+        self.client.post("/mainapp/ai/note-summarization/", {}, format="json")
+        self.assertEqual(observed(), before + 1)
+
+
+class BenchmarkSuiteTests(TestCase):
+    def test_seed_is_deterministic_and_fills_derived_fields(self):
+        counts = seed(2, 3, 4, courses=5, seed_value=7, derived=False)
+        self.assertEqual(counts, {"users": 2, "goals": 6, "activities": 24, "courses": 5})
+        notes = list(LearningActivity.objects.order_by("goal__owner__username", "id").values_list("notes", flat=True))
+        activity = LearningActivity.objects.first()
+        self.assertEqual(activity.token_stats, NoteText(activity.notes).to_stats())
+        self.assertFalse(LearningGoal.objects.filter(skill__isnull=True).exists())
+
+        self.assertEqual(clear_benchmark_data(), 2)
+        seed(2, 3, 4, courses=5, seed_value=7, derived=False)
+        again = list(LearningActivity.objects.order_by("goal__owner__username", "id").values_list("notes", flat=True))
+        self.assertEqual(again, notes)
+
+    def test_runner_reports_scenarios_and_fails_on_regression(self):
+        seed(2, 2, 3, courses=5, derived=False)
+        with tempfile.TemporaryDirectory() as directory:
+            output = f"{directory}/results.json"
+            only = ["learning-goal-list", "learning-goal-create", "learning-goal-delete"]
+            call_command(
+                "run_benchmarks", existing_db=True, requests=3, only=only, output=output, no_compare=True,
+                stdout=StringIO(),
+            )
+            with open(output) as handle:
+                results = json.load(handle)
+            self.assertEqual(list(results["scenarios"]), only)
+            listed = results["scenarios"]["learning-goal-list"]
+            self.assertEqual((listed["requests"], listed["errors"], listed["statuses"]), (3, 0, {"200": 3}))
+            self.assertGreater(listed["queries_mean"], 0)
+
+            for summary in results["scenarios"].values():
+                summary.update(p95_ms=0.001, queries_mean=0)
+            with open(output, "w") as handle:
+                json.dump(results, handle)
+            with self.assertRaises(CommandError):
+                call_command(
+                    "run_benchmarks", existing_db=True, requests=3, only=only, baseline=output,
+                    stdout=StringIO(), stderr=StringIO(),
+                )
+
+    def test_compare_flags_latency_query_and_error_regressions(self):
+        def summary(p95, queries, errors=0):
+            return {"p95_ms": p95, "queries_mean": queries, "errors": errors, "statuses": {}}
+
+        baseline = {"scenarios": {"fast": summary(1.0, 2), "slow": summary(100.0, 2), "queries": summary(5.0, 2)}}
+        results = {
+            "scenarios": {
+                "fast": summary(2.5, 2),
+                "slow": summary(140.0, 2),
+                "queries": summary(5.0, 3),
+                "new": summary(50.0, 9, errors=1),
+            }
+        }
+        regressions = compare(results, baseline)
+        self.assertEqual([line.split(":")[0] for line in regressions], ["slow", "queries", "new"])
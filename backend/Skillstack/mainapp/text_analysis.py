@@ -0,0 +1,238 @@
+"""
+Single-pass analysis of learning notes for NoteSummarizationView.
+
+Each note is wrapped in a NoteText once; its words, lowercase form, topic
+counts and keyword hits are computed on first use and then shared by every
+metric in the summary payload.
+"""
+
+import re
+from collections import Counter
+
+from .keywords import KeywordMatcher
+
+TIMESTAMP_LINE_PATTERN = re.compile(r"^\[\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}\]")
+ENTRY_PATTERN = re.compile(r"^\[([^\]]+)\]\s*(.*)")
+SENTENCE_SPLIT_PATTERN = re.compile(r"[.!?]\s+")
+
+ACTION_KEYWORDS = (
+    "learned", "completed", "understood", "mastered", "implemented",
+    "fixed", "solved", "created", "built", "deployed", "optimized",
+    "discovered", "integrated", "configured", "practiced", "improved", "enhanced",
+)
+
+CONCEPT_KEYWORDS = {
+    "fundamentals": ("basic", "foundation", "concept", "theory", "principle"),
+    "practical": ("implement", "build", "create", "code", "practice", "exercise"),
+    "problem-solving": ("fix", "debug", "solve", "issue", "error", "bug"),
+    "optimization": ("optimize", "improve", "enhance", "performance", "efficiency"),
+    "integration": ("integrate", "connect", "link", "API", "database", "external"),
+    "testing": ("test", "unit", "integration", "validation", "verify"),
+    "deployment": ("deploy", "production", "release", "live", "production"),
+}
+
+# One automaton counts every action and concept keyword in a single pass per
+# note; the action keyword and the themes are both read from those counts.
+NOTE_KEYWORDS = KeywordMatcher(ACTION_KEYWORDS + tuple(kw for kws in CONCEPT_KEYWORDS.values() for kw in kws))
+
+
+def _keyword_concepts():
+    """Concepts each keyword counts towards; "integration" is in two lists."""
+    concepts = {}
+    for concept, keywords in CONCEPT_KEYWORDS.items():
+        # The matcher reports keywords lowercased ("API" as "api").
+        for keyword in dict.fromkeys(keyword.lower() for keyword in keywords):
+            concepts[keyword] = concepts.get(keyword, ()) + (concept,)
+    return concepts
+
+
+KEYWORD_CONCEPTS = _keyword_concepts()
+
+# Stop words for topics counted per activity note and over the combined text.
+NOTE_TOPIC_STOP_WORDS = frozenset(
+    {"this", "that", "with", "from", "into", "have", "about", "where", "which"}
+)
+COMBINED_TOPIC_STOP_WORDS = NOTE_TOPIC_STOP_WORDS | frozenset(
+    {"there", "would", "could", "should", "been", "more"}
+)
+
+WORD_PUNCTUATION = ".,!?;:"
+# Bump when the stored token statistics would be computed differently.
+TOKEN_STATS_VERSION = 1
+MIN_SENTENCE_LENGTH = 10
+
+
+class NoteText:
+    """A piece of note text, tokenized once and analyzed lazily."""
+
+    __slots__ = (
+        "text", "_words", "_word_count", "_lower", "_note_topics", "_combined_topics", "_action_keyword", "_keyword_counts",
+    )
+
+    def __init__(self, text):
+        self.text = text or ""
+        self._words = None
+        self._word_count = None
+        self._lower = None
+        self._note_topics = None
+        self._combined_topics = None
+        self._action_keyword = False
+        self._keyword_counts = None
+
+    @classmethod
+    def from_stats(cls, text, stats):
+        """Rebuild a NoteText from stored `to_stats()` output without re-tokenizing."""
+        note = cls(text)
+        if stats and stats.get("v") == TOKEN_STATS_VERSION:
+            note._word_count = stats["words"]
+            note._action_keyword = stats["action"]
+            note._note_topics = stats["note_topics"]
+            note._combined_topics = stats["combined_topics"]
+        return note
+
+    def to_stats(self):
+        """Compact, JSON-serializable token statistics for storage."""
+        return {
+            "v": TOKEN_STATS_VERSION,
+            "words": self.word_count,
+            "action": self.action_keyword,
+            "note_topics": dict(self.note_topics),
+            "combined_topics": dict(self.combined_topics),
+        }
+
+    @property
+    def words(self):
+        if self._words is None:
+            self._words = self.text.split()
+        return self._words
+
+    @property
+    def lower(self):
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def word_count(self):
+        if self._word_count is None:
+            self._word_count = len(self.words)
+        return self._word_count
+
+    @property
+    def keyword_counts(self):
+        """Occurrences of every action and concept keyword in the lowercased text."""
+        if self._keyword_counts is None:
+            self._keyword_counts = NOTE_KEYWORDS.counts(self.lower)
+        return self._keyword_counts
+
+    def keyword_positions(self):
+        """Start offsets of every action and concept keyword, for highlighting."""
+        return NOTE_KEYWORDS.positions(self.lower)
+
+    @property
+    def action_keyword(self):
+        """First action keyword found in the text, or None."""
+        if self._action_keyword is False:
+            # ACTION_KEYWORDS order decides between several hits, as before.
+            counts = self.keyword_counts
+            self._action_keyword = next((kw for kw in ACTION_KEYWORDS if kw in counts), None)
+        return self._action_keyword
+
+    def _count_topics(self):
+        note_terms = []
+        combined_terms = []
+        for word in self.words:
+            if len(word) <= 4:
+                continue
+            word_lower = word.lower()
+            clean_word = word_lower.strip(WORD_PUNCTUATION)
+            if len(clean_word) <= 3:
+                continue
+            if word_lower not in NOTE_TOPIC_STOP_WORDS:
+                note_terms.append(clean_word)
+            if word_lower not in COMBINED_TOPIC_STOP_WORDS and not clean_word.endswith("ing"):
+                combined_terms.append(clean_word)
+        self._note_topics = Counter(note_terms)
+        self._combined_topics = Counter(combined_terms)
+
+    @property
+    def note_topics(self):
+        """Topic counts used for an individual activity note."""
+        if self._note_topics is None:
+            self._count_topics()
+        return self._note_topics
+
+    @property
+    def combined_topics(self):
+        """Topic counts used when the note is part of the combined text."""
+        if self._combined_topics is None:
+            self._count_topics()
+        return self._combined_topics
+
+
+def merge_counts(target, counts):
+    for term, count in counts.items():
+        target[term] = target.get(term, 0) + count
+    return target
+
+
+def parse_goal_notes(goal_notes):
+    """
+    Parse goal notes to separate main notes from activity notes.
+    Activity notes follow pattern: [YYYY-MM-DD HH:MM] note_text
+    """
+    if not goal_notes or not goal_notes.strip():
+        return "", []
+
+    main_notes = []
+    activity_entries = []
+    for line in goal_notes.split("\n"):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if TIMESTAMP_LINE_PATTERN.match(stripped):
+            match = ENTRY_PATTERN.search(stripped)
+            if match:
+                activity_entries.append({"timestamp": match.group(1), "text": match.group(2)})
+        else:
+            main_notes.append(line)
+    return "\n".join(main_notes).strip(), activity_entries
+
+
+def goal_note_parts(main_notes, activity_entries):
+    """NoteText parts for parsed goal notes: the main notes, then each entry."""
+    return [NoteText(main_notes)] + [NoteText(entry["text"]) for entry in activity_entries]
+
+
+def analyze_text_content(parts):
+    """Extract themes, key phrases and size from NoteText parts read as one text."""
+    word_count = sum(part.word_count for part in parts)
+    if not word_count:
+        return {"themes": [], "theme_counts": {}, "concepts": [], "sentiment": "neutral"}
+
+    # Keywords contain no spaces, so per-part counts add up to the counts
+    # over the joined text.
+    keyword_counts = {}
+    for part in parts:
+        merge_counts(keyword_counts, part.keyword_counts)
+    concept_hits = {}
+    for keyword, count in keyword_counts.items():
+        for concept in KEYWORD_CONCEPTS.get(keyword, ()):
+            concept_hits[concept] = concept_hits.get(concept, 0) + count
+    theme_counts = {concept: concept_hits[concept] for concept in CONCEPT_KEYWORDS if concept in concept_hits}
+    concepts = list(theme_counts)
+
+    # Important phrases are capitalized words, in order of first appearance.
+    important_phrases = {}
+    for part in parts:
+        for word in part.words:
+            if len(word) > 3 and word[0].isupper():
+                important_phrases.setdefault(word.rstrip(WORD_PUNCTUATION), None)
+
+    return {
+        "themes": concepts[:5],
+        "theme_counts": theme_counts,
+        "key_phrases": list(important_phrases)[:5],
+        "word_count": word_count,
+        "content_length": "comprehensive" if word_count > 100 else "moderate" if word_count > 30 else "brief",
+    }
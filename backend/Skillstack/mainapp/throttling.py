@@ -0,0 +1,184 @@
+"""
+Token-bucket throttles for the expensive endpoints.
+
+Rates come from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] in DRF's
+"<requests>/<period>" form and are read as a bucket of that many tokens that
+refills evenly over the period, so short bursts are allowed but sustained use
+is capped. A view picks its rate with `throttle_scope` (the IP throttle uses
+"<scope>_ip") and charges `throttle_cost` tokens per request.
+
+Bucket state lives in a store chosen by THROTTLE_STORE: "memory" keeps it
+per process, "cache" keeps it in the Django cache named by
+THROTTLE_CACHE_ALIAS so several worker processes share one budget.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+STORES = ("memory", "cache")
+
+
+def parse_rate(rate):
+    """'30/min' -> (capacity, tokens refilled per second)."""
+    count, period = rate.split("/")
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+def take_tokens(state, capacity, refill_rate, cost, now):
+    """
+    Refill `state` ((tokens, updated_at) or None) up to `now` and try to take `cost`.
+
+    Returns (new_state, wait) where wait is 0 when the request is allowed and
+    otherwise the seconds until enough tokens have accumulated.
+    """
+    tokens, updated = state if state is not None else (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * refill_rate)
+    if tokens >= cost:
+        return (tokens - cost, now), 0.0
+    return (tokens, now), (cost - tokens) / refill_rate
+
+
+class MemoryBucketStore:
+    """
+    Per-process buckets, at most `max_buckets` of them.
+
+    The least recently used bucket is dropped to make room, so memory stays
+    bounded however many distinct clients call; a dropped client starts
+    again from a full bucket.
+    """
+
+    max_buckets = 10_000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def consume(self, key, capacity, refill_rate, cost):
+        with self._lock:
+            state, wait = take_tokens(self._buckets.get(key), capacity, refill_rate, cost, time.time())
+            self._buckets[key] = state
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """
+    Buckets in a shared Django cache (for example Redis or the database cache).
+
+    Updates hold a short `cache.add` lock per key; if it cannot be had within
+    `lock_wait` seconds the update goes ahead unlocked, which can admit a
+    request or two too many under heavy contention but never stalls a worker.
+    """
+
+    lock_timeout = 1
+    lock_wait = 0.05
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+
+    def consume(self, key, capacity, refill_rate, cost):
+        cache = caches[self.alias]
+        lock_key = f"{key}:lock"
+        deadline = time.monotonic() + self.lock_wait
+        locked = cache.add(lock_key, 1, self.lock_timeout)
+        while not locked and time.monotonic() < deadline:
+            time.sleep(0.002)
+            locked = cache.add(lock_key, 1, self.lock_timeout)
+        try:
+            state, wait = take_tokens(cache.get(key), capacity, refill_rate, cost, time.time())
+            # A full bucket needs no entry; keep it just past the full-refill time.
+            cache.set(key, state, int(capacity / refill_rate) + 1)
+        finally:
+            if locked:
+                cache.delete(lock_key)
+        return wait
+
+    def clear(self):
+        caches[self.alias].clear()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def bucket_store():
+    """The process-wide store for the configured backend."""
+    backend = getattr(settings, "THROTTLE_STORE", "memory")
+    if backend not in STORES:
+        raise ImproperlyConfigured(f"Unknown THROTTLE_STORE: {backend!r}")
+    with _stores_lock:
+        store = _stores.get(backend)
+        if store is None:
+            if backend == "cache":
+                store = CacheBucketStore(getattr(settings, "THROTTLE_CACHE_ALIAS", "default"))
+            else:
+                store = MemoryBucketStore()
+            _stores[backend] = store
+        return store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Base class; subclasses define `rate_suffix` and `get_cache_key`."""
+
+    rate_suffix = ""
+
+    def get_cache_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.wait_seconds = 0.0
+        scope = getattr(view, "throttle_scope", None)
+        if not scope:
+            return True
+        rate_name = scope + self.rate_suffix
+        rates = api_settings.DEFAULT_THROTTLE_RATES or {}
+        if rate_name not in rates:
+            raise ImproperlyConfigured(f"No throttle rate set for scope '{rate_name}'.")
+        if rates[rate_name] is None:
+            return True
+        capacity, refill_rate = parse_rate(rates[rate_name])
+        cost = getattr(view, "throttle_cost", 1)
+        if cost > capacity:
+            # The bucket never holds that many tokens, so every request would be throttled.
+            raise ImproperlyConfigured(
+                f"throttle_cost {cost} of {type(view).__name__} exceeds the '{rate_name}' capacity of {capacity}."
+            )
+        key = f"throttle:{rate_name}:{self.get_cache_key(request, view)}"
+        self.wait_seconds = bucket_store().consume(key, capacity, refill_rate, cost)
+        return self.wait_seconds == 0
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Bucket per authenticated user; anonymous requests share their IP's bucket."""
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Bucket per client IP, so many accounts behind one address cannot multiply the rate."""
+
+    rate_suffix = "_ip"
+
+    def get_cache_key(self, request, view):
+        return self.get_ident(request)
@@ -1,31 +1,48 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from .views import (
+    AsyncCourseImportView,
+    AsyncWeeklySummaryView,
     CourseImportView,
+    DashboardBootstrapView,
     LearningActivityViewSet,
     LearningGoalViewSet,
+    NoteSearchView,
     NoteSummarizationView,
     ProfileView,
     RegisterView,
     ResourceRecommendationView,
     WeeklySummaryView,
     hello_api,
+    metrics_view,
 )
 
 router = DefaultRouter()
 router.register(r'learning-goals', LearningGoalViewSet, basename='learning-goal')
 router.register(r'learning-activities', LearningActivityViewSet, basename='learning-activity')
 
+# Under the ASGI profile the I/O-bound endpoints use their async views.
+if settings.ASYNC_IO_VIEWS:
+    course_import_view = AsyncCourseImportView.as_view()
+    weekly_summary_view = AsyncWeeklySummaryView.as_view()
+else:
+    course_import_view = CourseImportView.as_view()
+    weekly_summary_view = WeeklySummaryView.as_view()
+
 urlpatterns = [
     path('hello/', hello_api, name='hello_api'),
+    path('metrics/', metrics_view, name='metrics'),
     path('register/', RegisterView.as_view(), name='register'),
     path('profile/', ProfileView.as_view(), name='profile'),
+    path('dashboard/bootstrap/', DashboardBootstrapView.as_view(), name='dashboard_bootstrap'),
     path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    path('course-import/', CourseImportView.as_view(), name='course_import'),
-    path('learning-summary/send-weekly/', WeeklySummaryView.as_view(), name='weekly_summary'),
+    path('course-import/', course_import_view, name='course_import'),
+    path('learning-summary/send-weekly/', weekly_summary_view, name='weekly_summary'),
+    path('notes/search/', NoteSearchView.as_view(), name='note_search'),
     path('ai/resource-recommendations/', ResourceRecommendationView.as_view(), name='resource_recommendations'),
     path('ai/note-summarization/', NoteSummarizationView.as_view(), name='note_summarization'),
     path('', include(router.urls)),
@@ -1,20 +1,60 @@
+import asyncio
+import functools
+import hmac
 import logging
-from datetime import timedelta
+import string
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from urllib.parse import urlparse
 
 import requests
+from asgiref.sync import sync_to_async
 from bs4 import BeautifulSoup
 from django.conf import settings
 from django.core.mail import send_mail
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count
+from django.db.models.functions import Coalesce, Lower
+from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
 from rest_framework import status, viewsets
 from rest_framework.decorators import api_view
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    NotAuthenticated,
+    PermissionDenied,
+    Throttled,
+    ValidationError,
+)
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional async HTTP client
+    httpx = None
+
+from .authentication import CachedJWTAuthentication
+from .budget import ComputeBudget
+from .coalesce import coalesced, coalesced_async
+from .cohorts import learner_standing
+from .course_index import course_index, goal_query_terms
+from .dashboard import bootstrap_payload
+from .metrics import CONTENT_TYPE, ai_compute_seconds, collect, course_imports, render, weekly_summary_emails
 from .models import CourseResource, LearningActivity, LearningGoal
+from .note_summary import build_note_summary, cached_note_summary, current_data_version, store_note_summary
+from .response_cache import cached_response
+from .routers import ReplicaReadMixin
+from .search import search_notes
 from .serializers import (
     CourseImportSerializer,
     CourseResourceSerializer,
@@ -22,9 +62,16 @@ from .serializers import (
     LearningGoalSerializer,
     RegisterSerializer,
 )
+from .skills import suggest_next_skills
+from .throttling import IPTokenBucketThrottle, UserTokenBucketThrottle
 
 logger = logging.getLogger(__name__)
 
+COURSE_FETCH_TIMEOUT = 10
+ASYNC_FETCH_BACKENDS = ("threads", "httpx")
+# SQLite's lower() only folds ASCII, so search terms are folded the same way.
+ASCII_LOWERCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
 
 @api_view(["GET"])
 def hello_api(request):
@@ -35,8 +82,23 @@ def hello_api(request):
     return Response(data)
 
 
+@require_GET
+def metrics_view(request):
+    """Prometheus scrape endpoint; scrapers send METRICS_TOKEN as a bearer token, required outside DEBUG."""
+    token = getattr(settings, "METRICS_TOKEN", None)
+    if not token:
+        if settings.DEBUG:
+            return HttpResponse(render(collect()), content_type=CONTENT_TYPE)
+        return HttpResponse(status=403)
+    if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse(status=401)
+    return HttpResponse(render(collect()), content_type=CONTENT_TYPE)
+
+
 class RegisterView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = "register"
 
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
@@ -62,16 +124,75 @@ class ProfileView(APIView):
         )
 
 
-class LearningGoalViewSet(viewsets.ModelViewSet):
+class DashboardBootstrapView(ReplicaReadMixin, APIView):
+    """
+    Everything the dashboard needs on load in one response, replacing the
+    separate profile, goals and activities requests.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @cached_response("dashboard_bootstrap")
+    def get(self, request):
+        return Response(bootstrap_payload(request.user, {"request": request}))
+
+
+class LearningGoalViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     CRUD endpoints for the dashboard learning goals.
     """
 
     serializer_class = LearningGoalSerializer
     permission_classes = [IsAuthenticated]
+    choice_filters = {
+        "status": LearningGoal.Status.values,
+        "resource_type": LearningGoal.ResourceType.values,
+    }
+    ordering_fields = {"created_at", "updated_at", "skill_name", "hours_spent", "difficulty_rating", "status"}
+    default_ordering = "-created_at"
+
+    @cached_response("learning_goals")
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     def get_queryset(self):
-        return LearningGoal.objects.filter(owner=self.request.user).order_by("-created_at")
+        queryset = LearningGoal.objects.filter(owner=self.request.user)
+        if self.action != "list":
+            return queryset.order_by(self.default_ordering)
+        params = self.request.query_params
+
+        for field, choices in self.choice_filters.items():
+            value = params.get(field)
+            if value:
+                if value not in choices:
+                    raise ValidationError({field: f"Must be one of: {', '.join(choices)}."})
+                queryset = queryset.filter(**{field: value})
+
+        platform = params.get("platform")
+        if platform:
+            queryset = queryset.filter(platform=platform)
+
+        difficulty = params.get("difficulty_rating")
+        if difficulty:
+            # isdecimal() alone accepts non-ASCII digits such as "٣".
+            if not (difficulty.isascii() and difficulty.isdecimal()) or not 1 <= int(difficulty) <= 5:
+                raise ValidationError({"difficulty_rating": "Must be an integer between 1 and 5."})
+            queryset = queryset.filter(difficulty_rating=int(difficulty))
+
+        # Prefix search as a range on lower(skill_name) so it can use
+        # goal_owner_skill_lower_idx; LIKE 'x%' can't in SQLite. Only ASCII
+        # letters ignore case: "É" matches "École" but "é" does not.
+        search = params.get("search", "").strip().translate(ASCII_LOWERCASE)
+        if search:
+            queryset = queryset.alias(skill_key=Lower("skill_name")).filter(
+                skill_key__gte=search,
+                skill_key__lt=search + chr(0x10FFFF),
+            )
+
+        ordering = params.get("ordering", "")
+        if ordering.lstrip("-") not in self.ordering_fields:
+            ordering = self.default_ordering
+        return queryset.order_by(ordering)
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
@@ -87,8 +208,19 @@ class LearningGoalViewSet(viewsets.ModelViewSet):
         instance.delete()
 
 
-def _scrape_course_metadata(url: str) -> dict:
-    """Attempt to pull metadata from a course URL."""
+def _fallback_course_metadata(url: str) -> dict:
+    """Metadata for a course page that could not be fetched."""
+    parsed = urlparse(url)
+    return {
+        "title": url,
+        "description": "Unable to fetch course details automatically.",
+        "provider": parsed.netloc.replace("www.", ""),
+        "metadata": {},
+    }
+
+
+def _parse_course_metadata(url: str, html: str, content_type) -> dict:
+    """Pull title, description and provider out of a fetched course page."""
     metadata = {
         "title": "",
         "description": "",
@@ -96,18 +228,7 @@ def _scrape_course_metadata(url: str) -> dict:
         "metadata": {},
     }
 
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-    except Exception as exc:  # pragma: no cover - best effort
-        logger.warning("Failed to fetch course url %s: %s", url, exc)
-        metadata["title"] = url
-        metadata["description"] = "Unable to fetch course details automatically."
-        parsed = urlparse(url)
-        metadata["provider"] = parsed.netloc.replace("www.", "")
-        return metadata
-
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = BeautifulSoup(html, "html.parser")
 
     title = soup.find("meta", property="og:title")
     if title and title.get("content"):
@@ -126,14 +247,31 @@ def _scrape_course_metadata(url: str) -> dict:
 
     metadata["metadata"] = {
         "fetched_at": timezone.now().isoformat(),
-        "content_type": response.headers.get("Content-Type"),
+        "content_type": content_type,
     }
     return metadata
 
 
+def _scrape_course_metadata(url: str) -> dict:
+    """Attempt to pull metadata from a course URL."""
+    try:
+        response = requests.get(url, timeout=COURSE_FETCH_TIMEOUT)
+        response.raise_for_status()
+    except Exception as exc:  # pragma: no cover - best effort
+        logger.warning("Failed to fetch course url %s: %s", url, exc)
+        course_imports.inc(outcome="failed")
+        return _fallback_course_metadata(url)
+    course_imports.inc(outcome="fetched")
+    return _parse_course_metadata(url, response.text, response.headers.get("Content-Type"))
+
+
 class CourseImportView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    throttle_scope = "expensive"
+    throttle_cost = 2
 
+    @coalesced("course_import", on_shared=functools.partial(course_imports.inc, outcome="cached"))
     def post(self, request):
         serializer = CourseImportSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -144,16 +282,21 @@ class CourseImportView(APIView):
             url=url,
             defaults=metadata,
         )
+        course_index.upsert(course)
         output = CourseResourceSerializer(course)
         status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
         logger.info("Imported course %s (created=%s)", url, created)
         return Response(output.data, status=status_code)
 
 
-class LearningActivityViewSet(viewsets.ModelViewSet):
+class LearningActivityViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     serializer_class = LearningActivitySerializer
     permission_classes = [IsAuthenticated]
 
+    @cached_response("learning_activities")
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_queryset(self):
         queryset = LearningActivity.objects.select_related("goal", "goal__owner").filter(
             goal__owner=self.request.user
@@ -232,8 +375,92 @@ class LearningActivityViewSet(viewsets.ModelViewSet):
             goal.save(update_fields=['notes', 'updated_at'])
 
 
+class NoteSearchView(ReplicaReadMixin, APIView):
+    """
+    Ranked full-text search over the user's goal and activity notes.
+    Paginate by passing the returned `next_cursor` back as `cursor`.
+    """
+    permission_classes = [IsAuthenticated]
+    max_limit = 50
+
+    @cached_response("note_search")
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"error": "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get("limit", 20)), 1), self.max_limit)
+        except ValueError:
+            return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results, next_cursor = search_notes(request.user, query, request.query_params.get("cursor"), limit)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"results": results, "next_cursor": next_cursor}, status=status.HTTP_200_OK)
+
+
+def _parse_send_email_flag(send_email_raw) -> bool:
+    if isinstance(send_email_raw, bool):
+        return send_email_raw
+    if isinstance(send_email_raw, str):
+        return send_email_raw.lower() in {"1", "true", "yes", "on"}
+    if isinstance(send_email_raw, int):
+        return send_email_raw == 1
+    return False
+
+
+def _deliver_weekly_summary(user, summary):
+    """Email `summary` to the user when they asked for it (blocking SMTP)."""
+    target_email = user.email or ''
+    send_email_flag = summary["email_requested"]
+    if send_email_flag and target_email:
+        subject = "Skillstack Weekly Learning Summary"
+        body_lines = [
+            f"Hi {user.username or 'there'},",
+            "",
+            "Here is your Skillstack summary for the last 7 days:",
+            f"- Goals updated: {summary['goals_updated']}",
+            f"- Activities logged: {summary['activities_logged']}",
+            f"- Total hours logged: {summary['hours_logged']}h",
+        ]
+        if summary["recent_goals"]:
+            body_lines.append("")
+            body_lines.append("Recent updates:")
+            for goal in summary["recent_goals"]:
+                platform = f" on {goal['platform']}" if goal["platform"] else ""
+                body_lines.append(f"• {goal['skill_name']} — {goal['status']}{platform}")
+        body_lines.extend(
+            [
+                "",
+                "Keep learning!",
+                "— Skillstack",
+            ]
+        )
+        email_body = "\n".join(body_lines)
+
+        try:
+            send_mail(
+                subject=subject,
+                message=email_body,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                recipient_list=[target_email],
+                fail_silently=False,
+            )
+            logger.info("Weekly summary email sent to %s", target_email)
+            weekly_summary_emails.inc(outcome="sent")
+        except Exception as exc:  # pragma: no cover
+            logger.exception("Failed to send weekly summary email to %s: %s", target_email, exc)
+            weekly_summary_emails.inc(outcome="failed")
+    elif send_email_flag:
+        logger.warning("Weekly summary email skipped: user %s has no email.", user.id)
+
+
 class WeeklySummaryView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    throttle_scope = "expensive"
+    throttle_cost = 5
 
     def post(self, request):
         now = timezone.now()
@@ -245,15 +472,7 @@ class WeeklySummaryView(APIView):
         )
 
         target_email = request.user.email or ''
-        send_email_raw = request.data.get("send_email", False)
-        if isinstance(send_email_raw, bool):
-            send_email_flag = send_email_raw
-        elif isinstance(send_email_raw, str):
-            send_email_flag = send_email_raw.lower() in {"1", "true", "yes", "on"}
-        elif isinstance(send_email_raw, int):
-            send_email_flag = send_email_raw == 1
-        else:
-            send_email_flag = False
+        send_email_flag = _parse_send_email_flag(request.data.get("send_email", False))
 
         summary = {
             "generated_at": now.isoformat(),
@@ -272,60 +491,207 @@ class WeeklySummaryView(APIView):
             ],
         }
 
-        if send_email_flag and target_email:
-            subject = "Skillstack Weekly Learning Summary"
-            body_lines = [
-                f"Hi {request.user.username or 'there'},",
-                "",
-                "Here is your Skillstack summary for the last 7 days:",
-                f"- Goals updated: {summary['goals_updated']}",
-                f"- Activities logged: {summary['activities_logged']}",
-                f"- Total hours logged: {summary['hours_logged']}h",
-            ]
-            if summary["recent_goals"]:
-                body_lines.append("")
-                body_lines.append("Recent updates:")
-                for goal in summary["recent_goals"]:
-                    platform = f" on {goal['platform']}" if goal["platform"] else ""
-                    body_lines.append(f"• {goal['skill_name']} — {goal['status']}{platform}")
-            body_lines.extend(
-                [
-                    "",
-                    "Keep learning!",
-                    "— Skillstack",
-                ]
-            )
-            email_body = "\n".join(body_lines)
-
-            try:
-                send_mail(
-                    subject=subject,
-                    message=email_body,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[target_email],
-                    fail_silently=False,
-                )
-                logger.info("Weekly summary email sent to %s", target_email)
-            except Exception as exc:  # pragma: no cover
-                logger.exception("Failed to send weekly summary email to %s: %s", target_email, exc)
-        elif send_email_flag:
-            logger.warning("Weekly summary email skipped: user %s has no email.", request.user.id)
+        _deliver_weekly_summary(request.user, summary)
 
         logger.info("Weekly learning summary payload: %s", summary)
 
         return Response(summary, status=status.HTTP_200_OK)
 
 
-class ResourceRecommendationView(APIView):
+class AsyncAPIView(View):
+    """
+    Async counterpart of APIView for I/O-bound endpoints served under ASGI.
+
+    Runs JWT authentication, the IsAuthenticated check and `throttle_classes`
+    (in a worker thread, as they may touch the database), then awaits the
+    handler with a DRF Request so `request.data` and `request.user` work as
+    usual. Handlers return JsonResponse.
+    """
+
+    throttle_classes = ()
+    throttle_scope = None
+    throttle_cost = 1
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Token-authenticated like APIView, so no CSRF cookie check.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request, parsers=[JSONParser()], authenticators=[CachedJWTAuthentication()])
+        try:
+            await sync_to_async(self.check_request)(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            auth_header = None
+            if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+                # As APIView.handle_exception: challenge with the first
+                # authenticator's scheme, or fall back to 403 without one.
+                auth_header = request.authenticators[0].authenticate_header(request)
+                if not auth_header:
+                    exc.status_code = status.HTTP_403_FORBIDDEN
+            response = JsonResponse({"detail": exc.detail}, status=exc.status_code)
+            if auth_header:
+                response["WWW-Authenticate"] = auth_header
+            if isinstance(exc, Throttled) and exc.wait is not None:
+                response["Retry-After"] = str(exc.wait)
+            return response
+
+    def check_request(self, request):
+        if not request.user or not request.user.is_authenticated:
+            raise NotAuthenticated()
+        for throttle_class in self.throttle_classes:
+            throttle = throttle_class()
+            if not throttle.allow_request(request, self):
+                raise Throttled(throttle.wait())
+
+
+_fetch_executor = None
+_fetch_executor_lock = threading.Lock()
+_http_clients = weakref.WeakKeyDictionary()
+
+
+def _blocking_fetch(url):
+    global _fetch_executor
+    # Blocking requests calls run on a dedicated pool sized for many slow
+    # upstreams, not on the loop's small default executor.
+    with _fetch_executor_lock:
+        if _fetch_executor is None:
+            _fetch_executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "ASYNC_FETCH_CONCURRENCY", 128), thread_name_prefix="course-fetch"
+            )
+    fetch = functools.partial(requests.get, url, timeout=COURSE_FETCH_TIMEOUT)
+    return asyncio.get_running_loop().run_in_executor(_fetch_executor, fetch)
+
+
+def _http_client():
+    # One pooled client per event loop; building one per request would redo
+    # the TLS context setup on the loop every time.
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None:
+        limit = getattr(settings, "ASYNC_FETCH_CONCURRENCY", 128)
+        client = _http_clients[loop] = httpx.AsyncClient(
+            timeout=COURSE_FETCH_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit),
+        )
+    return client
+
+
+def _use_httpx():
+    backend = getattr(settings, "ASYNC_FETCH_BACKEND", "threads")
+    if backend not in ASYNC_FETCH_BACKENDS:
+        raise ValueError(f"Unknown async fetch backend: {backend!r}")
+    return backend == "httpx" and httpx is not None
+
+
+async def _scrape_course_metadata_async(url: str) -> dict:
+    """_scrape_course_metadata without blocking the event loop on the network."""
+    try:
+        if _use_httpx():
+            response = await _http_client().get(url)
+        else:
+            response = await _blocking_fetch(url)
+        response.raise_for_status()
+    except Exception as exc:  # pragma: no cover - best effort
+        logger.warning("Failed to fetch course url %s: %s", url, exc)
+        course_imports.inc(outcome="failed")
+        return _fallback_course_metadata(url)
+    course_imports.inc(outcome="fetched")
+    return _parse_course_metadata(url, response.text, response.headers.get("Content-Type"))
+
+
+class AsyncCourseImportView(AsyncAPIView):
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    throttle_scope = "expensive"
+    throttle_cost = 2
+
+    @coalesced_async("course_import", on_shared=functools.partial(course_imports.inc, outcome="cached"))
+    async def post(self, request):
+        serializer = CourseImportSerializer(data=request.data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        url = serializer.validated_data["url"]
+
+        metadata = await _scrape_course_metadata_async(url)
+        course, created = await CourseResource.objects.aupdate_or_create(
+            url=url,
+            defaults=metadata,
+        )
+        course_index.upsert(course)
+        output = CourseResourceSerializer(course)
+        status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        logger.info("Imported course %s (created=%s)", url, created)
+        return JsonResponse(output.data, status=status_code, encoder=DjangoJSONEncoder)
+
+
+class AsyncWeeklySummaryView(AsyncAPIView):
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    throttle_scope = "expensive"
+    throttle_cost = 5
+
+    async def post(self, request):
+        now = timezone.now()
+        start = now - timedelta(days=7)
+        user = request.user
+
+        recent_goals = LearningGoal.objects.filter(updated_at__gte=start, owner=user)
+        recent_activities = LearningActivity.objects.filter(performed_on__gte=start.date(), goal__owner=user)
+
+        target_email = user.email or ''
+        send_email_flag = _parse_send_email_flag(request.data.get("send_email", False))
+
+        # Summed in Python like the sync view, so hours match it exactly.
+        hours = [hours async for hours in recent_activities.values_list("hours_spent", flat=True)]
+        summary = {
+            "generated_at": now.isoformat(),
+            "goals_updated": await recent_goals.acount(),
+            "activities_logged": len(hours),
+            "hours_logged": float(sum(hours)),
+            "sent_to": target_email or "not-configured",
+            "email_requested": send_email_flag,
+            "recent_goals": [
+                {
+                    "skill_name": goal.skill_name,
+                    "status": goal.status,
+                    "platform": goal.platform,
+                }
+                async for goal in recent_goals[:10]
+            ],
+        }
+
+        # SMTP is blocking; keep it off the event loop.
+        await asyncio.to_thread(_deliver_weekly_summary, user, summary)
+
+        logger.info("Weekly learning summary payload: %s", summary)
+
+        return JsonResponse(summary, status=status.HTTP_200_OK)
+
+
+class ResourceRecommendationView(ReplicaReadMixin, APIView):
     """
     AI-powered endpoint that analyzes user's learning history and recommends
     resources based on skills, platforms, and completion patterns.
     """
     permission_classes = [IsAuthenticated]
-
+    # Read-only analysis; the POST only carries options.
+    replica_methods = ("POST",)
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    throttle_scope = "expensive"
+    throttle_cost = 2
+
+    @cached_response("resource_recommendations")
+    @coalesced("resource_recommendations")
     def post(self, request):
-        user = request.user
-        
+        try:
+            budget = ComputeBudget.for_request(request, "resource_recommendations")
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        with ai_compute_seconds.time(endpoint="resource_recommendations"):
+            return self._recommend(request.user, budget)
+
+    def _recommend(self, user, budget):
         # Get all user's learning goals
         goals = LearningGoal.objects.filter(owner=user).order_by('-created_at')
         activities = LearningActivity.objects.filter(goal__owner=user)
@@ -346,11 +712,17 @@ class ResourceRecommendationView(APIView):
         resource_types = {}
         completion_status = {}
         
+        # Track skills, grouped on the canonical skill id
+        skill_counts = (
+            goals.order_by()
+            .values("skill_id")
+            .annotate(name=Coalesce("skill__name", "skill_name"), count=Count("id"))
+            .order_by("-count", "name")
+        )
+        for row in skill_counts:
+            skill_frequencies[row["name"]] = skill_frequencies.get(row["name"], 0) + row["count"]
+        
         for goal in goals:
-            # Track skills
-            skill = goal.skill_name
-            skill_frequencies[skill] = skill_frequencies.get(skill, 0) + 1
-            
             # Track platforms
             platform = goal.platform or "Other"
             platform_preferences[platform] = platform_preferences.get(platform, 0) + 1
@@ -456,11 +828,58 @@ class ResourceRecommendationView(APIView):
                 "priority": "medium"
             })
         
+        # Recommendations 7-9 are optional stages, skipped once the budget runs out
+        # Recommendation 7: Skills other learners picked up alongside yours
+        next_skills = suggest_next_skills(skill_frequencies.keys()) if budget.allows("next_skills") else []
+        if next_skills:
+            recommendations.append({
+                "type": "next_skills",
+                "title": "Learners Like You Also Studied",
+                "description": f"People who learned {', '.join([s[0] for s in top_skills])} often went on to {', '.join(next_skills[:3])}.",
+                "suggested_skills": next_skills,
+                "icon": "🧭",
+                "priority": "medium"
+            })
+        
+        # Recommendation 8: Concrete courses from the imported catalog
+        matched_courses = []
+        if budget.allows("catalog_courses"):
+            course_index.refresh()
+            matched_courses = course_index.search(goal_query_terms(goals), limit=5)
+        if matched_courses:
+            recommendations.append({
+                "type": "catalog_courses",
+                "title": "Courses Matched to Your Goals",
+                "description": f"These {len(matched_courses)} imported courses best match your skills and notes.",
+                "courses": matched_courses,
+                "icon": "🔎",
+                "priority": "high"
+            })
+        
+        # Recommendation 9: Standing against other learners (precomputed quantiles)
+        cohort = learner_standing(user) if budget.allows("cohort_standing") else {}
+        standing_notes = []
+        if cohort.get("weekly_hours", {}).get("percentile", 0) >= 50:
+            standing_notes.append(f"you're in the top {max(1, 100 - cohort['weekly_hours']['percentile'])}% of weekly hours")
+        if cohort.get("completion_rate", {}).get("percentile", 0) >= 50:
+            standing_notes.append(f"your completion rate beats {cohort['completion_rate']['percentile']}% of learners")
+        if standing_notes:
+            recommendations.append({
+                "type": "cohort_standing",
+                "title": "How You Compare",
+                "description": f"Nice work: {' and '.join(standing_notes)}.",
+                "cohort": cohort,
+                "icon": "🏆",
+                "priority": "low"
+            })
+        
         logger.info("Generated %d recommendations for user %s", len(recommendations), user.id)
         
         return Response(
             {
                 "success": True,
+                "partial": budget.exhausted,
+                "skipped_stages": budget.skipped,
                 "recommendations": recommendations,
                 "analysis": {
                     "total_goals": goals.count(),
@@ -470,393 +889,82 @@ class ResourceRecommendationView(APIView):
                     "preferred_platform": best_platform[0] if best_platform else "None",
                     "completion_rate": round(completion_rate, 1),
                     "resource_type_diversity": len(resource_types),
-                    "skill_breakdown": skill_frequencies
+                    "skill_breakdown": skill_frequencies,
+                    "cohort": cohort
                 }
             },
             status=status.HTTP_200_OK
         )
 
 
-class NoteSummarizationView(APIView):
+class NoteSummarizationView(ReplicaReadMixin, APIView):
     """
     AI-powered endpoint that summarizes learning notes from activities
     and goal notes to create concise key takeaways and important points.
     """
     permission_classes = [IsAuthenticated]
-
-    def _extract_main_and_activity_notes(self, goal_notes):
-        """
-        Parse goal notes to separate main notes from activity notes.
-        Activity notes follow pattern: [YYYY-MM-DD HH:MM] note_text
-        """
-        if not goal_notes or not goal_notes.strip():
-            return "", []
-        
-        import re
-        lines = goal_notes.split('\n')
-        main_notes = []
-        activity_entries = []
-        
-        timestamp_pattern = r'^\[\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}\]'
-        
-        for line in lines:
-            if line.strip():
-                if re.match(timestamp_pattern, line.strip()):
-                    # Activity note with timestamp
-                    match = re.search(r'^\[([^\]]+)\]\s*(.*)', line.strip())
-                    if match:
-                        timestamp = match.group(1)
-                        note_text = match.group(2)
-                        activity_entries.append({
-                            "timestamp": timestamp,
-                            "text": note_text
-                        })
-                else:
-                    # Main note
-                    main_notes.append(line)
-        
-        main_notes_text = '\n'.join(main_notes).strip()
-        return main_notes_text, activity_entries
-
-    def _generate_concise_summary(self, text, skill_name=""):
-        """Generate a short, meaningful summary from notes (2-3 sentences max)."""
-        if not text or not text.strip():
-            return "No notes available for summarization."
-        
-        sentences = []
-        # Split by periods, exclamation marks, and question marks
-        import re
-        raw_sentences = re.split(r'[.!?]\s+', text.strip())
-        
-        # Clean and filter sentences
-        for sent in raw_sentences:
-            sent = sent.strip()
-            if sent and len(sent) > 10:  # Minimum sentence length
-                sentences.append(sent)
-        
-        if not sentences:
-            return text[:150] + "..." if len(text) > 150 else text
-        
-        # Strategy: Select 1-3 most informative sentences
-        # Prioritize sentences with action verbs and specific content
-        action_verbs = ['learned', 'completed', 'understood', 'mastered', 'implemented', 
-                       'fixed', 'solved', 'created', 'built', 'deployed', 'optimized',
-                       'discovered', 'integrated', 'configured', 'practiced', 'improved', 'enhanced']
-        
-        scored_sentences = []
-        for sent in sentences:
-            score = 0
-            sent_lower = sent.lower()
-            
-            # Boost score if contains action verbs
-            for verb in action_verbs:
-                if verb in sent_lower:
-                    score += 2
-            
-            # Boost score for sentences with specific terms or numbers
-            if any(char.isdigit() for char in sent):
-                score += 1
-            
-            # Boost score for longer sentences (more content)
-            score += len(sent.split()) / 10
-            
-            scored_sentences.append((score, sent))
-        
-        # Sort by score and take top 2-3 sentences
-        sorted_sentences = sorted(scored_sentences, key=lambda x: x[0], reverse=True)
-        
-        # Take top sentences (max 3, minimum 1)
-        num_sentences = min(3, max(1, len(sentences) // 4 + 1))
-        top_sentences = sorted_sentences[:num_sentences]
-        
-        # Sort by original order
-        top_sentences_ordered = sorted(
-            top_sentences, 
-            key=lambda x: sentences.index(x[1])
-        )
-        
-        # Join and create summary
-        summary = ". ".join([sent[1] for sent in top_sentences_ordered])
-        if not summary.endswith(('.', '!', '?')):
-            summary += "."
-        
-        return summary
-
-    def _analyze_text_content(self, text):
-        """Extract themes, concepts, and learning points from text."""
-        if not text or not text.strip():
-            return {"themes": [], "concepts": [], "sentiment": "neutral"}
-        
-        text_lower = text.lower()
-        
-        # Learning concepts based on keywords
-        concepts = []
-        concept_keywords = {
-            "fundamentals": ["basic", "foundation", "concept", "theory", "principle"],
-            "practical": ["implement", "build", "create", "code", "practice", "exercise"],
-            "problem-solving": ["fix", "debug", "solve", "issue", "error", "bug"],
-            "optimization": ["optimize", "improve", "enhance", "performance", "efficiency"],
-            "integration": ["integrate", "connect", "link", "API", "database", "external"],
-            "testing": ["test", "unit", "integration", "validation", "verify"],
-            "deployment": ["deploy", "production", "release", "live", "production"],
-        }
-        
-        for concept, keywords in concept_keywords.items():
-            if any(kw in text_lower for kw in keywords):
-                concepts.append(concept)
-        
-        # Extract important phrases (capitalized or quoted)
-        important_phrases = []
-        words = text.split()
-        for i, word in enumerate(words):
-            if len(word) > 3 and word[0].isupper():
-                important_phrases.append(word.rstrip('.,!?;:'))
-        
-        return {
-            "themes": concepts[:5],
-            "key_phrases": list(set(important_phrases))[:5],
-            "word_count": len(text.split()),
-            "content_length": "comprehensive" if len(text.split()) > 100 else "moderate" if len(text.split()) > 30 else "brief"
-        }
-
+    # Reads for analysis; the summary cache write still goes to the primary.
+    replica_methods = ("POST",)
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    throttle_scope = "expensive"
+    throttle_cost = 2
+    chunk_size = 500
+
+    @staticmethod
+    def _parse_date(value, field):
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(str(value))
+        except ValueError:
+            raise ValueError(f"{field} must be a date in YYYY-MM-DD format.")
+
+    @staticmethod
+    def _parse_limit(value):
+        if value in (None, ""):
+            return None
+        try:
+            limit = int(value)
+        except (TypeError, ValueError):
+            limit = 0
+        if limit < 1:
+            raise ValueError("limit must be a positive integer.")
+        return limit
+
+    @cached_response("note_summarization")
+    @coalesced("note_summarization")
     def post(self, request):
         user = request.user
         goal_id = request.data.get("goal_id")
-        
-        # Get activities for specific goal or all goals
+        try:
+            since = self._parse_date(request.data.get("since"), "since")
+            until = self._parse_date(request.data.get("until"), "until")
+            limit = self._parse_limit(request.data.get("limit"))
+            budget = ComputeBudget.for_request(request, "note_summarization")
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        goal = None
         if goal_id:
-            activities = LearningActivity.objects.filter(goal_id=goal_id, goal__owner=user)
             goal = LearningGoal.objects.filter(id=goal_id, owner=user).first()
             if not goal:
                 return Response(
                     {"error": "Goal not found or permission denied"},
                     status=status.HTTP_404_NOT_FOUND
                 )
-        else:
-            activities = LearningActivity.objects.filter(goal__owner=user).order_by('-performed_on')
-            goal = None
         
-        if not activities.exists() and (not goal or not goal.notes):
-            return Response(
-                {
-                    "success": False,
-                    "message": "No learning activities or notes found. Start logging activities and adding notes!",
-                    "summary": {},
-                    "key_points": []
-                },
-                status=status.HTTP_200_OK
+        # Unwindowed summaries are precomputed; serve them while still current
+        windowed = since or until or limit
+        if not windowed:
+            version = current_data_version(user.id)
+            cached = cached_note_summary(user.id, goal, version)
+            if cached is not None:
+                return Response(cached, status=status.HTTP_200_OK)
+        
+        with ai_compute_seconds.time(endpoint="note_summarization"):
+            payload = build_note_summary(
+                user, goal=goal, since=since, until=until, limit=limit, chunk_size=self.chunk_size, budget=budget
             )
-        
-        # Aggregate notes with enhanced analysis
-        all_notes = []
-        date_range = {
-            "earliest": None,
-            "latest": None,
-            "duration_days": 0
-        }
-        
-        for activity in activities:
-            if activity.notes:
-                all_notes.append({
-                    "date": activity.performed_on.isoformat(),
-                    "hours": float(activity.hours_spent),
-                    "notes": activity.notes,
-                    "goal": activity.goal.skill_name,
-                    "goal_id": activity.goal.id
-                })
-            
-            # Keep as date objects for comparison
-            if not date_range["latest"] or activity.performed_on > date_range["latest"]:
-                date_range["latest"] = activity.performed_on
-            if not date_range["earliest"] or activity.performed_on < date_range["earliest"]:
-                date_range["earliest"] = activity.performed_on
-        
-        # Calculate duration and convert to ISO format for response
-        if date_range["earliest"] and date_range["latest"]:
-            date_range["duration_days"] = (date_range["latest"] - date_range["earliest"]).days
-            # Convert to ISO format for API response
-            date_range["earliest"] = date_range["earliest"].isoformat()
-            date_range["latest"] = date_range["latest"].isoformat()
-        else:
-            # Ensure ISO format if they're still None
-            date_range["earliest"] = None
-            date_range["latest"] = None
-        
-        # Parse goal notes if available
-        goal_main_notes = ""
-        goal_activity_entries = []
-        goal_notes_analysis = None
-        combined_notes_text = ""
-        
-        if goal and goal.notes:
-            goal_main_notes, goal_activity_entries = self._extract_main_and_activity_notes(goal.notes)
-            # Combine main notes with all activity entries for comprehensive analysis
-            combined_parts = [goal_main_notes]
-            for entry in goal_activity_entries:
-                combined_parts.append(entry["text"])
-            combined_notes_text = " ".join(combined_parts)
-            # Analyze the combined text
-            goal_notes_analysis = self._analyze_text_content(combined_notes_text)
-        
-        # Also combine with activity notes from database for topic extraction
-        all_activity_notes_text = " ".join([a["notes"] for a in all_notes])
-        combined_all_text = f"{combined_notes_text} {all_activity_notes_text}"
-        
-        # Create summary based on keywords and patterns from BOTH goal notes and activity notes
-        key_points = []
-        topics_mentioned = {}
-        total_hours = sum(a["hours"] for a in all_notes) if all_notes else 0
-        
-        # Combine all text sources for comprehensive analysis
-        all_text_sources = []
-        
-        # Add goal main notes and activity entries
-        if goal_main_notes:
-            all_text_sources.append(goal_main_notes)
-        for entry in goal_activity_entries:
-            all_text_sources.append(entry["text"])
-        # Add all activity notes from database
-        for note_item in all_notes:
-            all_text_sources.append(note_item["notes"])
-        
-        combined_text = " ".join(all_text_sources)
-        
-        # Extract key points from ALL sources with improved logic
-        action_keywords = ['learned', 'completed', 'understood', 'mastered', 'implemented', 
-                          'fixed', 'solved', 'created', 'built', 'deployed', 'optimized',
-                          'discovered', 'integrated', 'configured', 'practiced', 'improved', 'enhanced']
-        
-        # Extract from goal notes entries
-        for entry in goal_activity_entries:
-            entry_text = entry["text"].lower()
-            for keyword in action_keywords:
-                if keyword in entry_text:
-                    key_points.append({
-                        "date": entry["timestamp"],
-                        "content": entry["text"][:150],
-                        "hours": 0,
-                        "skill": "Goal Context"
-                    })
-                    break
-        
-        # Extract from activity notes
-        for note_item in all_notes:
-            notes_text = note_item["notes"].lower()
-            
-            # Simple keyword extraction
-            for keyword in action_keywords:
-                if keyword in notes_text:
-                    # Add complete sentence or note
-                    key_points.append({
-                        "date": note_item["date"],
-                        "content": note_item["notes"][:150],
-                        "hours": note_item["hours"],
-                        "skill": note_item["goal"]
-                    })
-                    break
-            
-            # Topic extraction from activity notes
-            words = note_item['notes'].split()
-            for word in words:
-                # Filter meaningful words (length > 4, skip common words)
-                if len(word) > 4 and word.lower() not in ['this', 'that', 'with', 'from', 'into', 'have', 'about', 'where', 'which']:
-                    clean_word = word.strip('.,!?;:').lower()
-                    if clean_word and len(clean_word) > 3:
-                        topics_mentioned[clean_word] = topics_mentioned.get(clean_word, 0) + 1
-        
-        # Also extract topics from goal notes and activity entries
-        words_from_combined = combined_text.split()
-        for word in words_from_combined:
-            if len(word) > 4 and word.lower() not in ['this', 'that', 'with', 'from', 'into', 'have', 'about', 'where', 'which', 'there', 'would', 'could', 'should', 'been', 'more']:
-                clean_word = word.strip('.,!?;:').lower()
-                if clean_word and len(clean_word) > 3 and not clean_word.endswith('ing'):
-                    topics_mentioned[clean_word] = topics_mentioned.get(clean_word, 0) + 1
-        
-        # Get top topics
-        top_topics = sorted(topics_mentioned.items(), key=lambda x: x[1], reverse=True)[:6]
-        topics = [t[0] for t in top_topics]
-        
-        # Skill-specific summaries with comprehensive note analysis
-        skill_summaries = {}
-        for activity in activities:
-            goal_name = activity.goal.skill_name
-            if goal_name not in skill_summaries:
-                skill_summaries[goal_name] = {
-                    "total_hours": 0,
-                    "sessions": 0,
-                    "key_notes": [],
-                    "goal_id": activity.goal.id,
-                    "status": activity.goal.status,
-                    "main_notes": "",
-                    "notes_analysis": None
-                }
-            skill_summaries[goal_name]["total_hours"] += float(activity.hours_spent)
-            skill_summaries[goal_name]["sessions"] += 1
-            if activity.notes:
-                skill_summaries[goal_name]["key_notes"].append(activity.notes[:80])
-            
-            # Add comprehensive notes analysis for this goal
-            if activity.goal.notes:
-                goal_main, goal_activities = self._extract_main_and_activity_notes(activity.goal.notes)
-                # Combine main notes with activity entries
-                all_goal_notes_parts = [goal_main]
-                for gentry in goal_activities:
-                    all_goal_notes_parts.append(gentry["text"])
-                combined_goal_text = " ".join(all_goal_notes_parts)
-                
-                if goal_main:
-                    skill_summaries[goal_name]["main_notes"] = goal_main[:200]
-                # Analyze combined notes
-                skill_summaries[goal_name]["notes_analysis"] = self._analyze_text_content(combined_goal_text)
-        
-        # Generate meaningful summary text
-        summary_text = ""
-        if goal:
-            summary_text = f"Learning Summary for {goal.skill_name}"
-        else:
-            summary_text = "Overall Learning Summary"
-            if len(skill_summaries) > 0:
-                top_skill = max(skill_summaries.items(), key=lambda x: x[1]["total_hours"])[0]
-                summary_text += f" (Focus: {top_skill})"
-        
-        # Generate concise summary from combined notes
-        concise_summary = self._generate_concise_summary(combined_text, goal.skill_name if goal else "Learning")
-        
-        # Create AI-powered summary combining all sources
-        ai_summary = {
-            "title": summary_text,
-            "concise_summary": concise_summary,  # Add short 2-3 sentence summary
-            "period": date_range,
-            "total_hours_spent": round(total_hours, 2),
-            "total_sessions": len(all_notes),
-            "average_hours_per_session": round(total_hours / len(all_notes), 2) if all_notes else 0,
-            "main_topics": topics,
-            "key_learnings": key_points[:8],
-            "by_skill": skill_summaries if not goal else None,
-            "learning_intensity": "high" if total_hours > 20 else "medium" if total_hours > 10 else "low",
-            "goal_context": {
-                "has_main_notes": bool(goal_main_notes),
-                "main_notes_preview": goal_main_notes[:200] if goal_main_notes else None,
-                "notes_analysis": goal_notes_analysis
-            } if goal else None
-        }
-        
-        logger.info("Generated comprehensive summary for user %s with %d activities", user.id, len(all_notes))
-        
-        return Response(
-            {
-                "success": True,
-                "summary": ai_summary,
-                "key_points": key_points[:12],
-                "topics_covered": topics,
-                "detailed_notes": all_notes[:25],
-                "notes_count": len(all_notes),
-                "words_analyzed": sum(len(note["notes"].split()) for note in all_notes),
-                "goal_notes": {
-                    "main_notes": goal_main_notes,
-                    "activity_entries": goal_activity_entries,
-                    "analysis": goal_notes_analysis
-                } if goal else None
-            },
-            status=status.HTTP_200_OK
-        )
\ No newline at end of file
+        if not windowed and not payload["partial"]:
+            store_note_summary(user.id, goal, version, payload)
+        return Response(payload, status=status.HTTP_200_OK)
@@ -5,7 +5,7 @@ import { useTheme } from '../themeContext'
 const AI_RECOMMENDATIONS_URL = 'http://127.0.0.1:8000/mainapp/ai/resource-recommendations/'
 const AI_SUMMARIZATION_URL = 'http://127.0.0.1:8000/mainapp/ai/note-summarization/'
 const LEARNING_GOALS_URL = 'http://127.0.0.1:8000/mainapp/learning-goals/'
-const PROFILE_URL = 'http://127.0.0.1:8000/mainapp/profile/'
+const BOOTSTRAP_URL = 'http://127.0.0.1:8000/mainapp/dashboard/bootstrap/'
 
 function getAuthHeaders(includeJson = false) {
 	const headers = {}
@@ -88,39 +88,36 @@ export default function AIFeatures() {
 			setLoading(true)
 			setError('')
 
-			// Load profile
+			// Profile and goals come from the single dashboard bootstrap request
 			try {
-				const profileResponse = await fetch(PROFILE_URL, {
+				const response = await fetch(BOOTSTRAP_URL, {
 					headers: getAuthHeaders()
 				})
-				const profileData = await readJsonSafely(profileResponse)
-				if (!profileResponse.ok) {
-					if (handleAuthError(profileResponse, profileData)) return
-					throw new Error('Failed to load profile')
+				const data = await readJsonSafely(response)
+				if (!response.ok) {
+					if (handleAuthError(response, data)) return
+					throw new Error('Failed to load learning goals')
 				}
-				if (isMounted) {
-					setProfile({
-						username: profileData?.username || '',
-						email: profileData?.email || ''
+				let goalsData = Array.isArray(data?.goals) ? data.goals : []
+				if (data?.has_more_goals) {
+					// Only the first page is bootstrapped; fetch the rest for the picker
+					const goalsResponse = await fetch(LEARNING_GOALS_URL, {
+						headers: getAuthHeaders()
 					})
-				}
-			} catch (err) {
-				console.warn('Profile load error:', err)
-			}
-
-			// Load goals
-			try {
-				const goalsResponse = await fetch(LEARNING_GOALS_URL, {
-					headers: getAuthHeaders()
-				})
-				const goalsData = await readJsonSafely(goalsResponse)
-				if (!goalsResponse.ok) {
-					if (handleAuthError(goalsResponse, goalsData)) return
-					throw new Error('Failed to load goals')
+					const allGoals = await readJsonSafely(goalsResponse)
+					if (!goalsResponse.ok) {
+						if (handleAuthError(goalsResponse, allGoals)) return
+						throw new Error('Failed to load goals')
+					}
+					goalsData = Array.isArray(allGoals) ? allGoals : goalsData
 				}
 				if (isMounted) {
-					setGoals(Array.isArray(goalsData) ? goalsData : [])
-					if (goalsData && goalsData.length > 0) {
+					setProfile({
+						username: data?.profile?.username || '',
+						email: data?.profile?.email || ''
+					})
+					setGoals(goalsData)
+					if (goalsData.length > 0) {
 						setSelectedGoalId(goalsData[0].id)
 					}
 				}
@@ -528,6 +525,18 @@ export default function AIFeatures() {
 													</div>
 												</div>
 											)}
+											{rec.courses && rec.courses.length > 0 && (
+												<div style={{ marginTop: '12px' }}>
+													<strong style={{ color: palette.textPrimary }}>Courses:</strong>
+													<div style={{ marginTop: '8px' }}>
+														{rec.courses.map((course) => (
+															<a key={course.id} href={course.url} target="_blank" rel="noreferrer" style={styles.topicTag}>
+																{course.title}
+															</a>
+														))}
+													</div>
+												</div>
+											)}
 										</div>
 									))}
 								</div>
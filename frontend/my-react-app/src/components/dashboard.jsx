@@ -6,7 +6,7 @@ const API_BASE_URL = 'http://127.0.0.1:8000/mainapp/learning-goals/'
 const COURSE_IMPORT_URL = 'http://127.0.0.1:8000/mainapp/course-import/'
 const LEARNING_ACTIVITIES_URL = 'http://127.0.0.1:8000/mainapp/learning-activities/'
 const WEEKLY_SUMMARY_URL = 'http://127.0.0.1:8000/mainapp/learning-summary/send-weekly/'
-const PROFILE_URL = 'http://127.0.0.1:8000/mainapp/profile/'
+const BOOTSTRAP_URL = 'http://127.0.0.1:8000/mainapp/dashboard/bootstrap/'
 
 const RESOURCE_OPTIONS = [
 	{ value: 'video', label: 'Video' },
@@ -330,41 +330,29 @@ export default function Dashboard() {
 	useEffect(() => {
 		let isMounted = true
 
-		async function loadGoals() {
-			setLoadingGoals(true)
-			try {
-				const response = await fetch(API_BASE_URL, {
-					headers: getAuthHeaders()
-				})
-				const data = await readJsonSafely(response)
-				if (!response.ok) {
-					if (handleAuthError(response, data)) return
-					const message =
-						(typeof data === 'string' && data) ||
-						data?.detail ||
-						'Failed to load goals.'
-					throw new Error(message)
-				}
-				if (isMounted) {
-					const mappedGoals = Array.isArray(data) ? data.map(mapApiGoalToState) : []
-					setGoals(mappedGoals)
-					setApiError('')
-				}
-			} catch (error) {
-				if (isMounted) {
-					setApiError(error.message || 'Unable to load goals.')
-				}
-			} finally {
-				if (isMounted) {
-					setLoadingGoals(false)
-				}
+		async function fetchList(url, failureMessage) {
+			const response = await fetch(url, {
+				headers: getAuthHeaders()
+			})
+			const data = await readJsonSafely(response)
+			if (!response.ok) {
+				if (handleAuthError(response, data)) return null
+				const message =
+					(typeof data === 'string' && data) ||
+					data?.detail ||
+					failureMessage
+				throw new Error(message)
 			}
+			return Array.isArray(data) ? data : []
 		}
 
-		async function loadActivities() {
+		// One bootstrap request replaces the separate profile, goals and
+		// activities calls; full lists are only fetched past the first page.
+		async function loadDashboard() {
+			setLoadingGoals(true)
 			setLoadingActivities(true)
 			try {
-				const response = await fetch(LEARNING_ACTIVITIES_URL, {
+				const response = await fetch(BOOTSTRAP_URL, {
 					headers: getAuthHeaders()
 				})
 				const data = await readJsonSafely(response)
@@ -373,54 +361,40 @@ export default function Dashboard() {
 					const message =
 						(typeof data === 'string' && data) ||
 						data?.detail ||
-						'Failed to load activities.'
+						'Failed to load goals.'
 					throw new Error(message)
 				}
+				const goalsData = data?.has_more_goals
+					? await fetchList(API_BASE_URL, 'Failed to load goals.')
+					: data?.goals
+				const activitiesData = data?.has_more_activities
+					? await fetchList(LEARNING_ACTIVITIES_URL, 'Failed to load activities.')
+					: data?.activities
+				if (goalsData === null || activitiesData === null) return
 				if (isMounted) {
-					const mappedActivities = Array.isArray(data) ? data.map(mapApiActivity) : []
-					setActivities(mappedActivities)
+					setProfile({
+						username: data?.profile?.username || '',
+						email: data?.profile?.email || ''
+					})
+					setGoals(Array.isArray(goalsData) ? goalsData.map(mapApiGoalToState) : [])
+					setActivities(Array.isArray(activitiesData) ? activitiesData.map(mapApiActivity) : [])
+					setApiError('')
 					setActivitiesError('')
 				}
 			} catch (error) {
 				if (isMounted) {
+					setApiError(error.message || 'Unable to load goals.')
 					setActivitiesError(error.message || 'Unable to load activities.')
 				}
 			} finally {
 				if (isMounted) {
+					setLoadingGoals(false)
 					setLoadingActivities(false)
 				}
 			}
 		}
 
-		async function loadProfile() {
-			try {
-				const response = await fetch(PROFILE_URL, {
-					headers: getAuthHeaders()
-				})
-				const data = await readJsonSafely(response)
-				if (!response.ok) {
-					if (handleAuthError(response, data)) return
-					const message =
-						(typeof data === 'string' && data) ||
-						data?.detail ||
-						'Failed to load profile.'
-					throw new Error(message)
-				}
-				if (isMounted) {
-					setProfile({
-						username: data?.username || '',
-						email: data?.email || ''
-					})
-				}
-			} catch (error) {
-				// Silently log profile failures without blocking dashboard load
-				console.warn('Unable to load profile.', error)
-			}
-		}
-
-		loadGoals()
-		loadActivities()
-		loadProfile()
+		loadDashboard()
 
 		return () => {
 			isMounted = false